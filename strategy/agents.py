@@ -0,0 +1,49 @@
+"""The Strategy agents."""
+import random
+from typing import Protocol
+
+from strategy.board import Board, Move, MoveResult
+from strategy.colour import Colour
+from strategy.view import BoardView
+
+
+class Agent(Protocol):
+    """
+    An agent selects the next `Move` of a `Colour` on a `Board`.
+
+    A fair agent is given a `BoardView`, so it only sees what the player of `colour` may see.  An agent is
+    told when a game starts and about every move played (by both colours), so it can keep its own state.
+    """
+
+    def start(self, view: BoardView) -> None:
+        """Start a new game, seen through `view`."""
+
+    def observe(self, result: MoveResult) -> None:
+        """Observe the result of a move; only its public information may be used."""
+
+    def select_move(self, board: Board | BoardView, colour: Colour) -> Move:
+        """Return the `Move` to play; the `board` must not be changed."""
+
+
+class RandomAgent:
+    """Pick a random movable piece and move it to a random destination, like `strategy.main.turn` does."""
+
+    def __init__(self, rng: random.Random | None = None) -> None:
+        """Create a random agent, using `rng` or the global random generator."""
+        self.rng = rng or random.Random()
+
+    def start(self, view: BoardView) -> None:
+        """Start a new game: a random agent has nothing to prepare."""
+        pass
+
+    def observe(self, result: MoveResult) -> None:
+        """Observe the result of a move: a random agent ignores it."""
+        pass
+
+    def select_move(self, board: Board | BoardView, colour: Colour) -> Move:
+        """Return a random `Move`."""
+        by_source = {}
+        for source, destination in board.moves(colour):
+            by_source.setdefault(source, []).append(destination)
+        source = self.rng.choice(list(by_source))
+        return source, self.rng.choice(by_source[source])
@@ -0,0 +1,236 @@
+"""
+The Strategy game archive index.
+
+An `ArchiveIndex` turns a stream of `GameRecord`s (see `strategy.records`) into columns, once, so questions
+about thousands of games are answered with a few NumPy operations instead of replaying every game:
+
+    games     one row per game: `winner` (0 draw, 1 red, 2 blue), `plies`, and `flag` (won by taking the flag)
+    events    one row per ply: `game`, `ply`, `colour` (0 red, 1 blue), `rank` (the index in `RANKS` of the
+              piece that moved), `distance`, `defender` (its rank index, -1 when the move was not an attack)
+              and `outcome` (1 the attacker won, 0 both were removed or no attack, -1 the defender won)
+
+Captures are indexed too: for every (taker, taken) pair of ranks, the sorted games in which the taker took the
+taken piece, as one array of games with an array of offsets (like a CSR matrix).  `captured` is a slice.
+
+A `Query` narrows the games down, filter after filter, on boolean masks over the game rows, then counts or
+aggregates them:
+
+    index.query().captured(SPY, MARSHAL).count
+    index.query().won_by_flag().plies(below=100).games
+    index.query().with_event(rank=SCOUT, attack=True, min_distance=6).aggregate("plies", np.mean)
+
+`save` writes every column as a `.npy` file in a directory; `load` memory-maps them.
+"""
+import os
+from collections.abc import Callable, Iterable
+from pathlib import Path
+
+import numpy as np
+
+from strategy.colour import Colour
+from strategy.pieces import FLAG, RANKS
+from strategy.records import GameRecord
+
+GAME_COLUMNS = {"winner": np.int8, "plies": np.int32, "flag": np.bool_}
+EVENT_COLUMNS = {
+    "game": np.int32,
+    "ply": np.int32,
+    "colour": np.int8,
+    "rank": np.int8,
+    "distance": np.int8,
+    "defender": np.int8,
+    "outcome": np.int8,
+}
+CAPTURE_COLUMNS = ("offsets", "captures")
+
+NO_DEFENDER = -1
+WON = 1
+TRADE = 0
+LOST = -1
+
+_RANK_INDEX = {name: index for index, name in enumerate(RANKS)}
+_WINNERS = {None: 0, Colour.RED: 1, Colour.BLUE: 2}
+_OUTCOMES = {True: WON, None: TRADE, False: LOST}
+
+
+def _capture_index(events: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+    """Return the games of every (taker, taken) pair, sorted by pair and game, and the offsets of the pairs."""
+    won = events["outcome"] == WON
+    lost = (events["outcome"] == LOST) & (events["defender"] != NO_DEFENDER)
+    taker = np.concatenate([events["rank"][won], events["defender"][lost]]).astype(np.int64)
+    taken = np.concatenate([events["defender"][won], events["rank"][lost]]).astype(np.int64)
+    games = np.concatenate([events["game"][won], events["game"][lost]]).astype(np.int64)
+    keys = np.unique((taker * len(RANKS) + taken) << 32 | games)  # every game once per pair
+    pairs = keys >> 32
+    offsets = np.searchsorted(pairs, np.arange(len(RANKS) ** 2 + 1))
+    return {"offsets": offsets.astype(np.int64), "captures": (keys & 0xFFFFFFFF).astype(np.int32)}
+
+
+class ArchiveIndex:
+    """The games and events of an archive as columns, with an inverted index of the captures."""
+
+    def __init__(
+        self, games: dict[str, np.ndarray], events: dict[str, np.ndarray], captures: dict[str, np.ndarray] | None = None
+    ) -> None:
+        """Create an index of the columns of `games` and `events`; the capture index is built when not given."""
+        self.games = games
+        self.events = events
+        self.capture_index = captures if captures is not None else _capture_index(events)
+
+    def save(self, directory: str | Path) -> None:
+        """Write every column as a `.npy` file in `directory`, each through a temporary file."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        tables = {"game": self.games, "event": self.events, "capture": self.capture_index}
+        for table, columns in tables.items():
+            for name, column in columns.items():
+                path = directory / f"{table}-{name}.npy"
+                temporary = path.with_suffix(".tmp")
+                with open(temporary, "wb") as file:
+                    np.save(file, column)
+                os.replace(temporary, path)
+
+    @classmethod
+    def build(cls, records: Iterable[GameRecord]) -> "ArchiveIndex":
+        """Replay `records` once and return their index."""
+        games: dict[str, list] = {name: [] for name in GAME_COLUMNS}
+        events: dict[str, list] = {name: [] for name in EVENT_COLUMNS}
+        for number, record in enumerate(records):
+            flag = False
+            for ply, result in enumerate(record.replay()):
+                events["game"].append(number)
+                events["ply"].append(ply)
+                events["colour"].append(0 if result.piece.colour == Colour.RED else 1)
+                events["rank"].append(_RANK_INDEX[result.piece.name])
+                events["distance"].append(result.distance)
+                if result.is_attack:
+                    events["defender"].append(_RANK_INDEX[result.defender.name])
+                    events["outcome"].append(_OUTCOMES[result.outcome])
+                    flag = result.defender.name == FLAG
+                else:
+                    events["defender"].append(NO_DEFENDER)
+                    events["outcome"].append(TRADE)
+            games["winner"].append(_WINNERS[record.winner])
+            games["plies"].append(record.plies)
+            games["flag"].append(flag and record.winner is not None)
+        return cls(
+            {name: np.array(games[name], dtype=dtype) for name, dtype in GAME_COLUMNS.items()},
+            {name: np.array(events[name], dtype=dtype) for name, dtype in EVENT_COLUMNS.items()},
+        )
+
+    @classmethod
+    def load(cls, directory: str | Path) -> "ArchiveIndex":
+        """Return the index saved in `directory`, memory-mapped read-only."""
+        directory = Path(directory)
+
+        def load(table: str, names: Iterable[str]) -> dict[str, np.ndarray]:
+            return {name: np.load(directory / f"{table}-{name}.npy", mmap_mode="r") for name in names}
+
+        return cls(load("game", GAME_COLUMNS), load("event", EVENT_COLUMNS), load("capture", CAPTURE_COLUMNS))
+
+    def captured(self, taker: str, taken: str) -> np.ndarray:
+        """Return the sorted games in which a piece of rank `taker` took one of rank `taken`."""
+        pair = _RANK_INDEX[taker] * len(RANKS) + _RANK_INDEX[taken]
+        offsets = self.capture_index["offsets"]
+        return self.capture_index["captures"][offsets[pair] : offsets[pair + 1]]
+
+    def query(self) -> "Query":
+        """Return a query of all games."""
+        return Query(self)
+
+    def __len__(self) -> int:
+        """Return the number of games."""
+        return len(self.games["plies"])
+
+
+class Query:
+    """A selection of the games of an `ArchiveIndex`; every filter returns the query, narrowed down."""
+
+    def __init__(self, index: ArchiveIndex) -> None:
+        """Select all games of `index`."""
+        self.index = index
+        self.mask = np.ones(len(index), dtype=bool)
+
+    @property
+    def games(self) -> np.ndarray:
+        """Return the selected games, in order."""
+        return np.flatnonzero(self.mask)
+
+    @property
+    def count(self) -> int:
+        """Return the number of selected games."""
+        return int(self.mask.sum())
+
+    def where(self, mask: np.ndarray) -> "Query":
+        """Keep the games where `mask` (over the game rows) is set."""
+        self.mask &= mask
+        return self
+
+    def won_by(self, colour: Colour | None) -> "Query":
+        """Keep the games won by `colour`, or the draws for `None`."""
+        return self.where(self.index.games["winner"] == _WINNERS[colour])
+
+    def won_by_flag(self) -> "Query":
+        """Keep the games won by taking the flag."""
+        return self.where(self.index.games["flag"])
+
+    def plies(self, below: int | None = None, at_least: int | None = None) -> "Query":
+        """Keep the games shorter than `below` plies, and of at least `at_least` plies."""
+        plies = self.index.games["plies"]
+        if below is not None:
+            self.where(plies < below)
+        if at_least is not None:
+            self.where(plies >= at_least)
+        return self
+
+    def captured(self, taker: str, taken: str) -> "Query":
+        """Keep the games in which a piece of rank `taker` took one of rank `taken`, with the capture index."""
+        mask = np.zeros(len(self.index), dtype=bool)
+        mask[self.index.captured(taker, taken)] = True
+        return self.where(mask)
+
+    def with_event(
+        self,
+        rank: str | None = None,
+        colour: Colour | None = None,
+        attack: bool | None = None,
+        defender: str | None = None,
+        min_distance: int = 0,
+        before: int | None = None,
+    ) -> "Query":
+        """Keep the games with a move (of a `rank` and `colour`, an attack or not, ...) that matches everything."""
+        events = self.index.events
+        matches = events["distance"] >= min_distance
+        if rank is not None:
+            matches &= events["rank"] == _RANK_INDEX[rank]
+        if colour is not None:
+            matches &= events["colour"] == (0 if colour == Colour.RED else 1)
+        if attack is not None:
+            matches &= (events["defender"] != NO_DEFENDER) == attack
+        if defender is not None:
+            matches &= events["defender"] == _RANK_INDEX[defender]
+        if before is not None:
+            matches &= events["ply"] < before
+        mask = np.zeros(len(self.index), dtype=bool)
+        mask[events["game"][matches]] = True
+        return self.where(mask)
+
+    def aggregate(self, column: str, function: Callable[[np.ndarray], float] = np.mean) -> float:
+        """Return `function` of a game column over the selected games."""
+        return function(self.index.games[column][self.mask])
+
+    def results(self) -> dict[str, int]:
+        """Return the number of red wins, blue wins and draws of the selected games."""
+        counts = np.bincount(self.index.games["winner"][self.mask], minlength=3)
+        return {"red": int(counts[1]), "blue": int(counts[2]), "draw": int(counts[0])}
+
+    def capture_matrix(self) -> np.ndarray:
+        """Return how many times every rank (row) took every rank (column) in the selected games."""
+        events = self.index.events
+        selected = self.mask[events["game"]]
+        won = selected & (events["outcome"] == WON)
+        lost = selected & (events["outcome"] == LOST) & (events["defender"] != NO_DEFENDER)
+        matrix = np.zeros((len(RANKS), len(RANKS)), dtype=np.int64)
+        np.add.at(matrix, (events["rank"][won], events["defender"][won]), 1)
+        np.add.at(matrix, (events["defender"][lost], events["rank"][lost]), 1)
+        return matrix
@@ -0,0 +1,225 @@
+"""
+The Strategy batched agents.
+
+A `BatchAgent` selects the moves of many positions at once: it gets the feature planes of the positions
+(see `strategy.features`) and a mask of the legal moves of each, and returns one move index per position.
+That is how a model wants to be called.
+
+A `BatchScheduler` collects the decisions of many games and hands them to a `BatchAgent` in batches of at
+most `batch_size`; a batch waits at most `max_latency` seconds for more decisions.  Any number of threads
+can `submit` decisions; `run_games` drives many `Game`s in lock step, so every step is one batch (or a few).
+A `ScheduledAgent` is a regular `Agent` that asks the scheduler, so it plays in any `Game` or server.
+"""
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Protocol
+
+import numpy as np
+
+from strategy.board import Move, MoveResult
+from strategy.colour import Colour
+from strategy.evaluation import VALUES
+from strategy.features import MOVES, OPPONENT, OWN, UNKNOWN, decode_move, encode, legal_mask
+from strategy.pieces import COMBAT, COUNTS, RANKS
+from strategy.runner import Game
+from strategy.view import BoardView
+
+log = logging.getLogger(__name__)
+
+BATCH_SIZE = 256
+MAX_LATENCY = 0.005
+
+_FLUSH = object()
+_CLOSE = object()
+
+
+class BatchAgent(Protocol):
+    """An agent that selects the moves of a batch of positions at once."""
+
+    def select_moves(self, planes: np.ndarray, masks: np.ndarray) -> np.ndarray:
+        """Return the index (see `encode_move`) of the move to play in each position; `masks` holds the legal ones."""
+
+
+def _gains() -> tuple[np.ndarray, np.ndarray]:
+    """Return the material gained by an attack of every rank on every rank, and on an unknown piece."""
+    ranks = len(RANKS)
+    gains = np.zeros((ranks, ranks))
+    for (attacker, defender), outcome in COMBAT.items():
+        a, d = RANKS.index(attacker), RANKS.index(defender)
+        if outcome is True:
+            gains[a, d] = VALUES[defender]
+        elif outcome is False:
+            gains[a, d] = -VALUES[attacker]
+        else:
+            gains[a, d] = VALUES[defender] - VALUES[attacker]
+    prior = np.array([COUNTS[name] for name in RANKS], dtype=float)
+    return gains, gains @ (prior / prior.sum())
+
+
+class HeuristicBatchAgent:
+    """
+    Score every legal move of every position at once, with NumPy only.
+
+    An attack scores the material it wins or loses (for an unknown defender, expected over the initial
+    counts); a move forward scores `advance` per row; a little noise breaks the ties.
+    """
+
+    SOURCES = np.arange(MOVES) // 100
+    DESTINATIONS = np.arange(MOVES) % 100
+    GAINS, UNKNOWN_GAINS = _gains()
+
+    def __init__(self, advance: float = 0.1, noise: float = 0.01, seed: int | None = None) -> None:
+        """Create the agent; `seed` makes the tie breaks reproducible."""
+        self.advance = advance
+        self.noise = noise
+        self.rng = np.random.default_rng(seed)
+
+    def select_moves(self, planes: np.ndarray, masks: np.ndarray) -> np.ndarray:
+        """Return the best scoring legal move of every position."""
+        n, ranks = len(planes), len(RANKS)
+        squares = planes.reshape(n, planes.shape[1], 100)
+        own = squares[:, OWN : OWN + ranks]
+        opponent = squares[:, OPPONENT : OPPONENT + ranks]
+        # the rank at every square, -1 where there is none
+        own_rank = np.where(own.any(axis=1), own.argmax(axis=1), -1)
+        opponent_rank = np.where(opponent.any(axis=1), opponent.argmax(axis=1), -1)
+        attacker = np.take_along_axis(own_rank, np.broadcast_to(self.SOURCES, (n, MOVES)), axis=1)
+        defender = np.take_along_axis(opponent_rank, np.broadcast_to(self.DESTINATIONS, (n, MOVES)), axis=1)
+        unknown = squares[:, UNKNOWN, self.DESTINATIONS].astype(bool)
+        scores = np.where(defender >= 0, self.GAINS[attacker, defender], 0.0)
+        scores += np.where(unknown, self.UNKNOWN_GAINS[attacker], 0.0)
+        scores += self.advance * (self.SOURCES // 10 - self.DESTINATIONS // 10)
+        scores += self.noise * self.rng.random((n, MOVES))
+        scores[~masks] = -np.inf
+        return scores.argmax(axis=1)
+
+
+@dataclass
+class BatchStats:
+    """What a scheduler did: the number of decisions, of batches, and the seconds spent in the agent."""
+
+    decisions: int = 0
+    batches: int = 0
+    seconds: float = 0.0
+
+    @property
+    def batch_size(self) -> float:
+        """Return the average batch size."""
+        return self.decisions / self.batches if self.batches else 0.0
+
+
+class BatchScheduler:
+    """Collect decisions from any number of games and let a `BatchAgent` make them in batches."""
+
+    def __init__(self, agent: BatchAgent, batch_size: int = BATCH_SIZE, max_latency: float = MAX_LATENCY) -> None:
+        """Start the scheduler thread; a batch is made when it has `batch_size` decisions or is `max_latency` old."""
+        self.agent = agent
+        self.batch_size = batch_size
+        self.max_latency = max_latency
+        self.stats = BatchStats()
+        self._queue: queue.Queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="batch-scheduler", daemon=True)
+        self._thread.start()
+
+    def submit(self, planes: np.ndarray, mask: np.ndarray) -> Future:
+        """Submit the planes and the legal move mask of one position; the future gets the index of the move."""
+        future = Future()
+        self._queue.put((planes, mask, future))
+        return future
+
+    def flush(self) -> None:
+        """Make the decisions submitted so far without waiting for `max_latency`."""
+        self._queue.put(_FLUSH)
+
+    def close(self) -> None:
+        """Make the pending decisions and stop the scheduler thread."""
+        self._queue.put(_CLOSE)
+        self._thread.join()
+
+    def __enter__(self) -> "BatchScheduler":
+        """Return the scheduler, which runs until the `with` block ends."""
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        """Make the pending decisions and stop the scheduler thread."""
+        self.close()
+
+    def _run(self) -> None:
+        batch, deadline = [], None
+        while True:
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = _FLUSH
+            if item is not _FLUSH and item is not _CLOSE:
+                batch.append(item)
+                deadline = deadline or time.monotonic() + self.max_latency
+            if batch and (item is _FLUSH or item is _CLOSE or len(batch) >= self.batch_size):
+                self._evaluate(batch)
+                batch, deadline = [], None
+            if item is _CLOSE:
+                return
+
+    def _evaluate(self, batch: list[tuple[np.ndarray, np.ndarray, Future]]) -> None:
+        start = time.perf_counter()
+        try:
+            moves = self.agent.select_moves(np.stack([b[0] for b in batch]), np.stack([b[1] for b in batch]))
+        except Exception as exception:
+            for _, _, future in batch:
+                future.set_exception(exception)
+            return
+        finally:
+            self.stats.seconds += time.perf_counter() - start
+        self.stats.decisions += len(batch)
+        self.stats.batches += 1
+        for (_, _, future), move in zip(batch, moves.tolist()):
+            future.set_result(move)
+
+
+class ScheduledAgent:
+    """An `Agent` that lets a `BatchScheduler` select its moves."""
+
+    def __init__(self, scheduler: BatchScheduler) -> None:
+        """Create an agent submitting its decisions to `scheduler`."""
+        self.scheduler = scheduler
+
+    def start(self, view: BoardView) -> None:
+        """Start a new game: the positions are encoded from scratch for every move."""
+        pass
+
+    def observe(self, result: MoveResult) -> None:
+        """Observe the result of a move: the planes already show what is public."""
+        pass
+
+    def submit(self, view: BoardView, colour: Colour) -> Future:
+        """Submit the position of `view` to the scheduler; the future gets the index of the move."""
+        return self.scheduler.submit(encode(view.board, colour), legal_mask(view, colour))
+
+    def select_move(self, board: BoardView, colour: Colour) -> Move:
+        """Return the move selected by the scheduler, waiting for its batch."""
+        return decode_move(self.submit(board, colour).result(), colour)
+
+
+def run_games(games: list[Game], scheduler: BatchScheduler) -> None:
+    """
+    Play `games` until they are all over, one ply per game per step.
+
+    Every step, the decisions of all the `ScheduledAgent`s to move are submitted before the scheduler is
+    flushed, so they are made in as few batches as possible; the other agents move one at a time.
+    """
+    while active := [game for game in games if not game.over]:
+        pending = []
+        for game in active:
+            agent = game.agents[game.turn]
+            if isinstance(agent, ScheduledAgent):
+                pending.append((game, agent.submit(game.view, game.turn)))
+            else:
+                game.step()
+        scheduler.flush()
+        for game, future in pending:
+            game.play(decode_move(future.result(), game.turn))
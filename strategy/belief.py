@@ -0,0 +1,142 @@
+"""
+The Strategy belief tracker.
+
+A `BeliefTracker` keeps, for every piece of the opponent, a probability distribution over its rank, as a
+(pieces x ranks) matrix in the order of `RANKS`.  It is updated with the public part of every
+`MoveResult`: which squares were involved, how far a piece moved, and the ranks revealed by a combat.
+
+    - a piece that moved is not a bomb or a flag;
+    - a piece that moved more than one square is a scout;
+    - a piece in a combat is revealed.
+
+After every update the matrix is renormalised with iterative proportional fitting, so that every row sums
+to one and every column sums to the number of pieces of that rank the opponent still has.
+"""
+import numpy as np
+
+from strategy.board import Board, MoveResult
+from strategy.exceptions import NoPieceError
+from strategy.pieces import BOMB, COUNTS, FLAG, POWERS, RANKS, SCOUT, Piece
+from strategy.view import BoardView
+
+COLUMNS = {name: index for index, name in enumerate(RANKS)}
+IMMOVABLE = [COLUMNS[BOMB], COLUMNS[FLAG]]
+
+IPF_ITERATIONS = 50
+IPF_TOLERANCE = 1e-6
+
+
+class BeliefTracker:
+    """Track the beliefs of the player of `view.colour` about the ranks of the pieces of the opponent."""
+
+    def __init__(self, view: BoardView) -> None:
+        """Start with the prior of `COUNTS` for every piece of the opponent that is not revealed yet."""
+        self.colour = view.colour
+        others = view.others()
+        self.squares: list[tuple[int, int]] = [(piece.x, piece.y) for piece in others]
+        self.rows = {square: row for row, square in enumerate(self.squares)}
+        # the number of pieces of the opponent by rank that are still on the board
+        self.remaining = np.array([COUNTS[name] for name in RANKS], dtype=float)
+        self.alive = np.ones(len(others), dtype=bool)
+        self.known = np.zeros(len(others), dtype=bool)
+        self.matrix = np.tile(self.remaining / self.remaining.sum(), (len(others), 1))
+        for row, piece in enumerate(others):
+            if isinstance(piece, Piece):  # revealed
+                self._reveal(row, piece.name)
+            elif piece.moved:
+                self.matrix[row, IMMOVABLE] = 0
+        self.normalise()
+
+    @property
+    def alive_squares(self) -> list[tuple[int, int]]:
+        """Return the squares of the pieces of the opponent that are still on the board."""
+        return [square for row, square in enumerate(self.squares) if self.alive[row]]
+
+    def update(self, result: MoveResult) -> None:
+        """Update the beliefs with the public information of `result`, and renormalise."""
+        if result.piece.colour == self.colour:
+            if result.is_attack:
+                row = self.rows[result.dest]
+                self._reveal(row, result.defender.name)
+                if result.outcome is not False:
+                    self._capture(result.dest)
+        else:
+            row = self.rows.pop(result.source)
+            self.matrix[row, IMMOVABLE] = 0
+            if result.distance > 1:
+                self._reveal(row, SCOUT)
+            if result.is_attack:
+                self._reveal(row, result.piece.name)
+            if result.outcome is True or not result.is_attack:
+                self.squares[row] = result.dest
+                self.rows[result.dest] = row
+            else:
+                self.rows[result.source] = row
+                self._capture(result.source)
+        self.normalise()
+
+    def normalise(self) -> None:
+        """Fit the matrix to rows that sum to one and columns that sum to the remaining counts."""
+        unknown = self.alive & ~self.known
+        matrix = self.matrix[unknown]
+        targets = np.maximum(self.remaining - self.matrix[self.alive & self.known].sum(axis=0), 0)
+        for _ in range(IPF_ITERATIONS):
+            columns = matrix.sum(axis=0)
+            np.divide(targets, columns, out=columns, where=columns > 0)
+            matrix *= columns
+            rows = matrix.sum(axis=1, keepdims=True)
+            matrix /= np.where(rows > 0, rows, 1)
+            if np.abs(matrix.sum(axis=0) - targets).max() < IPF_TOLERANCE:
+                break
+        self.matrix[unknown] = matrix
+
+    def sample(self, n: int = 1, rng: np.random.Generator | None = None) -> np.ndarray:
+        """
+        Return `n` determinizations as an (n x pieces) array of rank indices, in the order of `alive_squares`.
+
+        The rows are drawn from the most to the least certain piece, each time from its belief restricted to
+        the ranks that are still left in that determinization, so every determinization uses exactly the
+        remaining counts.
+        """
+        rng = rng or np.random.default_rng()
+        matrix = self.matrix[self.alive]
+        left = np.tile(self.remaining, (n, 1))
+        samples = np.empty((n, len(matrix)), dtype=np.int8)
+        order = np.argsort((matrix > 0).sum(axis=1), kind="stable")
+        draws = rng.random((n, len(matrix)))
+        for i, row in enumerate(order):
+            weights = matrix[row] * (left > 0)
+            dead_ends = ~weights.any(axis=1)
+            if dead_ends.any():  # the belief cannot be met anymore: use what is left
+                weights[dead_ends] = left[dead_ends]
+            cumulative = np.cumsum(weights, axis=1)
+            ranks = np.argmax(cumulative > draws[:, i, None] * cumulative[:, -1:], axis=1)
+            samples[:, row] = ranks
+            left[np.arange(n), ranks] -= 1
+        return samples
+
+    def determinize(self, board: Board, ranks: np.ndarray) -> Board:
+        """Return a copy of `board` in which the pieces of the opponent have the ranks of one `sample` row."""
+        board = board.copy()
+        for square, rank in zip(self.alive_squares, ranks):
+            piece = board[square]
+            piece.name = RANKS[rank]
+            piece.power = POWERS[piece.name]
+        return board
+
+    def __getitem__(self, square: tuple[int, int]) -> dict[str, float]:
+        """Return the probability of every rank for the piece of the opponent at `square`."""
+        if square not in self.rows:
+            raise NoPieceError
+        return dict(zip(RANKS, self.matrix[self.rows[square]].tolist()))
+
+    def _reveal(self, row: int, name: str) -> None:
+        self.matrix[row] = 0
+        self.matrix[row, COLUMNS[name]] = 1
+        self.known[row] = True
+
+    def _capture(self, square: tuple[int, int]) -> None:
+        row = self.rows.pop(square)
+        self.alive[row] = False
+        self.remaining[self.matrix[row].argmax()] -= 1
+        self.matrix[row] = 0
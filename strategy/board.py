@@ -1,17 +1,20 @@
 """The Strategy board."""
 import contextlib
-import copy
 from dataclasses import dataclass
-from random import randrange
+from random import Random, randrange
+from typing import Callable
 
 from strategy.colour import Colour
 from strategy.exceptions import InvalidCoordinateError, InvalidDestinationError, InvalidDimensionsError, NoPieceError
 from strategy.game import EMPTY, LAKE, Empty, Field, Lake, log
-from strategy.pieces import BOMB, FLAG, PIECES, SCOUT, Piece
+from strategy.geometry import CLASSIC, Geometry
+from strategy.pieces import BOMB, FLAG, SCOUT, Piece
 
 SIZE = 12
 DASH = "-"
 
+Move = tuple[tuple[int, int], tuple[int, int]]
+
 
 @dataclass
 class PieceRange:
@@ -78,6 +81,32 @@ class PieceRange:
 EmptyPieceRange = PieceRange(piece=None)
 
 
+@dataclass
+class MoveResult:
+    """
+    The result of a `Board.move`.
+
+    When the move was an attack, `defender` is the attacked `Piece` and `outcome` the result of
+    `Piece.attack`: `True` when the attacker won, `None` for a draw (both are removed), `False` otherwise.
+    """
+
+    source: tuple[int, int]
+    dest: tuple[int, int]
+    piece: Piece
+    defender: Piece | None = None
+    outcome: bool | None = None
+
+    @property
+    def is_attack(self) -> bool:
+        """Return `True` when the move was an attack."""
+        return self.defender is not None
+
+    @property
+    def distance(self) -> int:
+        """Return the number of squares the piece moved (or attacked over)."""
+        return abs(self.dest[0] - self.source[0]) + abs(self.dest[1] - self.source[1])
+
+
 class Board:
     """
     The strategy board.
@@ -91,26 +120,35 @@ class Board:
     Each field of the board can be visited via board[int, int], like board[0, 0] or
     board[5, 6].  It is also possible to use chess based coordinates, like board["a10"]
     or board["A", 10] (both are the same as board[0, 0]).
+
+    That is the `CLASSIC` geometry; another `Geometry` gives other dimensions, lakes, zones and pieces.
+
+    The `PieceRange` of every square is cached until a cell it depends on is set: a cell invalidates the
+    ranges of the squares next to it and of the scouts in its row and column (up to a lake).  A piece that
+    is changed in place (its name or colour) needs a `clear_cache`.
     """
 
     LEFT_LAKE = [(2, 4), (3, 4), (2, 5), (3, 5)]
     RIGHT_LAKE = [(6, 4), (7, 4), (6, 5), (7, 5)]
     LAKES = LEFT_LAKE + RIGHT_LAKE
 
-    TOP = ["a", "b", "c", "d", "e", "f", "g", "h", "i", "j"]
-
-    def __init__(self) -> None:
-        """Create an empty board."""
+    def __init__(self, geometry: Geometry = CLASSIC) -> None:
+        """Create an empty board with the dimensions and lakes of `geometry`."""
+        self.geometry = geometry
         self._board = {}
+        self._ranges: dict[tuple[int, int], PieceRange] = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.listeners: list[Callable[[MoveResult], None]] = []
         self._add_lakes()
 
     def __str__(self) -> str:
         """Show the board."""
-        grid = [[self.get((x, y), Lake) for x in range(10)] for y in range(10)]
+        grid = [[self.get((x, y), Lake) for x in range(self.geometry.width)] for y in range(self.geometry.height)]
         result = self._first_line()
         for x, line in enumerate(grid):
-            result += f"{DASH:-^{SIZE + 2}}|" * 10
-            result += f"\n  {10 - x:2} | "
+            result += f"{DASH:-^{SIZE + 2}}|" * self.geometry.width
+            result += f"\n  {self.geometry.height - x:2} | "
             for y, cell in enumerate(line):
                 result += self._format(cell, x, y)
             result += "\n ----|"
@@ -128,36 +166,41 @@ class Board:
         else:
             return Colour.BLUE
 
-    def create_random_pieces(self, colour: Colour) -> None:
+    @property
+    def cache_hit_rate(self) -> float:
+        """Return the fraction of the `available_range` calls answered from the cache."""
+        calls = self.cache_hits + self.cache_misses
+        return self.cache_hits / calls if calls else 0.0
+
+    def create_random_pieces(self, colour: Colour, rng: Random | None = None) -> None:
         """Create a random setup for a given `Player`. RED is at the bottom, BLUE is on top."""
-        setup_list = self.random_pieces_list()
-        current_line = 6 if colour == Colour.RED else 0
-        for index, piece in enumerate(setup_list):
-            if index > 0 and index % 10 == 0:
-                current_line += 1
+        setup_list = self.random_pieces_list(rng)
+        for piece, (x, y) in zip(setup_list, self.geometry.zone(colour)):
             piece.colour = colour
-            piece.x = index % 10
-            piece.y = current_line
-            log.debug(f"Adding {piece.colour.name.lower()} {piece} to {piece.x}|{piece.y}.")
+            piece.x = x
+            piece.y = y
+            log.debug("Adding %s %s to %d|%d.", piece.colour.name.lower(), piece, piece.x, piece.y)
             self[piece.x, piece.y] = piece
 
-    def random_pieces_list(self) -> list[Piece]:
-        """Return a random list of the 40 pieces."""
-        setup_list = [None for _ in range(40)]
-        for piece in copy.deepcopy(PIECES):
-            index = randrange(40)
+    def random_pieces_list(self, rng: Random | None = None) -> list[Piece]:
+        """Return a random list of the pieces of one colour, using `rng` or the global random generator."""
+        random_index = rng.randrange if rng else randrange
+        pieces = self.geometry.piece_set()
+        setup_list = [None for _ in pieces]
+        for piece in pieces:
+            index = random_index(len(pieces))
             while setup_list[index] is not None:
-                index = randrange(40)
+                index = random_index(len(pieces))
             setup_list[index] = piece
         return setup_list
 
     def bottom(self) -> list[Piece | Field]:
-        """Return the empty cells or pieces in bottom four lines of the board as a `list`."""
-        return [self[x, y] for x in range(0, 10) for y in range(6, 10)]
+        """Return the empty cells or pieces in the deployment rows of red (at the bottom) as a `list`."""
+        return self._rows(range(self.geometry.height - self.geometry.rows, self.geometry.height))
 
     def top(self) -> list[Piece | Field]:
-        """Return the empty cells or pieces in top four lines of the board as a `list`."""
-        return [self[x, y] for x in range(0, 10) for y in range(0, 4)]
+        """Return the empty cells or pieces in the deployment rows of blue (on top) as a `list`."""
+        return self._rows(range(self.geometry.rows))
 
     def red(self) -> list[Piece]:
         """Return the red pieces on the board."""
@@ -167,6 +210,42 @@ class Board:
         """Return the blue pieces on the board."""
         return self._by_colour(Colour.BLUE)
 
+    def copy(self) -> "Board":
+        """Return a copy of the board with copies of its pieces; much cheaper than a `copy.deepcopy`."""
+        board = self.__class__.__new__(self.__class__)
+        board.geometry = self.geometry
+        board._board = {}
+        board._ranges = {}
+        board.cache_hits = board.cache_misses = 0
+        board.listeners = []
+        for key, cell in self._board.items():
+            if isinstance(cell, Piece):
+                piece = cell
+                cell = Piece.__new__(Piece)
+                cell.__dict__.update(piece.__dict__)
+            board._board[key] = cell
+        return board
+
+    def moves(self, colour: Colour) -> list[Move]:
+        """Return all the possible moves of the given colour as a `list` of `(source, destination)` tuples."""
+        moves = []
+        for piece in self._by_colour(colour):
+            for coordinates in self.available_range(piece.x, piece.y).movables.values():
+                moves.extend(((piece.x, piece.y), destination) for destination in coordinates)
+        return moves
+
+    def coordinates(self, key: tuple[int, int] | tuple[str, int] | str) -> tuple[int, int]:
+        """Return the `tuple[int, int]` coordinates of `key`; "a10" becomes (0, 0), ("j", 1) becomes (9, 9)."""
+        coordinates = self._get_coordinates(key)
+        if coordinates is None:
+            raise InvalidCoordinateError
+        return coordinates
+
+    def notation(self, coordinates: tuple[int, int]) -> str:
+        """Return the chess notation of `coordinates`; (0, 0) becomes "a10", (9, 9) becomes "j1"."""
+        self._raise_when_outside_dimensions(coordinates)
+        return f"{self.geometry.columns[coordinates[0]]}{self.geometry.height - coordinates[1]}"
+
     def get(self, key: tuple[int, int] | tuple[str, int] | str, default: Field | None) -> Field | None:
         """Return the `Field` (i.e. `Piece` or `Empty`), or default when an `InvalidDimensionsError` was raised."""
         try:
@@ -174,33 +253,38 @@ class Board:
         except (InvalidDimensionsError, InvalidCoordinateError):
             return default
 
-    def move(self, source: tuple[int, int], dest: tuple[int, int]) -> None:
+    def move(self, source: tuple[int, int], dest: tuple[int, int]) -> "MoveResult":
         """
         Move `Piece` at `source` to `destination`, and return the result of the move.
 
-        This might entail an attack.
+        This might entail an attack.  The `listeners` are called with the result.
         """
         piece = self[source]
         if piece == Empty(EMPTY, source[0], source[1]):
             raise NoPieceError
         if not self._is_possible_destination(piece, dest):
             raise InvalidDestinationError
-        if self[dest] == Empty(EMPTY, dest[0], dest[1]):
+        piece.moved = True
+        defender = self[dest]
+        if defender == Empty(EMPTY, dest[0], dest[1]):
             self[dest] = self[source]
             self[dest].x = dest[0]
             self[dest].y = dest[1]
             self[source] = Empty(EMPTY, source[0], source[1])
+            return self._notify(MoveResult(source, dest, piece))
+        outcome = piece.attack(defender)
+        piece.revealed = defender.revealed = True
+        if outcome is True:
+            self[dest] = self[source]
+            self[dest].x = dest[0]
+            self[dest].y = dest[1]
+            self[source] = Empty(EMPTY, source[0], source[1])
+        elif outcome is None:
+            self[dest] = Empty(EMPTY, dest[0], dest[1])
+            self[source] = Empty(EMPTY, source[0], source[1])
         else:
-            if piece.attack(self[dest]) is True:
-                self[dest] = self[source]
-                self[dest].x = dest[0]
-                self[dest].y = dest[1]
-                self[source] = Empty(EMPTY, source[0], source[1])
-            elif piece.attack(self[dest]) is None:
-                self[dest] = Empty(EMPTY, dest[0], dest[1])
-                self[source] = Empty(EMPTY, source[0], source[1])
-            else:
-                self[source] = Empty(EMPTY, source[0], source[1])
+            self[source] = Empty(EMPTY, source[0], source[1])
+        return self._notify(MoveResult(source, dest, piece, defender, outcome))
 
     def available_range(self, x: int, y: int) -> PieceRange:
         """
@@ -210,29 +294,31 @@ class Board:
         If at the end of the distance there is an opponent Piece, it is added to the tuple; otherwise,
         the second slot will be None.
         """
+        cached = self._ranges.get((x, y))
+        if cached is not None:
+            self.cache_hits += 1
+            return cached
+        piece_range = self._available_range(x, y)
+        self.cache_misses += 1
+        self._ranges[x, y] = piece_range
+        return piece_range
+
+    def clear_cache(self) -> None:
+        """Forget all cached ranges, after changing pieces in place."""
+        self._ranges.clear()
+
+    def _available_range(self, x: int, y: int) -> PieceRange:
+        """Compute the `PieceRange` of the piece at `x`, `y`, without the cache."""
         piece = self[x, y]
         if not isinstance(piece, Piece):
             raise NoPieceError
         if piece.name == FLAG or piece.name == BOMB:
             return EmptyPieceRange
 
+        rays = self.geometry.rays[x, y]
         if piece.name == SCOUT:
-            return self._calculate_scout_range_piece(piece, x, y)
-
-        else:
-            north_field = self.get((x, y - 1), None)
-            north = self._create_regular_range(piece, north_field)
-
-            east_field = self.get((x + 1, y), None)
-            east = self._create_regular_range(piece, east_field)
-
-            south_field = self.get((x, y + 1), None)
-            south = self._create_regular_range(piece, south_field)
-
-            west_field = self.get((x - 1, y), None)
-            west = self._create_regular_range(piece, west_field)
-
-            return PieceRange(piece, north, east, south, west)
+            return PieceRange(piece, *(self._create_scout_range(piece, ray) for ray in rays))
+        return PieceRange(piece, *(self._create_regular_range(piece, ray) for ray in rays))
 
     def __repr__(self) -> str:
         """Show the board."""
@@ -240,7 +326,7 @@ class Board:
 
     def __len__(self) -> int:
         """Get the length of the board."""
-        return 10 * 10
+        return self.geometry.size
 
     def __getitem__(self, key: tuple[int, int] | tuple[str, int] | str) -> Piece | Lake | Empty:
         """Get a cell from the board."""
@@ -252,12 +338,39 @@ class Board:
         """Put `value` in a cell of the board."""
         self._raise_when_outside_dimensions(key)
         self._board[key] = value
+        if self._ranges:
+            self._invalidate(key)
+
+    def _invalidate(self, key: tuple[int, int]) -> None:
+        """Forget the cached ranges that can reach `key`: its neighbours, and the scouts in line with it."""
+        ranges = self._ranges
+        ranges.pop(key, None)
+        rays = self.geometry.rays.get(key)
+        if rays is None:  # a lake: anything may change
+            ranges.clear()
+            return
+        for ray in rays:
+            for distance, square in enumerate(ray):
+                cached = ranges.get(square)
+                if cached is None or cached is EmptyPieceRange:
+                    continue
+                if distance == 0 or cached.piece.name == SCOUT:
+                    del ranges[square]
+
+    def _notify(self, result: MoveResult) -> MoveResult:
+        for listener in self.listeners:
+            listener(result)
+        return result
 
     def _add_lakes(self) -> None:
         """Add the lakes to the board."""
-        for lake in self.LAKES:
+        for lake in self.geometry.lakes:
             self._board[lake] = Lake(LAKE, x=lake[0], y=lake[1])
 
+    def _rows(self, rows: range) -> list[Piece | Field]:
+        """Return the empty cells or pieces in `rows`, column by column."""
+        return [self[x, y] for x in range(self.geometry.width) for y in rows]
+
     def _by_colour(self, colour: Colour) -> list[Piece]:
         """Return all the pieces of the given player."""
         pieces = []
@@ -269,13 +382,13 @@ class Board:
     def _first_line(self) -> str:
         """Create the first line of the board."""
         result = "\n     |"
-        result += "|".join([f"{item.upper():^{SIZE + 2}}" for item in self.TOP])
+        result += "|".join([f"{item.upper():^{SIZE + 2}}" for item in self.geometry.columns])
         result += "|\n ----|"
         return result
 
     def _last_line(self, result: str) -> str:
         """Create the last line of the board."""
-        result += f"{DASH:-^{SIZE + 2}}|" * 10
+        result += f"{DASH:-^{SIZE + 2}}|" * self.geometry.width
         result += "\n"
         return result
 
@@ -291,19 +404,19 @@ class Board:
 
     def _raise_when_outside_dimensions(self, key: tuple[int, int]) -> None:
         """Raise when outside the board dimensions."""
-        if key[0] < 0 or key[0] > 9:
+        if key[0] < 0 or key[0] >= self.geometry.width:
             raise InvalidDimensionsError()
-        if key[1] < 0 or key[1] > 9:
+        if key[1] < 0 or key[1] >= self.geometry.height:
             raise InvalidDimensionsError()
 
     def _str_to_int(self, s: str) -> int:
-        """Return s in `self.TOP` as an int. `a` is 0,... `j` is 9. This method is case-insensitive."""
+        """Return s in the columns as an int. `a` is 0,... `j` is 9. This method is case-insensitive."""
         if not isinstance(s, str):
             raise InvalidCoordinateError
         lower_char = s.lower()
-        if lower_char not in self.TOP:
+        if lower_char not in self.geometry.columns:
             raise InvalidCoordinateError
-        return self.TOP.index(lower_char)
+        return self.geometry.columns.index(lower_char)
 
     def _coordinate_to_tuple(self, s: str) -> tuple[int, int]:
         """
@@ -314,11 +427,11 @@ class Board:
         try:
             x = s[0].lower()  # first should be a character
             y = s[1:]  # second should be a positive int
-            if x in self.TOP:
+            if x in self.geometry.columns:
                 with contextlib.suppress(ValueError):
                     y_int = int(y)
-                    if 1 <= y_int <= 10:
-                        return self._str_to_int(x), 10 - y_int
+                    if 1 <= y_int <= self.geometry.height:
+                        return self._str_to_int(x), self.geometry.height - y_int
             raise InvalidCoordinateError
         except (IndexError, TypeError):
             raise InvalidCoordinateError
@@ -330,61 +443,38 @@ class Board:
         :param key:
         :return:
         """
+        width, height = self.geometry.width, self.geometry.height
         if isinstance(key, tuple):
-            if isinstance(key[0], int) and 0 <= key[0] <= 9 and isinstance(key[1], int) and 0 <= key[1] <= 9:
+            if isinstance(key[0], int) and 0 <= key[0] < width and isinstance(key[1], int) and 0 <= key[1] < height:
                 return key
-            elif isinstance(key[0], str) and isinstance(key[1], int) and 1 <= key[1] <= 10:
-                return self._str_to_int(key[0]), 10 - key[1]
+            elif isinstance(key[0], str) and isinstance(key[1], int) and 1 <= key[1] <= height:
+                return self._str_to_int(key[0]), height - key[1]
             else:
                 raise InvalidCoordinateError
         elif isinstance(key, str):
             return self._coordinate_to_tuple(key)
 
-    def _calculate_scout_range_piece(self, piece: Piece, x: int, y: int) -> PieceRange:
-        """Return the `RangePiece` for a `SCOUT` in the board."""
-        i = 1
-        while north_field := self.get((x, y - i), None):
-            if not isinstance(north_field, Empty):
-                break
-            i += 1
-        north = self._create_scout_range(i, piece, north_field)
-        i = 1
-        while east_field := self.get((x + i, y), None):
-            if not isinstance(east_field, Empty):
-                break
-            i += 1
-        east = self._create_scout_range(i, piece, east_field)
-        i = 1
-        while south_field := self.get((x, y + i), None):
-            if not isinstance(south_field, Empty):
-                break
-            i += 1
-        south = self._create_scout_range(i, piece, south_field)
-        i = 1
-        while west_field := self.get((x - i, y), None):
-            if not isinstance(west_field, Empty):
-                break
-            i += 1
-        west = self._create_scout_range(i, piece, west_field)
-        return PieceRange(piece, north, east, south, west)
-
-    def _create_regular_range(self, source: Piece, destination: Piece | Empty | None) -> tuple[int, Piece | None]:
+    def _create_regular_range(self, source: Piece, ray: tuple[tuple[int, int], ...]) -> tuple[int, Piece | None]:
         """Create a range tuple containing the length (0 or 1) and the possible `Piece` that can be attacked."""
-        if destination and isinstance(destination, Empty):
-            north = 1, None
-        elif destination and isinstance(destination, Piece) and destination.colour != source.colour:
-            north = 1, destination
-        else:
-            north = 0, None
-        return north
-
-    def _create_scout_range(self, index: int, source: Piece, destination: Piece | None) -> tuple[int, Piece | None]:
+        if not ray:
+            return 0, None
+        destination = self._board.get(ray[0], None)
+        if destination is None or isinstance(destination, Empty):
+            return 1, None
+        if isinstance(destination, Piece) and destination.colour != source.colour:
+            return 1, destination
+        return 0, None
+
+    def _create_scout_range(self, source: Piece, ray: tuple[tuple[int, int], ...]) -> tuple[int, Piece | None]:
         """Create a range tuple containing the distance and the possible `Piece` that can be attacked."""
-        if destination and isinstance(destination, Piece) and destination.colour != source.colour:
-            north = index, destination
-        else:
-            north = index - 1, None
-        return north
+        for index, square in enumerate(ray):
+            destination = self._board.get(square, None)
+            if destination is None or isinstance(destination, Empty):
+                continue
+            if isinstance(destination, Piece) and destination.colour != source.colour:
+                return index + 1, destination
+            return index, None
+        return len(ray), None
 
     def _is_possible_destination(self, piece: Piece, dest: tuple[int, int]) -> bool:
         piece_range = self.available_range(piece.x, piece.y)
@@ -0,0 +1,174 @@
+"""
+The Strategy opening book.
+
+The first moves after the deployment are played over and over in self-play; a book remembers how they went.
+`build_book` streams archived `GameRecord`s and counts, for the first `plies` plies of every game, how often
+every move was played in every position and how the games ended for the colour that played it.
+
+A position is the board as seen by the colour to move (see `position_hash`): an agent may only use what it
+knows.  It is keyed by the hash of its canonical mirror image (see `CanonicalPosition`), with the colour to
+move, and its moves are stored in the canonical frame, so a position and its mirror image share their moves.
+
+The book is compiled into one table sorted by position and move, as columns, saved as `.npy` files in a
+directory:
+
+    key (uint64), move (uint16: source * 100 + destination square index), games, wins, draws (uint32)
+
+`OpeningBook.load` memory-maps the columns, and `probe` finds the moves of a position with a binary search
+on the keys, so a lookup takes microseconds and only reads a few pages.  A `BookAgent` plays the book moves
+of an opening and falls back to another agent as soon as the game leaves the book.
+"""
+import os
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from strategy.agents import Agent
+from strategy.board import Move, MoveResult
+from strategy.colour import Colour
+from strategy.mirror import CanonicalPosition
+from strategy.records import GameRecord
+from strategy.repetition import BLUE_TO_MOVE
+from strategy.view import BoardView
+
+PLIES = 20
+MIN_GAMES = 3
+
+COLUMNS = {"key": np.uint64, "move": np.uint16, "games": np.uint32, "wins": np.uint32, "draws": np.uint32}
+
+
+def _key(position: CanonicalPosition) -> int:
+    return position.key ^ BLUE_TO_MOVE if position.colour == Colour.BLUE else position.key
+
+
+def _encode(move: Move) -> int:
+    (x, y), (dx, dy) = move
+    return (y * 10 + x) * 100 + dy * 10 + dx
+
+
+def _decode(code: int) -> Move:
+    source, dest = divmod(code, 100)
+    return (source % 10, source // 10), (dest % 10, dest // 10)
+
+
+@dataclass(frozen=True)
+class BookMove:
+    """A move of a position in the book (in the frame of the position), and how the games went for the mover."""
+
+    move: Move
+    games: int
+    wins: int
+    draws: int
+
+    @property
+    def score(self) -> float:
+        """Return the mean score of the mover (a win is 1, a draw 0.5)."""
+        return (self.wins + 0.5 * self.draws) / self.games
+
+
+def build_book(records: Iterable[GameRecord], plies: int = PLIES) -> dict[str, np.ndarray]:
+    """Count the first `plies` moves of `records` (read one at a time) and return the sorted columns of the book."""
+    counts: dict[tuple[int, int], list[int]] = {}
+    for record in records:
+        board = record.board()
+        positions = {colour: CanonicalPosition(board, colour) for colour in Colour}
+        colour = Colour.RED
+        for move in record.moves[:plies]:
+            position = positions[colour]
+            entry = counts.setdefault((_key(position), _encode(position.canonical_move(move))), [0, 0, 0])
+            entry[0] += 1
+            entry[1] += record.winner == colour
+            entry[2] += record.winner is None
+            result = board.move(*move)
+            for position in positions.values():
+                position.update(result)
+            colour = colour.opponent
+    rows = sorted((key, move, *entry) for (key, move), entry in counts.items())
+    return {name: np.array([row[i] for row in rows], dtype=dtype) for i, (name, dtype) in enumerate(COLUMNS.items())}
+
+
+class OpeningBook:
+    """A table of book moves, sorted by position."""
+
+    def __init__(self, columns: dict[str, np.ndarray], min_games: int = MIN_GAMES) -> None:
+        """Use the `columns` of a book (see `build_book`); moves of fewer than `min_games` games are left out."""
+        self.columns = columns
+        self.keys = columns["key"]
+        self.min_games = min_games
+
+    def save(self, directory: str | Path) -> None:
+        """Write every column as a `.npy` file in `directory`, each through a temporary file."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        for name, column in self.columns.items():
+            path = directory / f"{name}.npy"
+            temporary = path.with_suffix(".tmp")
+            with open(temporary, "wb") as file:
+                np.save(file, column)
+            os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, directory: str | Path, min_games: int = MIN_GAMES) -> "OpeningBook":
+        """Return the book saved in `directory`, memory-mapped read-only."""
+        directory = Path(directory)
+        # plain arrays on the mapped memory: slicing a `np.memmap` costs more than the lookup itself
+        columns = {name: np.asarray(np.load(directory / f"{name}.npy", mmap_mode="r")) for name in COLUMNS}
+        return cls(columns, min_games)
+
+    def probe(self, position: CanonicalPosition) -> list[BookMove]:
+        """Return the moves of `position` (as seen by the colour to move) in the book, in its own frame."""
+        key = np.uint64(_key(position))
+        start = int(np.searchsorted(self.keys, key, side="left"))
+        end = int(np.searchsorted(self.keys, key, side="right"))
+        if start == end:
+            return []
+        columns = (self.columns[name][start:end].tolist() for name in ("move", "games", "wins", "draws"))
+        return [
+            BookMove(position.canonical_move(_decode(move)), games, wins, draws)
+            for move, games, wins, draws in zip(*columns)
+        ]
+
+    def best(self, position: CanonicalPosition) -> Move | None:
+        """Return the move with the best score of `position` among those played in `min_games` games or more."""
+        moves = [move for move in self.probe(position) if move.games >= self.min_games]
+        if not moves:
+            return None
+        return max(moves, key=lambda move: (move.score, move.games)).move
+
+    def __len__(self) -> int:
+        """Return the number of (position, move) entries."""
+        return len(self.keys)
+
+
+class BookAgent:
+    """Play the best book move while the game is in the book, then let the `fallback` agent play."""
+
+    def __init__(self, book: OpeningBook, fallback: Agent) -> None:
+        """Create an agent playing from `book`, and like `fallback` out of the book."""
+        self.book = book
+        self.fallback = fallback
+        self.position: CanonicalPosition | None = None
+        self.hits = 0
+
+    def start(self, view: BoardView) -> None:
+        """Start a new game in the book."""
+        self.position = CanonicalPosition(view.board, view.colour)
+        self.fallback.start(view)
+
+    def observe(self, result: MoveResult) -> None:
+        """Follow the position while in the book, and tell the fallback agent."""
+        if self.position is not None:
+            self.position.update(result)
+        self.fallback.observe(result)
+
+    def select_move(self, view: BoardView, colour: Colour) -> Move:
+        """Return the book move, or the move of the fallback agent once out of the book."""
+        if self.position is not None:
+            move = self.book.best(self.position)
+            if move is not None and move in view.moves(colour):
+                self.hits += 1
+                return move
+            self.position = None  # out of the book for the rest of the game
+        return self.fallback.select_move(view, colour)
@@ -0,0 +1,264 @@
+"""
+The Strategy checkpoints.
+
+A `Batch` plays many headless games, a few at a time, and keeps a journal of them in a checkpoint file, so a
+batch that crashed or was stopped resumes where it left off and ends with exactly the same results.
+
+Every game is drawn from its own seed (derived from the seed of the batch): its setup, and the random
+generators of its agents.  The journal is a file of JSON lines:
+
+    {"type": "start", "game": 3, "seed": ...}
+    {"type": "moves", "game": 3, "plies": 120, "moves": [[6, 6, 6, 5], ...], "rngs": {...}, "board": "..."}
+    {"type": "result", "game": 3, "winner": "RED", "plies": 251, "reason": null}
+
+A "moves" line only holds the moves since the previous checkpoint of that game, with the state of the random
+generators of its agents (an `rng` attribute) and a snapshot of the board.  A game is resumed by setting
+it up again from its seed, replaying its moves (so the agents observe them all again) and restoring the
+random generators; the snapshot checks the replay.
+
+The lines are written by a background thread, so the games do not wait for the disk, and every checkpoint
+is flushed and synced as a whole.  A line torn by a crash is ignored; when a batch resumes, the journal is
+compacted first, into a temporary file that replaces it atomically.
+"""
+import json
+import logging
+import os
+import queue
+import random
+import threading
+from pathlib import Path
+
+from strategy.agents import RandomAgent
+from strategy.colour import Colour
+from strategy.delta import board_symbols
+from strategy.exceptions import InvalidRecordError
+from strategy.league import AgentFactory
+from strategy.runner import MAX_PLIES, Game, GameResult, random_board
+
+log = logging.getLogger(__name__)
+
+PARALLEL = 8
+INTERVAL = 100
+
+_SYNC = object()
+_CLOSE = object()
+
+
+def _rng_state(rng: random.Random) -> list:
+    version, state, gauss = rng.getstate()
+    return [version, list(state), gauss]
+
+
+def _set_rng_state(rng: random.Random, state: list) -> None:
+    version, internal, gauss = state
+    rng.setstate((version, tuple(internal), gauss))
+
+
+class JournalWriter:
+    """Append lines to a journal from a background thread; `sync` makes the lines so far durable."""
+
+    def __init__(self, path: str | Path) -> None:
+        """Open `path` for appending and start the writer thread."""
+        self.path = Path(path)
+        # the file lives as long as the writer: `_run` closes it on the writer thread
+        self._file = open(self.path, "a", encoding="utf-8")  # noqa: SIM115
+        self._queue: queue.Queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="journal-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, entry: dict) -> None:
+        """Queue `entry` to be written as one JSON line."""
+        self._queue.put(entry)
+
+    def sync(self) -> None:
+        """Flush and sync the lines queued so far, without waiting for it."""
+        self._queue.put(_SYNC)
+
+    def close(self) -> None:
+        """Write and sync the queued lines, and stop the writer thread."""
+        self._queue.put(_CLOSE)
+        self._thread.join()
+
+    def __enter__(self) -> "JournalWriter":
+        """Return the writer; the journal is synced and closed when the `with` block ends."""
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        """Write and sync the queued lines, and stop the writer thread."""
+        self.close()
+
+    def _run(self) -> None:
+        with self._file:
+            while True:
+                item = self._queue.get()
+                if item is _SYNC or item is _CLOSE:
+                    self._file.flush()
+                    os.fsync(self._file.fileno())
+                    if item is _CLOSE:
+                        return
+                else:
+                    self._file.write(json.dumps(item, separators=(",", ":")) + "\n")
+
+
+def read_journal(path: str | Path) -> list[dict]:
+    """Return the entries of the journal at `path`; a torn last line (from a crash) is ignored."""
+    entries = []
+    with open(path, encoding="utf-8") as file:
+        lines = file.read().split("\n")
+    for number, line in enumerate(lines):
+        if not line:
+            continue
+        try:
+            entries.append(json.loads(line))
+        except json.JSONDecodeError:
+            if number < len(lines) - 1:
+                raise InvalidRecordError(f"line {number + 1} of {path} is corrupt") from None
+            log.warning("Ignoring the torn last line of %s.", path)
+    return entries
+
+
+def compact(entries: list[dict]) -> list[dict]:
+    """Return the entries that matter: per game its start, all its moves in one entry, and its result."""
+    games: dict[int, dict[str, dict]] = {}
+    for entry in entries:
+        game = games.setdefault(entry["game"], {})
+        if entry["type"] == "moves":
+            previous = game.get("moves")
+            if previous is not None:
+                entry = {**entry, "moves": previous["moves"] + entry["moves"]}
+        game[entry["type"]] = entry
+    compacted = []
+    for number in sorted(games):
+        game = games[number]
+        if "result" in game:
+            compacted.append(game["result"])
+        else:
+            compacted.extend(game[kind] for kind in ("start", "moves") if kind in game)
+    return compacted
+
+
+def write_journal(path: str | Path, entries: list[dict]) -> None:
+    """Write `entries` to a temporary file, and replace the journal at `path` with it atomically."""
+    path = Path(path)
+    temporary = path.with_suffix(path.suffix + ".tmp")
+    with open(temporary, "w", encoding="utf-8") as file:
+        for entry in entries:
+            file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary, path)
+
+
+class Batch:
+    """A batch of games between agents of `red` and `blue`, checkpointed to the journal at `path`."""
+
+    def __init__(
+        self,
+        path: str | Path,
+        games: int,
+        red: AgentFactory = RandomAgent,
+        blue: AgentFactory = RandomAgent,
+        seed: int = 0,
+        max_plies: int = MAX_PLIES,
+        parallel: int = PARALLEL,
+        interval: int = INTERVAL,
+    ) -> None:
+        """
+        Create the batch; `parallel` games are played at the same time, one ply each per round.
+
+        Every `interval` rounds, the games in flight are checkpointed; results are written right away.
+        """
+        self.path = Path(path)
+        self.games = games
+        self.factories = {Colour.RED: red, Colour.BLUE: blue}
+        self.seed = seed
+        self.max_plies = max_plies
+        self.parallel = parallel
+        self.interval = interval
+        self.seeds = random.Random(seed).sample(range(2**32), games)
+        self.results: dict[int, GameResult] = {}
+
+    def run(self) -> list[GameResult]:
+        """Play (or resume) the batch until all games are over, and return their results in order."""
+        running = self._resume() if self.path.exists() else {}
+        started = set(running) | set(self.results)
+        waiting = [number for number in range(self.games) if number not in started]
+        written = {number: game.plies for number, game in running.items()}
+        rounds = 0
+        with JournalWriter(self.path) as writer:
+            while running or waiting:
+                while waiting and len(running) < self.parallel:
+                    number = waiting.pop(0)
+                    running[number] = self._start(number)
+                    written[number] = 0
+                    writer.write({"type": "start", "game": number, "seed": self.seeds[number]})
+                for number, game in list(running.items()):
+                    if not game.over:
+                        game.step()
+                    if game.over:
+                        self.results[number] = game.result
+                        writer.write(
+                            {
+                                "type": "result",
+                                "game": number,
+                                "winner": game.result.winner.name if game.result.winner else None,
+                                "plies": game.result.plies,
+                                "reason": game.result.reason,
+                            }
+                        )
+                        writer.sync()
+                        del running[number], written[number]
+                rounds += 1
+                if rounds % self.interval == 0:
+                    for number, game in running.items():
+                        writer.write(self._checkpoint(number, game, written[number]))
+                        written[number] = game.plies
+                    writer.sync()
+        return [self.results[number] for number in range(self.games)]
+
+    def _start(self, number: int) -> Game:
+        rng = random.Random(self.seeds[number])
+        board = random_board(rng)
+        agents = {colour: factory(random.Random(rng.getrandbits(32))) for colour, factory in self.factories.items()}
+        return Game(agents, board, self.max_plies)
+
+    def _checkpoint(self, number: int, game: Game, written: int) -> dict:
+        rngs = {
+            colour.name: _rng_state(agent.rng)
+            for colour, agent in game.agents.items()
+            if isinstance(getattr(agent, "rng", None), random.Random)
+        }
+        return {
+            "type": "moves",
+            "game": number,
+            "plies": game.plies,
+            "moves": [[*source, *dest] for source, dest in game.moves[written:]],
+            "rngs": rngs,
+            "board": board_symbols(game.board),
+        }
+
+    def _resume(self) -> dict[int, Game]:
+        """Load the results and restore the games in flight from the journal, after compacting it."""
+        entries = compact(read_journal(self.path))
+        write_journal(self.path, entries)
+        running = {}
+        for entry in entries:
+            number = entry["game"]
+            if entry["type"] == "result":
+                winner = Colour[entry["winner"]] if entry["winner"] else None
+                self.results[number] = GameResult(winner, entry["plies"], entry["reason"])
+            elif entry["type"] == "start":
+                if entry["seed"] != self.seeds[number]:
+                    raise InvalidRecordError(f"{self.path} is the journal of another batch")
+                running[number] = self._start(number)
+            else:
+                game = running[number]
+                for sx, sy, dx, dy in entry["moves"]:
+                    game.play(((sx, sy), (dx, dy)))
+                if game.plies != entry["plies"] or board_symbols(game.board) != entry["board"]:
+                    raise InvalidRecordError(f"game {number} of {self.path} does not replay to its checkpoint")
+                for colour, agent in game.agents.items():
+                    if colour.name in entry["rngs"]:
+                        _set_rng_state(agent.rng, entry["rngs"][colour.name])
+        log.debug("Resumed %d finished and %d running games from %s.", len(self.results), len(running), self.path)
+        return running
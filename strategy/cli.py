@@ -0,0 +1,238 @@
+"""
+The Strategy command line.
+
+    strategy play                          a cpu vs cpu game on the console
+    strategy simulate --games 1000         headless games, optionally checkpointed and recorded
+    strategy tournament random search      a league between agents
+    strategy bench imports                 the import time of the modules (or: bench distance)
+    strategy replay games.strg --game 3    the final position of a recorded game
+    strategy watch --fps 30                a live game in a pygame window
+
+Processes are started by the thousand (workers, scripts), so this module imports as little as it can: rich
+(the console), NumPy (features, search) and pygame are only imported inside the commands that need them.
+`simulate` reports with `typer.echo` and never imports rich.
+"""
+import random
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Optional
+
+import typer
+
+if TYPE_CHECKING:
+    from strategy.agents import Agent
+
+app = typer.Typer(help="The Strategy game.", add_completion=False)
+
+AGENTS = ("random", "search", "ismcts")
+AGENTS_HELP = f"The agents: {', '.join(AGENTS)}."
+BUDGET = 0.1
+MODULES = (
+    "strategy.cli",
+    "strategy.runner",
+    "strategy.records",
+    "strategy.console",
+    "strategy.main",
+    "strategy.features",
+    "strategy.search",
+    "pygame",
+)
+
+
+def agent_factory(name: str, budget: float = BUDGET) -> "Callable[[random.Random], Agent]":
+    """Return a factory creating agents of `name` (see `AGENTS`) from a random generator, importing it lazily."""
+    if name == "random":
+        from strategy.agents import RandomAgent
+
+        return RandomAgent
+    if name == "search":
+        from strategy.search import SearchAgent
+
+        return lambda rng: SearchAgent(budget)
+    if name == "ismcts":
+        from strategy.ismcts import ISMCTSAgent
+
+        return lambda rng: ISMCTSAgent(budget, seed=rng.getrandbits(32))
+    raise typer.BadParameter(f"unknown agent {name!r}, choose from {', '.join(AGENTS)}")
+
+
+def entrant_names(agents: list[str]) -> list[str]:
+    """Return the names of `agents` in a league, numbering the repeated ones ("random", "random#2", ...)."""
+    names = []
+    for i, name in enumerate(agents):
+        repeats = agents[:i].count(name)
+        names.append(f"{name}#{repeats + 1}" if repeats else name)
+    return names
+
+
+def import_times(modules: tuple[str, ...] = MODULES, repeat: int = 5) -> dict[str, float]:
+    """Return the median seconds it takes a new interpreter to import each of `modules`."""
+    times = {}
+    for module in modules:
+        samples = []
+        for _ in range(repeat):
+            code = f"import time; start = time.perf_counter(); import {module}; print(time.perf_counter() - start)"
+            process = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+            if process.returncode:
+                break
+            samples.append(float(process.stdout.split()[-1]))  # after anything the module prints
+        if samples:
+            times[module] = statistics.median(samples)
+    return times
+
+
+@app.command()
+def play() -> None:
+    """Play a cpu vs cpu game on the console."""
+    from strategy.console import console
+    from strategy.main import main
+
+    console.print("Strategy started.")
+    main()
+
+
+@app.command()
+def simulate(
+    games: int = typer.Option(100, help="The number of games."),
+    red: str = typer.Option("random", help="The agent playing red."),
+    blue: str = typer.Option("random", help="The agent playing blue."),
+    seed: int = typer.Option(0, help="The seed of the games."),
+    max_plies: int = typer.Option(2000, help="The number of plies after which a game is a draw."),
+    checkpoint: Optional[Path] = typer.Option(None, help="Checkpoint to (and resume from) this journal."),
+    records: Optional[Path] = typer.Option(None, help="Write the records of the games to this file."),
+) -> None:
+    """Play headless games and report the results, without touching the console."""
+    if checkpoint and records:
+        raise typer.BadParameter("--checkpoint and --records cannot be combined")
+    start = time.perf_counter()
+    factories = agent_factory(red), agent_factory(blue)
+    if checkpoint:
+        from strategy.checkpoint import Batch
+
+        results = Batch(checkpoint, games, *factories, seed=seed, max_plies=max_plies).run()
+    else:
+        from strategy.colour import Colour
+        from strategy.runner import Game
+
+        rng = random.Random(seed)
+        played = []
+        for _ in range(games):
+            game_rng = random.Random(rng.getrandbits(32))
+            agents = {
+                Colour.RED: factories[0](random.Random(game_rng.getrandbits(32))),
+                Colour.BLUE: factories[1](random.Random(game_rng.getrandbits(32))),
+            }
+            game = Game(agents, max_plies=max_plies, rng=game_rng)
+            game.run()
+            played.append(game)
+        results = [game.result for game in played]
+        if records:
+            from strategy.records import GameRecord, write_records
+
+            write_records(records, (GameRecord.from_game(game) for game in played))
+    seconds = time.perf_counter() - start
+    winners = [str(result) for result in results]
+    typer.echo(
+        f"{games} games: red {winners.count('red')}, blue {winners.count('blue')}, draws {winners.count('draw')}; "
+        f"{statistics.fmean(result.plies for result in results):.0f} plies on average, "
+        f"{games / seconds:.1f} games per second."
+    )
+
+
+@app.command()
+def tournament(
+    agents: list[str] = typer.Argument(..., help=AGENTS_HELP),
+    games: int = typer.Option(100, help="The number of games."),
+    seed: int = typer.Option(0, help="The seed of the league."),
+    budget: float = typer.Option(BUDGET, help="The seconds per move of the searching agents."),
+    max_plies: int = typer.Option(2000, help="The number of plies after which a game is a draw."),
+) -> None:
+    """Rate agents in a league, playing the most informative pairings first."""
+    from rich.table import Table
+
+    from strategy.console import console
+    from strategy.league import League
+
+    if len(agents) < 2:
+        raise typer.BadParameter("a league needs at least two agents (an agent may be given twice)")
+    factories = {entrant: agent_factory(name, budget) for entrant, name in zip(entrant_names(agents), agents)}
+    league = League(factories, seed, max_plies)
+    league.run(games)
+    table = Table("Agent", "Rating", "Deviation", "Games")
+    for name, rating in league.standings():
+        table.add_row(name, f"{rating.rating:.0f}", f"{rating.deviation:.0f}", str(rating.games))
+    console.print(table)
+
+
+@app.command()
+def bench(
+    target: str = typer.Argument("imports", help="What to measure: imports or distance."),
+    repeat: int = typer.Option(5, help="The number of runs per module (imports)."),
+) -> None:
+    """Measure the import time of the modules, or the distance map repairs."""
+    if target == "imports":
+        for module, seconds in import_times(repeat=repeat).items():
+            typer.echo(f"{module:<20} {1000 * seconds:7.1f} ms")
+    elif target == "distance":
+        from strategy.distance import benchmark
+
+        for pieces in (40, 20, 8):
+            timings = benchmark(pieces=pieces)
+            typer.echo(
+                f"{pieces} pieces per colour: incremental {timings['incremental']:.0f} µs, "
+                f"full {timings['full']:.0f} µs per move"
+            )
+    else:
+        raise typer.BadParameter(f"unknown target {target!r}, choose from imports, distance")
+
+
+@app.command()
+def replay(
+    path: Path = typer.Argument(..., help="A file of game records."),
+    game: int = typer.Option(0, help="The number of the game in the file."),
+    plies: Optional[int] = typer.Option(None, help="Stop after this number of plies."),
+) -> None:
+    """Replay a recorded game and show its position."""
+    from itertools import islice
+
+    from strategy.console import console
+    from strategy.records import read_records
+
+    record = next(islice(read_records(path), game, None), None)
+    if record is None:
+        raise typer.BadParameter(f"{path} has no game {game}")
+    board = record.board()
+    for _ in islice(record.replay(board), plies):
+        pass
+    console.print(f"{board}", soft_wrap=True)
+    if plies is None or plies >= record.plies:
+        console.print(f"{record.plies} plies, {record.winner.name.capitalize() if record.winner else 'nobody'} won.")
+
+
+@app.command()
+def watch(
+    red: str = typer.Option("random", help="The agent playing red."),
+    blue: str = typer.Option("random", help="The agent playing blue."),
+    seed: Optional[int] = typer.Option(None, help="The seed of the game."),
+    fps: int = typer.Option(30, help="The maximum number of frames per second."),
+    delay: float = typer.Option(0.0, help="The seconds between the moves."),
+) -> None:
+    """Watch a live game in a window; the game does not wait for the display."""
+    from strategy.colour import Colour
+    from strategy.renderer import watch as show
+    from strategy.runner import Game
+
+    rng = random.Random(seed)
+    agents = {
+        Colour.RED: agent_factory(red)(random.Random(rng.getrandbits(32))),
+        Colour.BLUE: agent_factory(blue)(random.Random(rng.getrandbits(32))),
+    }
+    stats = show(Game(agents, rng=rng), fps, delay=delay)
+    typer.echo(f"{stats.frames} frames for {stats.updates} moves, {stats.dropped} frames dropped.")
+
+
+if __name__ == "__main__":
+    app()
@@ -11,3 +11,8 @@ class Colour(Enum):
     def __str__(self) -> str:
         """Beautify the name."""
         return self.name.lower()
+
+    @property
+    def opponent(self) -> "Colour":
+        """Return the other colour."""
+        return Colour.BLUE if self == Colour.RED else Colour.RED
@@ -0,0 +1,211 @@
+"""
+The Strategy delta encoding.
+
+Instead of sending the whole board after every move, a `MoveUpdate` carries the move, the ranks revealed
+by a combat and the cells it changed; its size does not depend on the size of the board.  A `BoardMirror`
+on the client applies the updates to its own copy of the board.  Every update has a sequence number, so
+a mirror notices a lost update; it then waits for the next `Snapshot`, which are sent periodically (and
+on request) to resynchronise.
+
+The cells are encoded as single symbols: see `cell_symbol`.  Squares are numbered row by row from the top,
+`y * width + x`, with the width of the `Geometry` of the board; both ends must use the same geometry.
+"""
+from dataclasses import dataclass, field
+
+from strategy.board import Board, MoveResult
+from strategy.colour import Colour
+from strategy.exceptions import InvalidGeometryError, SequenceGapError
+from strategy.game import Lake
+from strategy.geometry import CLASSIC, Geometry
+from strategy.pieces import POWERS, SYMBOLS, Piece
+
+UNKNOWN = "?"
+EMPTY_SYMBOL = "."
+LAKE_SYMBOL = "~"
+NO_COMBAT = "-"
+
+SNAPSHOT_INTERVAL = 50
+
+_NAMES = {symbol: name for name, symbol in SYMBOLS.items()}
+
+
+def cell_symbol(cell: Piece | Lake | None, colour: Colour | None = None) -> str:
+    """
+    Return the symbol of a cell.
+
+    Red pieces are upper case, blue pieces lower case (see `SYMBOLS`); empty cells are "." and lakes "~".
+    When `colour` is given, the pieces of the opponent are unknown ("?") until they are revealed.
+    """
+    if isinstance(cell, Piece):
+        if colour is not None and cell.colour != colour and not cell.revealed:
+            return UNKNOWN
+        symbol = SYMBOLS[cell.name]
+        return symbol.upper() if cell.colour == Colour.RED else symbol
+    if isinstance(cell, Lake):
+        return LAKE_SYMBOL
+    return EMPTY_SYMBOL
+
+
+def board_symbols(board: Board, colour: Colour | None = None) -> str:
+    """Return the board as 100 symbols (or one per square of its geometry), row by row from the top."""
+    width, height = board.geometry.width, board.geometry.height
+    return "".join(cell_symbol(board[x, y], colour) for y in range(height) for x in range(width))
+
+
+def board_from_symbols(symbols: str, geometry: Geometry = CLASSIC) -> Board:
+    """Return a new `Board` with the pieces of `symbols`, the inverse of `board_symbols` (without a colour)."""
+    board = Board(geometry)
+    for index, symbol in enumerate(symbols):
+        if symbol.lower() in _NAMES:
+            y, x = divmod(index, geometry.width)
+            name = _NAMES[symbol.lower()]
+            colour = Colour.RED if symbol.isupper() else Colour.BLUE
+            board[x, y] = Piece(name, POWERS[name], colour, x=x, y=y)
+    return board
+
+
+def _index(coordinates: tuple[int, int], geometry: Geometry) -> int:
+    return coordinates[1] * geometry.width + coordinates[0]
+
+
+def _coordinates(index: int, geometry: Geometry) -> tuple[int, int]:
+    y, x = divmod(index, geometry.width)
+    return x, y
+
+
+@dataclass(frozen=True)
+class MoveUpdate:
+    """
+    The changes of one move.
+
+    `combat` holds the symbols of the attacker and the defender when the move was an attack, `changes`
+    the new symbol of every changed cell by cell index (`y * width + x` in `geometry`).
+    """
+
+    seq: int
+    source: tuple[int, int]
+    dest: tuple[int, int]
+    combat: tuple[str, str] | None = None
+    changes: tuple[tuple[int, str], ...] = ()
+    geometry: Geometry = field(default=CLASSIC, repr=False, compare=False)
+
+    @classmethod
+    def from_result(cls, seq: int, result: MoveResult, board: Board, colour: Colour | None = None) -> "MoveUpdate":
+        """Create the update of `result` (just played on `board`) as seen by `colour` (or everybody)."""
+        combat = None
+        if result.is_attack:
+            combat = cell_symbol(result.piece), cell_symbol(result.defender)
+        changes = tuple(
+            (_index(coordinates, board.geometry), cell_symbol(board[coordinates], colour))
+            for coordinates in (result.source, result.dest)
+        )
+        return cls(seq, result.source, result.dest, combat, changes, board.geometry)
+
+    @classmethod
+    def decode(cls, line: str, geometry: Geometry = CLASSIC) -> "MoveUpdate":
+        """Return the `MoveUpdate` encoded in `line`, for a board of `geometry`."""
+        seq, source, dest, combat, changes = line.split()
+        return cls(
+            int(seq),
+            _coordinates(int(source), geometry),
+            _coordinates(int(dest), geometry),
+            None if combat == NO_COMBAT else (combat[0], combat[1]),
+            tuple((int(change[:-1]), change[-1]) for change in changes.split(",")),
+            geometry,
+        )
+
+    def encode(self) -> str:
+        """Return the update as one line of text, like "12 40 50 Mu 40.,50M"."""
+        combat = "".join(self.combat) if self.combat else NO_COMBAT
+        changes = ",".join(f"{index}{symbol}" for index, symbol in self.changes)
+        return f"{self.seq} {_index(self.source, self.geometry)} {_index(self.dest, self.geometry)} {combat} {changes}"
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """The full board (as symbols) after update `seq`."""
+
+    seq: int
+    symbols: str
+
+    @classmethod
+    def decode(cls, line: str) -> "Snapshot":
+        """Return the `Snapshot` encoded in `line`."""
+        seq, symbols = line.split()
+        return cls(int(seq), symbols)
+
+    def encode(self) -> str:
+        """Return the snapshot as one line of text."""
+        return f"{self.seq} {self.symbols}"
+
+
+class DeltaEncoder:
+    """Number the moves of a game and create the `MoveUpdate`s and `Snapshot`s for one viewer."""
+
+    def __init__(self, board: Board, colour: Colour | None = None, interval: int = SNAPSHOT_INTERVAL) -> None:
+        """Create an encoder of `board` as seen by `colour`, with a `Snapshot` every `interval` updates."""
+        self.board = board
+        self.colour = colour
+        self.interval = interval
+        self.seq = 0
+
+    @property
+    def snapshot_due(self) -> bool:
+        """Return `True` when the periodic `Snapshot` should be sent after the current update."""
+        return self.seq % self.interval == 0
+
+    def update(self, result: MoveResult) -> MoveUpdate:
+        """Return the next `MoveUpdate` for the move that resulted in `result`."""
+        self.seq += 1
+        return MoveUpdate.from_result(self.seq, result, self.board, self.colour)
+
+    def snapshot(self) -> Snapshot:
+        """Return a `Snapshot` of the board at the current sequence number."""
+        return Snapshot(self.seq, board_symbols(self.board, self.colour))
+
+
+class BoardMirror:
+    """The client side copy of a board of `geometry`, kept up to date by `MoveUpdate`s and `Snapshot`s."""
+
+    def __init__(self, geometry: Geometry = CLASSIC) -> None:
+        """Create a mirror; it is out of sync until the first `Snapshot`."""
+        self.geometry = geometry
+        self.cells = [EMPTY_SYMBOL] * geometry.size
+        self.seq = -1
+        self.in_sync = False
+        self.last_combat: tuple[str, str] | None = None
+
+    def __str__(self) -> str:
+        """Return the mirrored board as symbols, one per square of its geometry."""
+        return "".join(self.cells)
+
+    def resync(self, snapshot: Snapshot) -> None:
+        """Replace the mirrored board by `snapshot`."""
+        if self.in_sync and snapshot.seq <= self.seq:
+            return
+        if len(snapshot.symbols) != self.geometry.size:
+            raise InvalidGeometryError(f"a snapshot of {len(snapshot.symbols)} cells, not {self.geometry.size}")
+        self.cells = list(snapshot.symbols)
+        self.seq = snapshot.seq
+        self.in_sync = True
+
+    def apply(self, update: MoveUpdate) -> None:
+        """
+        Apply `update`.
+
+        Updates that are already applied are ignored; when an update is missing, the mirror gets out of
+        sync and `SequenceGapError` is raised until the next `Snapshot`.
+        """
+        if self.in_sync and update.seq <= self.seq:
+            return
+        if not self.in_sync or update.seq != self.seq + 1:
+            self.in_sync = False
+            raise SequenceGapError(f"expected update {self.seq + 1}, got {update.seq}")
+        for index, symbol in update.changes:
+            self.cells[index] = symbol
+        self.last_combat = update.combat
+        self.seq = update.seq
+
+    def __getitem__(self, key: tuple[int, int]) -> str:
+        """Return the symbol of the cell at `key`."""
+        return self.cells[_index(key, self.geometry)]
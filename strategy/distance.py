@@ -0,0 +1,274 @@
+"""
+The Strategy distance maps.
+
+A distance map holds, for every square, the number of single steps needed to reach it from its root square,
+around the lakes and the pieces: a piece can be reached (attacked) but not passed.  Since paths can be walked
+both ways, the map rooted at a piece gives the distance from that piece to every square, and the map rooted
+at a square (like the suspected flag of the opponent) the distance from every piece to that square.
+
+`DistanceMaps` keeps maps rooted at the pieces of a colour, which follow their pieces, and maps rooted at
+fixed target squares.  It listens to `Board.move` and repairs the maps where the occupancy changed:
+
+    - a square that is freed can only shorten paths: the decrease is propagated from that square only;
+    - a square that is taken can only lengthen paths through it: the squares that have no other shortest
+      path are reset and filled in again from the edge of that region.
+
+Only the map of the piece that moved is computed again.  The repairs only pay off on a sparse board, though:
+with many pieces, a search from scratch is cheap (the pieces block most paths) while most maps need a repair,
+so from `CROWDED` pieces on the board all maps are computed again instead.  `STATIC` holds the distances
+between all squares around the lakes only, computed once.  Run this module to compare the updates with
+recomputing all maps.
+"""
+import heapq
+import random
+import time
+from collections import deque
+
+import numpy as np
+
+from strategy.board import Board, MoveResult
+from strategy.colour import Colour
+from strategy.game import EMPTY, Empty
+from strategy.geometry import check_classic
+from strategy.pieces import BOMB, FLAG
+
+UNREACHABLE = 1000
+CROWDED = 20  # pieces on the board from which computing all maps again is faster than repairing them
+
+_LAKES = {y * 10 + x for x, y in Board.LAKES}
+NEIGHBOURS = [
+    tuple(
+        j
+        for j in (i - 10, i + 1, i + 10, i - 1)
+        if 0 <= j < 100 and j not in _LAKES and (j // 10 == i // 10 or j % 10 == i % 10)
+    )
+    for i in range(100)
+]
+
+
+def _index(square: tuple[int, int]) -> int:
+    return square[1] * 10 + square[0]
+
+
+def bfs(root: int, occupied: list[bool]) -> list[int]:
+    """Return the distances from square index `root` to all squares; `occupied` squares are not passed."""
+    distances = [UNREACHABLE] * 100
+    distances[root] = 0
+    frontier = [root]
+    while frontier:
+        following = []
+        for u in frontier:
+            if u != root and occupied[u]:
+                continue
+            for v in NEIGHBOURS[u]:
+                if distances[v] == UNREACHABLE:
+                    distances[v] = distances[u] + 1
+                    following.append(v)
+        frontier = following
+    return distances
+
+
+STATIC = np.array([bfs(i, [False] * 100) if i not in _LAKES else [UNREACHABLE] * 100 for i in range(100)])
+
+
+def _free(distances: list[int], root: int, square: int, occupied: list[bool]) -> None:
+    """Propagate the shorter paths through `square`, which is no longer occupied."""
+    queue = deque([square])
+    while queue:
+        u = queue.popleft()
+        for v in NEIGHBOURS[u]:
+            if distances[u] + 1 < distances[v]:
+                distances[v] = distances[u] + 1
+                if v == root or not occupied[v]:
+                    queue.append(v)
+
+
+def _cut_off(distances: list[int], root: int, square: int, occupied: list[bool]) -> set[int]:
+    """Return the squares whose shortest paths all went through `square`, which is now occupied."""
+    affected: set[int] = set()
+    frontier = [square]
+    while frontier:  # level by level, so all the affected parents of a square are known when it is checked
+        candidates = {
+            v
+            for u in frontier
+            for v in NEIGHBOURS[u]
+            if v != root and v not in affected and distances[v] == distances[u] + 1
+        }
+        frontier = []
+        for v in candidates:
+            parents = (
+                w
+                for w in NEIGHBOURS[v]
+                if distances[w] == distances[v] - 1 and w not in affected and (w == root or not occupied[w])
+            )
+            if next(parents, None) is None:
+                affected.add(v)
+                if not occupied[v]:
+                    frontier.append(v)
+    return affected
+
+
+def _take(distances: list[int], root: int, square: int, occupied: list[bool]) -> None:
+    """Repair the paths that went through `square`, which is now occupied."""
+    affected = _cut_off(distances, root, square, occupied)
+    for v in affected:
+        distances[v] = UNREACHABLE
+    heap = []
+    for v in affected:
+        best = min(
+            (distances[w] + 1 for w in NEIGHBOURS[v] if w not in affected and (w == root or not occupied[w])),
+            default=UNREACHABLE,
+        )
+        if best < UNREACHABLE:
+            distances[v] = best
+            heap.append((best, v))
+    heapq.heapify(heap)
+    while heap:
+        d, v = heapq.heappop(heap)
+        if d > distances[v] or occupied[v]:
+            continue
+        for w in NEIGHBOURS[v]:
+            if d + 1 < distances[w]:
+                distances[w] = d + 1
+                heapq.heappush(heap, (d + 1, w))
+
+
+class DistanceMaps:
+    """Distance maps rooted at the movable pieces of `colour` (or of both colours) and at `targets`."""
+
+    def __init__(self, board: Board, colour: Colour | None = None, targets: tuple[tuple[int, int], ...] = ()) -> None:
+        """Compute the maps, and follow the moves on `board` from now on."""
+        check_classic(board.geometry, "distance maps")
+        self.board = board
+        self.colour = colour
+        self.occupied = [False] * 100
+        for piece in board.red() + board.blue():
+            self.occupied[_index((piece.x, piece.y))] = True
+        self.pieces: dict[int, list[int]] = {}
+        for piece in board.red() + board.blue():
+            if self._tracked(piece.colour) and piece.name not in (BOMB, FLAG):
+                root = _index((piece.x, piece.y))
+                self.pieces[root] = bfs(root, self.occupied)
+        self.targets: dict[int, list[int]] = {}
+        for target in targets:
+            self.add_target(target)
+        self.repairs = 0
+        self.recomputations = 0
+        board.listeners.append(self.update)
+
+    def distance(self, source: tuple[int, int], dest: tuple[int, int]) -> int:
+        """Return the distance from the tracked piece or target at `source` to `dest`."""
+        root = _index(source)
+        distances = self.pieces.get(root) or self.targets[root]
+        return distances[_index(dest)]
+
+    def map(self, square: tuple[int, int]) -> np.ndarray:
+        """Return the map rooted at `square` as a 10x10 array, indexed by [y, x]."""
+        root = _index(square)
+        return np.array(self.pieces.get(root) or self.targets[root]).reshape(10, 10)
+
+    def add_target(self, square: tuple[int, int]) -> None:
+        """Keep a map rooted at the fixed `square`."""
+        root = _index(square)
+        self.targets[root] = bfs(root, self.occupied)
+
+    def remove_target(self, square: tuple[int, int]) -> None:
+        """Stop keeping the map rooted at `square`."""
+        del self.targets[_index(square)]
+
+    def close(self) -> None:
+        """Stop following the moves on the board."""
+        self.board.listeners.remove(self.update)
+
+    def update(self, result: MoveResult) -> None:
+        """Repair the maps after the move of `result`, or compute them all again on a crowded board."""
+        source, dest = _index(result.source), _index(result.dest)
+        moved = self.pieces.pop(source, None)
+        if result.is_attack and result.outcome is not False:
+            self.pieces.pop(dest, None)
+        changes = [(source, False)]
+        if not result.is_attack:
+            changes.append((dest, True))
+        elif result.outcome is None:
+            changes.append((dest, False))
+        if sum(self.occupied) >= CROWDED:
+            for square, occupied in changes:
+                self.occupied[square] = occupied
+            for maps in (self.pieces, self.targets):
+                for root in maps:
+                    maps[root] = bfs(root, self.occupied)
+            self.recomputations += 1
+        else:
+            for square, occupied in changes:
+                self._set(square, occupied)
+            self.repairs += 1
+        if moved is not None and (not result.is_attack or result.outcome is True):
+            self.pieces[dest] = bfs(dest, self.occupied)
+
+    def _tracked(self, colour: Colour) -> bool:
+        return self.colour is None or colour == self.colour
+
+    def _set(self, square: int, occupied: bool) -> None:
+        self.occupied[square] = occupied
+        neighbours = NEIGHBOURS[square]
+        for maps in (self.pieces, self.targets):
+            for root, distances in maps.items():
+                if root == square:
+                    continue
+                # most maps do not change: only repair when a neighbour is (or could be) reached via `square`
+                through = distances[square] + 1
+                for v in neighbours:
+                    if occupied and distances[v] == through:
+                        _take(distances, root, square, self.occupied)
+                        break
+                    if not occupied and through < distances[v]:
+                        _free(distances, root, square, self.occupied)
+                        break
+
+
+def benchmark(games: int = 5, plies: int = 200, pieces: int = 40, seed: int = 0) -> dict[str, float]:
+    """
+    Return the microseconds per move of updating the maps of both colours, and of recomputing them all.
+
+    The games start from random setups with `pieces` pieces per colour (the flag and random others).
+    """
+    rng = random.Random(seed)
+    incremental = full = 0.0
+    moves = 0
+    for _ in range(games):
+        board = Board()
+        board.create_random_pieces(Colour.RED, rng)
+        board.create_random_pieces(Colour.BLUE, rng)
+        for own in (board.red(), board.blue()):
+            others = [piece for piece in own if piece.name != FLAG]
+            for piece in rng.sample(others, len(own) - pieces):
+                board[piece.x, piece.y] = Empty(EMPTY, piece.x, piece.y)
+        maps = DistanceMaps(board)
+        maps.close()
+        colour = Colour.RED
+        for _ in range(plies):
+            options = board.moves(colour)
+            if not options:
+                break
+            result = board.move(*rng.choice(options))
+            start = time.perf_counter()
+            maps.update(result)
+            middle = time.perf_counter()
+            for root in maps.pieces:
+                bfs(root, maps.occupied)
+            incremental += middle - start
+            full += time.perf_counter() - middle
+            moves += 1
+            colour = colour.opponent
+    return {"incremental": 1e6 * incremental / moves, "full": 1e6 * full / moves}
+
+
+if __name__ == "__main__":
+    from strategy.console import console
+
+    for pieces in (40, 20, 8):
+        timings = benchmark(pieces=pieces)
+        console.print(
+            f"{pieces} pieces per colour: update {timings['incremental']:.0f} µs per move, "
+            f"full recomputation {timings['full']:.0f} µs per move."
+        )
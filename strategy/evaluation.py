@@ -0,0 +1,52 @@
+"""The Strategy evaluation of positions, used by the search agents."""
+import math
+
+from strategy.board import Board
+from strategy.colour import Colour
+from strategy.pieces import (
+    BOMB,
+    CAPTAIN,
+    COLONEL,
+    FLAG,
+    GENERAL,
+    LIEUTENANT,
+    MAJOR,
+    MARSHAL,
+    MINER,
+    SCOUT,
+    SERGEANT,
+    SPY,
+)
+
+# The material value of the pieces: miners and the spy are worth more than their power.
+VALUES = {
+    BOMB: 2,
+    MARSHAL: 10,
+    GENERAL: 9,
+    COLONEL: 8,
+    MAJOR: 7,
+    CAPTAIN: 6,
+    LIEUTENANT: 5,
+    SERGEANT: 4,
+    MINER: 5,
+    SCOUT: 2,
+    SPY: 4,
+    FLAG: 0,
+}
+
+SCALE = 20.0
+
+
+def material(board: Board, colour: Colour) -> int:
+    """Return the material of `colour` minus the material of its opponent."""
+    total = 0
+    for piece in board.red():
+        total += VALUES[piece.name]
+    for piece in board.blue():
+        total -= VALUES[piece.name]
+    return total if colour == Colour.RED else -total
+
+
+def score(board: Board, colour: Colour) -> float:
+    """Return the expected result for `colour` between 0 (loss) and 1 (win), based on the material."""
+    return 0.5 + 0.5 * math.tanh(material(board, colour) / SCALE)
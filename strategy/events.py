@@ -0,0 +1,109 @@
+"""
+The Strategy game events.
+
+A `Game` with an `EventStream` tells what happens as typed events:
+
+    SetupEvent       the initial board (as the symbols of `board_symbols`)
+    MoveEvent        every move, by ply
+    CombatEvent      every attack, with the ranks of both pieces and the outcome
+    RevealEvent      every piece whose rank becomes known to the opponent (by a combat)
+    GameOverEvent    the result
+
+The events go to the sinks subscribed to the stream (see `strategy.sinks`).  When nobody is subscribed, a game
+does not even create them: `EventStream.active` is checked first, so an unused stream costs nothing.
+"""
+from dataclasses import dataclass
+from typing import Protocol
+
+from strategy.colour import Colour
+
+
+@dataclass(frozen=True)
+class SetupEvent:
+    """The initial board of a game, as the symbols of `board_symbols`."""
+
+    setup: str
+
+
+@dataclass(frozen=True)
+class MoveEvent:
+    """The move of `colour` in ply `ply` (counting from 0)."""
+
+    ply: int
+    colour: Colour
+    source: tuple[int, int]
+    dest: tuple[int, int]
+
+
+@dataclass(frozen=True)
+class CombatEvent:
+    """An attack in ply `ply`: the ranks of the attacker and the defender, and the outcome as in `MoveResult`."""
+
+    ply: int
+    square: tuple[int, int]
+    attacker: str
+    defender: str
+    outcome: bool | None
+
+
+@dataclass(frozen=True)
+class RevealEvent:
+    """The rank of the piece of `colour` at `square` became known in ply `ply`."""
+
+    ply: int
+    colour: Colour
+    square: tuple[int, int]
+    rank: str
+
+
+@dataclass(frozen=True)
+class GameOverEvent:
+    """The end of a game: the winner (`None` for a draw), the number of plies and why it was a draw."""
+
+    winner: Colour | None
+    plies: int
+    reason: str | None = None
+
+
+Event = SetupEvent | MoveEvent | CombatEvent | RevealEvent | GameOverEvent
+
+
+class Sink(Protocol):
+    """Something that takes events; it should return quickly, and write them elsewhere later."""
+
+    def handle(self, event: Event) -> None:
+        """Take `event`."""
+
+    def close(self) -> None:
+        """Write what is left, and release what the sink holds."""
+
+
+class EventStream:
+    """The events of a game, for all subscribed `Sink`s."""
+
+    def __init__(self, *sinks: Sink) -> None:
+        """Create a stream with `sinks` subscribed."""
+        self.sinks = list(sinks)
+
+    @property
+    def active(self) -> bool:
+        """Return whether any sink is subscribed: when not, there is no need to create the events."""
+        return bool(self.sinks)
+
+    def subscribe(self, sink: Sink) -> None:
+        """Send the events to `sink` from now on."""
+        self.sinks.append(sink)
+
+    def unsubscribe(self, sink: Sink) -> None:
+        """Stop sending the events to `sink`."""
+        self.sinks.remove(sink)
+
+    def emit(self, event: Event) -> None:
+        """Send `event` to all sinks."""
+        for sink in self.sinks:
+            sink.handle(event)
+
+    def close(self) -> None:
+        """Close all sinks."""
+        for sink in self.sinks:
+            sink.close()
@@ -29,3 +29,39 @@ class InvalidDestinationError(Exception):
     """Invalid destination given."""
 
     pass
+
+
+class ProtocolError(Exception):
+    """Invalid protocol message."""
+
+    pass
+
+
+class SequenceGapError(Exception):
+    """A delta update is missing."""
+
+    pass
+
+
+class TwoSquareRuleError(Exception):
+    """Move not allowed by the two-square rule."""
+
+    pass
+
+
+class InvalidRecordError(Exception):
+    """Invalid game record."""
+
+    pass
+
+
+class InvalidGeometryError(Exception):
+    """Invalid board geometry."""
+
+    pass
+
+
+class InvalidSetupError(Exception):
+    """Invalid setup."""
+
+    pass
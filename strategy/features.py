@@ -0,0 +1,79 @@
+"""
+The Strategy feature planes.
+
+A position is encoded, as seen by the player of `colour`, as a stack of 10x10 binary planes:
+
+    - one plane per rank (in the order of `RANKS`) for the pieces of `colour`;
+    - one plane per rank for the revealed pieces of the opponent;
+    - the lakes, the unrevealed pieces of the opponent, and the pieces (of both colours) that moved.
+
+The board is always seen from the side of `colour`: for BLUE the rows are flipped, so the own pieces start
+at the bottom.  A move is encoded as `source * 100 + dest`, the squares numbered row by row in the same
+orientation; `legal_mask` marks the moves that can be played.
+"""
+import numpy as np
+
+from strategy.board import Board, Move
+from strategy.colour import Colour
+from strategy.game import Lake
+from strategy.geometry import check_classic
+from strategy.pieces import RANKS, Piece
+from strategy.view import BoardView
+
+OWN = 0
+OPPONENT = len(RANKS)
+LAKES = 2 * len(RANKS)
+UNKNOWN = LAKES + 1
+MOVED = LAKES + 2
+PLANES = LAKES + 3
+MOVES = 100 * 100
+
+_RANK_INDEX = {name: index for index, name in enumerate(RANKS)}
+
+
+def _row(y: int, colour: Colour) -> int:
+    return y if colour == Colour.RED else 9 - y
+
+
+def encode(board: Board, colour: Colour, out: np.ndarray | None = None) -> np.ndarray:
+    """Return the (`PLANES` x 10 x 10) uint8 feature planes of `board` for `colour`, optionally in `out`."""
+    check_classic(board.geometry, "feature planes")
+    planes = out if out is not None else np.empty((PLANES, 10, 10), dtype=np.uint8)
+    planes.fill(0)
+    for y in range(10):
+        row = _row(y, colour)
+        for x in range(10):
+            cell = board[x, y]
+            if isinstance(cell, Piece):
+                if cell.colour == colour:
+                    planes[OWN + _RANK_INDEX[cell.name], row, x] = 1
+                elif cell.revealed:
+                    planes[OPPONENT + _RANK_INDEX[cell.name], row, x] = 1
+                else:
+                    planes[UNKNOWN, row, x] = 1
+                if cell.moved:
+                    planes[MOVED, row, x] = 1
+            elif isinstance(cell, Lake):
+                planes[LAKES, row, x] = 1
+    return planes
+
+
+def encode_move(move: Move, colour: Colour) -> int:
+    """Return the index of `move` for `colour`, between 0 and `MOVES`."""
+    (sx, sy), (dx, dy) = move
+    return (_row(sy, colour) * 10 + sx) * 100 + _row(dy, colour) * 10 + dx
+
+
+def decode_move(index: int, colour: Colour) -> Move:
+    """Return the `Move` of `index` for `colour`; the inverse of `encode_move`."""
+    source, dest = divmod(index, 100)
+    return (source % 10, _row(source // 10, colour)), (dest % 10, _row(dest // 10, colour))
+
+
+def legal_mask(board: Board | BoardView, colour: Colour, out: np.ndarray | None = None) -> np.ndarray:
+    """Return a boolean array of `MOVES` that is `True` for the moves `colour` can play, optionally in `out`."""
+    mask = out if out is not None else np.empty(MOVES, dtype=bool)
+    mask.fill(False)
+    for move in board.moves(colour):
+        mask[encode_move(move, colour)] = True
+    return mask
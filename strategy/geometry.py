@@ -0,0 +1,108 @@
+"""
+The Strategy board geometry.
+
+A `Geometry` defines the variant that is played: the dimensions of the board, the lakes, the deployment
+zones (the `rows` at the top for blue and at the bottom for red) and the piece set of each colour.
+`CLASSIC` is the standard game: 10x10, two lakes of 2x2, four rows and 40 pieces per colour.
+
+The tables the engine needs are derived once per geometry and shared by all its boards.  The main one is
+`rays`: for every square, the squares in each direction up to the edge or a lake, nearest first.  Move
+generation walks these rays instead of checking the bounds and the lakes square by square, so the cost of
+the moves of a piece does not grow with the board.
+
+The fixed-size encodings (feature planes, game records, tablebases, distance maps and mirror images) only
+support `CLASSIC`: they call `check_classic` and refuse the boards of other geometries.
+"""
+from dataclasses import dataclass
+from functools import cached_property
+from string import ascii_lowercase
+
+from strategy.colour import Colour
+from strategy.exceptions import InvalidGeometryError
+from strategy.pieces import COUNTS, POWERS, Piece
+
+Square = tuple[int, int]
+
+MAX_SIZE = len(ascii_lowercase)
+
+# north, east, south and west, the order of a `PieceRange`
+DIRECTIONS = ((0, -1), (1, 0), (0, 1), (-1, 0))
+
+
+@dataclass(frozen=True)
+class Geometry:
+    """The dimensions, lakes, deployment rows and piece set (name and count per colour) of a variant."""
+
+    width: int = 10
+    height: int = 10
+    lakes: tuple[Square, ...] = ((2, 4), (3, 4), (2, 5), (3, 5), (6, 4), (7, 4), (6, 5), (7, 5))
+    rows: int = 4
+    pieces: tuple[tuple[str, int], ...] = tuple(COUNTS.items())
+
+    def __post_init__(self) -> None:
+        """Check that the variant can be played."""
+        if not (0 < self.width <= MAX_SIZE and 0 < self.height <= MAX_SIZE):
+            raise InvalidGeometryError(f"a board of {self.width}x{self.height} is not supported")
+        if 2 * self.rows > self.height:
+            raise InvalidGeometryError(f"{self.rows} rows per colour do not fit in {self.height} rows")
+        if any(not self.inside(lake) for lake in self.lakes):
+            raise InvalidGeometryError("a lake is outside the board")
+        for colour in Colour:
+            if len(self.zone(colour)) != sum(count for _, count in self.pieces):
+                raise InvalidGeometryError(f"the pieces do not fill the zone of {colour}")
+
+    @cached_property
+    def size(self) -> int:
+        """Return the number of squares, lakes included."""
+        return self.width * self.height
+
+    @cached_property
+    def columns(self) -> list[str]:
+        """Return the letters of the columns, from the left."""
+        return list(ascii_lowercase[: self.width])
+
+    @cached_property
+    def squares(self) -> list[Square]:
+        """Return the squares that are not lakes, row by row from the top."""
+        lakes = set(self.lakes)
+        return [(x, y) for y in range(self.height) for x in range(self.width) if (x, y) not in lakes]
+
+    @cached_property
+    def rays(self) -> dict[Square, tuple[tuple[Square, ...], ...]]:
+        """Return the squares in each of the `DIRECTIONS` of every square, up to the edge or a lake."""
+        lakes = set(self.lakes)
+        rays = {}
+        for x, y in self.squares:
+            directions = []
+            for dx, dy in DIRECTIONS:
+                ray = []
+                square = x + dx, y + dy
+                while self.inside(square) and square not in lakes:
+                    ray.append(square)
+                    square = square[0] + dx, square[1] + dy
+                directions.append(tuple(ray))
+            rays[x, y] = tuple(directions)
+        return rays
+
+    def inside(self, square: Square) -> bool:
+        """Return whether `square` is on the board."""
+        return 0 <= square[0] < self.width and 0 <= square[1] < self.height
+
+    def zone(self, colour: Colour) -> list[Square]:
+        """Return the squares where `colour` deploys, row by row from the top: blue on top, red at the bottom."""
+        first = self.height - self.rows if colour == Colour.RED else 0
+        lakes = set(self.lakes)
+        return [(x, y) for y in range(first, first + self.rows) for x in range(self.width) if (x, y) not in lakes]
+
+    def piece_set(self) -> list[Piece]:
+        """Return new pieces (without a colour) for one colour, in the order of `PIECES`."""
+        return [Piece(name, POWERS[name]) for name, count in self.pieces for _ in range(count)]
+
+
+CLASSIC = Geometry()
+
+
+def check_classic(geometry: Geometry, what: str) -> None:
+    """Raise `InvalidGeometryError` unless `geometry` is `CLASSIC`, which the 10x10 layout of `what` needs."""
+    if geometry is not CLASSIC and geometry != CLASSIC:
+        raise InvalidGeometryError(f"{what} only support the classic board, not {geometry.width}x{geometry.height}")
@@ -0,0 +1,221 @@
+"""
+The Strategy information set Monte Carlo tree search agent.
+
+Every iteration samples a determinization of the hidden pieces of the opponent from a `BeliefTracker`,
+and walks one UCT tree (shared by all determinizations) with the moves that are possible in it.  The
+playouts use cheap `Board.copy`s and random moves of random pieces, and end in a win, a loss, or a
+`score` after `ROLLOUT_DEPTH` plies.
+
+With more than one worker the search is root parallel: every worker process grows its own tree until
+the time budget is used, and the visits of the root moves are summed.
+"""
+import logging
+import math
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+
+from strategy.belief import BeliefTracker
+from strategy.board import Board, Move, MoveResult
+from strategy.colour import Colour
+from strategy.evaluation import score
+from strategy.pieces import FLAG
+from strategy.view import BoardView
+
+log = logging.getLogger(__name__)
+
+TIME_BUDGET = 1.0
+EXPLORATION = 0.7
+ROLLOUT_DEPTH = 20
+BATCH = 64  # determinizations sampled at once
+
+
+@dataclass
+class SearchStats:
+    """What a search did: number of playouts, seconds and workers used."""
+
+    playouts: int = 0
+    seconds: float = 0.0
+    workers: int = 1
+
+    @property
+    def playouts_per_second(self) -> float:
+        """Return the number of playouts per second, over all workers."""
+        return self.playouts / self.seconds if self.seconds else 0.0
+
+
+class _Node:
+    """A node in the tree: the move leading to it was made by `colour`."""
+
+    __slots__ = ("colour", "children", "visits", "wins", "available")
+
+    def __init__(self, colour: Colour | None) -> None:
+        self.colour = colour
+        self.children: dict[Move, _Node] = {}
+        self.visits = 0
+        self.wins = 0.0
+        self.available = 0
+
+    def ucb(self, exploration: float) -> float:
+        return self.wins / self.visits + exploration * math.sqrt(math.log(self.available) / self.visits)
+
+
+def _random_move(board: Board, colour: Colour, rng: random.Random) -> Move | None:
+    """Return a random move of a random movable piece, without generating all the moves."""
+    pieces = board.red() if colour == Colour.RED else board.blue()
+    rng.shuffle(pieces)
+    for piece in pieces:
+        movables = board.available_range(piece.x, piece.y).movables.values()
+        destinations = [destination for coordinates in movables for destination in coordinates]
+        if destinations:
+            return (piece.x, piece.y), rng.choice(destinations)
+    return None
+
+
+def _rollout(board: Board, colour: Colour, root: Colour, depth: int, rng: random.Random) -> float:
+    """Play random moves from `board` with `colour` to move; return the result for `root`."""
+    for _ in range(depth):
+        move = _random_move(board, colour, rng)
+        if move is None:
+            return 0.0 if colour == root else 1.0
+        result = board.move(*move)
+        if result.is_attack and result.defender.name == FLAG:
+            return 1.0 if colour == root else 0.0
+        colour = colour.opponent
+    return score(board, root)
+
+
+def _search(
+    board: Board,
+    tracker: BeliefTracker,
+    colour: Colour,
+    budget: float,
+    seed: int,
+    exploration: float = EXPLORATION,
+    depth: int = ROLLOUT_DEPTH,
+) -> tuple[dict[Move, tuple[int, float]], int]:
+    """Grow a tree for `budget` seconds; return the visits and wins of the root moves and the playouts."""
+    deadline = time.perf_counter() + budget
+    rng = random.Random(seed)
+    generator = np.random.default_rng(seed)
+    root = _Node(None)
+    playouts = 0
+    samples = tracker.sample(BATCH, generator)
+    while time.perf_counter() < deadline or playouts == 0:
+        if playouts and playouts % BATCH == 0:
+            samples = tracker.sample(BATCH, generator)
+        determinization = tracker.determinize(board, samples[playouts % BATCH])
+        reward = _iterate(root, determinization, colour, exploration, depth, rng)
+        playouts += 1
+        if reward is None:  # no moves at the root
+            break
+    stats = {move: (child.visits, child.wins) for move, child in root.children.items()}
+    return stats, playouts
+
+
+def _iterate(
+    root: _Node, board: Board, colour: Colour, exploration: float, depth: int, rng: random.Random
+) -> float | None:
+    """Run one selection, expansion, rollout and backpropagation on `board`; `None` when there are no moves."""
+    me = colour
+    node, path = root, [root]
+    reward = None
+    while reward is None:
+        moves = board.moves(colour)
+        if not moves:
+            reward = 0.0 if colour == me else 1.0
+            break
+        untried = [move for move in moves if move not in node.children]
+        for move in moves:
+            if move in node.children:
+                node.children[move].available += 1
+        if untried:
+            move = rng.choice(untried)
+            node.children[move] = child = _Node(colour)
+            child.available = 1
+        else:
+            move = max(moves, key=lambda m: node.children[m].ucb(exploration))
+            child = node.children[move]
+        result = board.move(*move)
+        node = child
+        path.append(node)
+        if result.is_attack and result.defender.name == FLAG:
+            reward = 1.0 if colour == me else 0.0
+        elif untried:
+            reward = _rollout(board, colour.opponent, me, depth, rng)
+        colour = colour.opponent
+    if len(path) == 1 and not root.children:
+        return None
+    for node in path:
+        node.visits += 1
+        node.wins += reward if node.colour == me else 1.0 - reward
+    return reward
+
+
+class ISMCTSAgent:
+    """An information set MCTS agent with a time budget per move."""
+
+    def __init__(
+        self,
+        budget: float = TIME_BUDGET,
+        workers: int = 1,
+        seed: int | None = None,
+        exploration: float = EXPLORATION,
+        depth: int = ROLLOUT_DEPTH,
+    ) -> None:
+        """Create an agent thinking `budget` seconds per move in `workers` processes."""
+        self.budget = budget
+        self.workers = workers
+        self.exploration = exploration
+        self.depth = depth
+        self.rng = random.Random(seed)
+        self.tracker: BeliefTracker | None = None
+        self.stats = SearchStats()
+        self._executor: ProcessPoolExecutor | None = None
+
+    def start(self, view: BoardView) -> None:
+        """Start a new game: the beliefs start from the initial setup of the opponent."""
+        self.tracker = BeliefTracker(view)
+
+    def observe(self, result: MoveResult) -> None:
+        """Update the beliefs with the public information of `result`."""
+        self.tracker.update(result)
+
+    def select_move(self, board: BoardView, colour: Colour) -> Move:
+        """Return the most visited root move after searching for `budget` seconds."""
+        if self.tracker is None:
+            self.start(board)
+        start = time.perf_counter()
+        seeds = [self.rng.getrandbits(32) for _ in range(self.workers)]
+        arguments = (board.board, self.tracker, colour, self.budget)
+        if self.workers == 1:
+            results = [_search(*arguments, seeds[0], self.exploration, self.depth)]
+        else:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(self.workers)
+            futures = [self._executor.submit(_search, *arguments, seed, self.exploration, self.depth) for seed in seeds]
+            results = [future.result() for future in futures]
+        totals: dict[Move, list[float]] = {}
+        playouts = 0
+        for stats, count in results:
+            playouts += count
+            for move, (visits, wins) in stats.items():
+                total = totals.setdefault(move, [0, 0.0])
+                total[0] += visits
+                total[1] += wins
+        self.stats = SearchStats(playouts, time.perf_counter() - start, self.workers)
+        log.debug("ISMCTS: %d playouts, %.0f playouts/s.", playouts, self.stats.playouts_per_second)
+        moves = board.moves(colour)  # the tree ignores the rules of the game, like the two-square rule
+        totals = {move: total for move, total in totals.items() if move in moves}
+        if not totals:
+            return self.rng.choice(moves)
+        return max(totals, key=lambda move: (totals[move][0], totals[move][1]))
+
+    def close(self) -> None:
+        """Shut down the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
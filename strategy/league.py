@@ -0,0 +1,200 @@
+"""
+The Strategy league.
+
+A `League` keeps a Glicko rating for every agent of a pool and updates it after every game.  Instead of a
+round robin of a fixed number of games, it picks the next pairing where a game teaches the most: the pair
+with the most rating uncertainty and the least predictable result.  A head-to-head `match` stops as soon as
+a sequential probability ratio test (`SPRT`) is decisive.
+
+The games are played with `play_game` on random setups; everything is drawn from the `seed`, so a league
+plays the same games and ends with the same ratings every time.
+"""
+import logging
+import math
+import random
+from dataclasses import dataclass
+from typing import Callable
+
+from strategy.agents import Agent
+from strategy.colour import Colour
+from strategy.runner import MAX_PLIES, play_game
+
+log = logging.getLogger(__name__)
+
+RATING = 1500.0
+DEVIATION = 350.0
+MIN_DEVIATION = 30.0
+Q = math.log(10) / 400
+
+ALPHA = 0.05
+BETA = 0.05
+ELO0 = 0.0
+ELO1 = 20.0
+
+AgentFactory = Callable[[random.Random], Agent]
+
+
+def _g(deviation: float) -> float:
+    return 1 / math.sqrt(1 + 3 * Q * Q * deviation * deviation / math.pi**2)
+
+
+@dataclass
+class Rating:
+    """A Glicko rating: the `rating` and its `deviation`, and the number of games it is based on."""
+
+    rating: float = RATING
+    deviation: float = DEVIATION
+    games: int = 0
+
+    def expected(self, other: "Rating") -> float:
+        """Return the expected score against `other`."""
+        return 1 / (1 + 10 ** (-_g(other.deviation) * (self.rating - other.rating) / 400))
+
+    def update(self, other: "Rating", score: float) -> "Rating":
+        """Return the new rating after one game against `other` with `score` (1 win, 0.5 draw, 0 loss)."""
+        g = _g(other.deviation)
+        expected = self.expected(other)
+        d2 = 1 / (Q * Q * g * g * expected * (1 - expected))
+        variance = 1 / (1 / self.deviation**2 + 1 / d2)
+        rating = self.rating + Q * variance * g * (score - expected)
+        return Rating(rating, max(math.sqrt(variance), MIN_DEVIATION), self.games + 1)
+
+
+def _score(elo: float) -> float:
+    return 1 / (1 + 10 ** (-elo / 400))
+
+
+class SPRT:
+    """
+    A sequential probability ratio test of H0: the Elo difference is `elo0` against H1: it is `elo1`.
+
+    The log likelihood ratio uses the normal approximation of the mean score (with draws), like most
+    engine testing frameworks; the test is decided when it leaves the bounds set by `alpha` and `beta`.
+    """
+
+    def __init__(self, elo0: float = ELO0, elo1: float = ELO1, alpha: float = ALPHA, beta: float = BETA) -> None:
+        """Create a test without results."""
+        self.elo0 = elo0
+        self.elo1 = elo1
+        self.lower = math.log(beta / (1 - alpha))
+        self.upper = math.log((1 - beta) / alpha)
+        self.wins = self.draws = self.losses = 0
+
+    @property
+    def games(self) -> int:
+        """Return the number of games."""
+        return self.wins + self.draws + self.losses
+
+    @property
+    def llr(self) -> float:
+        """Return the log likelihood ratio of H1 against H0."""
+        n = self.games
+        if not n:
+            return 0.0
+        mean = (self.wins + 0.5 * self.draws) / n
+        variance = (self.wins + 0.25 * self.draws) / n - mean * mean
+        if variance <= 0:  # all results the same so far: pretend half a game went the other way
+            variance = 0.25 / n
+        s0, s1 = _score(self.elo0), _score(self.elo1)
+        return n * (s1 - s0) * (2 * mean - s0 - s1) / (2 * variance)
+
+    @property
+    def decision(self) -> str | None:
+        """Return "H1" or "H0" when the test is decided, `None` while it is not."""
+        llr = self.llr
+        if llr >= self.upper:
+            return "H1"
+        if llr <= self.lower:
+            return "H0"
+        return None
+
+    def add(self, score: float) -> None:
+        """Add the result of one game, as a score of the first player."""
+        if score == 1:
+            self.wins += 1
+        elif score == 0:
+            self.losses += 1
+        else:
+            self.draws += 1
+
+
+@dataclass
+class MatchResult:
+    """The result of a head-to-head `League.match` between `first` and `second`."""
+
+    first: str
+    second: str
+    wins: int
+    draws: int
+    losses: int
+    llr: float
+    decision: str | None
+
+    @property
+    def games(self) -> int:
+        """Return the number of games played."""
+        return self.wins + self.draws + self.losses
+
+
+class League:
+    """Rate a pool of agents, playing the games that teach the most first."""
+
+    def __init__(self, agents: dict[str, AgentFactory], seed: int | None = None, max_plies: int = MAX_PLIES) -> None:
+        """Create a league of `agents`, by name; every factory creates a new agent from a random generator."""
+        if len(agents) < 2:
+            raise ValueError("a league needs at least two agents")
+        self.agents = agents
+        self.max_plies = max_plies
+        self.rng = random.Random(seed)
+        self.ratings = {name: Rating() for name in agents}
+        self.games: dict[tuple[str, str], int] = {}
+
+    def information(self, first: str, second: str) -> float:
+        """Return how much one more game between `first` and `second` is expected to teach about the ratings."""
+        a, b = self.ratings[first], self.ratings[second]
+        expected = a.expected(b)
+        return (a.deviation**2 + b.deviation**2) * expected * (1 - expected)
+
+    def next_pairing(self) -> tuple[str, str]:
+        """Return the pair of agents of which a game is the most informative; ties are broken at random."""
+        names = sorted(self.agents)
+        pairs = [(a, b) for i, a in enumerate(names) for b in names[i + 1 :]]
+        self.rng.shuffle(pairs)
+        return max(pairs, key=lambda pair: self.information(*pair))
+
+    def play(self, first: str, second: str) -> float:
+        """Play one game between `first` and `second`, update their ratings, and return the score of `first`."""
+        pair = tuple(sorted((first, second)))
+        count = self.games.get(pair, 0)
+        self.games[pair] = count + 1
+        # the colours alternate between the games of a pair
+        red, blue = (first, second) if (count % 2 == 0) == (first == pair[0]) else (second, first)
+        game_rng = random.Random(self.rng.getrandbits(32))
+        agents = {
+            Colour.RED: self.agents[red](random.Random(game_rng.getrandbits(32))),
+            Colour.BLUE: self.agents[blue](random.Random(game_rng.getrandbits(32))),
+        }
+        result = play_game(agents, max_plies=self.max_plies, rng=game_rng)
+        colour = Colour.RED if first == red else Colour.BLUE
+        score = 0.5 if result.winner is None else float(result.winner == colour)
+        a, b = self.ratings[first], self.ratings[second]
+        self.ratings[first], self.ratings[second] = a.update(b, score), b.update(a, 1 - score)
+        log.debug("%s (%s) - %s: %s in %d plies.", first, colour, second, result, result.plies)
+        return score
+
+    def run(self, games: int) -> dict[str, Rating]:
+        """Play `games` games, every one between the most informative pairing, and return the ratings."""
+        for _ in range(games):
+            self.play(*self.next_pairing())
+        return self.ratings
+
+    def match(self, first: str, second: str, sprt: SPRT | None = None, max_games: int = 1000) -> MatchResult:
+        """Play `first` against `second` until `sprt` (H0: equal, H1: `first` is stronger) decides, or `max_games`."""
+        sprt = sprt or SPRT()
+        while sprt.decision is None and sprt.games < max_games:
+            sprt.add(self.play(first, second))
+        return MatchResult(first, second, sprt.wins, sprt.draws, sprt.losses, sprt.llr, sprt.decision)
+
+    def standings(self) -> list[tuple[str, Rating]]:
+        """Return the agents and their ratings, best first."""
+        return sorted(self.ratings.items(), key=lambda item: -item[1].rating)
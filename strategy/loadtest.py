@@ -0,0 +1,104 @@
+"""
+The Strategy server load test.
+
+Open many idle connections to a `strategy.server` and, next to them, play a number of games against the
+bots, measuring the round trip of every move.  Note that thousands of connections need a high enough
+open files limit (`ulimit -n`) on both sides.
+"""
+import asyncio
+import random
+import statistics
+import time
+from dataclasses import dataclass, field
+
+from strategy.console import console
+from strategy.delta import BoardMirror, MoveUpdate, Snapshot
+from strategy.server import HOST, PORT
+
+
+@dataclass
+class LoadTestResult:
+    """The measured round trips (in seconds) of all moves, and the number of games that were completed."""
+
+    idle: int
+    games: int
+    finished: int = 0
+    latencies: list[float] = field(default_factory=list)
+
+    def __str__(self) -> str:
+        """Summarize the result."""
+        mean = statistics.fmean(self.latencies) if self.latencies else 0.0
+        return (
+            f"{self.idle} idle connections, {self.games} games ({self.finished} finished), {self.moves} moves: "
+            f"mean {mean * 1000:.2f} ms, p50 {self.percentile(50) * 1000:.2f} ms, "
+            f"p99 {self.percentile(99) * 1000:.2f} ms."
+        )
+
+    @property
+    def moves(self) -> int:
+        """Return the number of measured moves."""
+        return len(self.latencies)
+
+    def percentile(self, p: float) -> float:
+        """Return the round trip at percentile `p` (from 0 to 100), in seconds."""
+        if not self.latencies:
+            return 0.0
+        latencies = sorted(self.latencies)
+        return latencies[min(len(latencies) - 1, int(p / 100 * len(latencies)))]
+
+
+async def _reply(reader: asyncio.StreamReader, mirror: BoardMirror) -> list[str]:
+    """Return the next reply that is not a DELTA or a SNAPSHOT; those are applied to `mirror`."""
+    while True:
+        words = (await reader.readline()).decode("ascii").split()
+        if not words:
+            return ["OVER", "disconnected"]
+        if words[0] == "DELTA":
+            mirror.apply(MoveUpdate.decode(" ".join(words[1:])))
+        elif words[0] == "SNAPSHOT":
+            mirror.resync(Snapshot.decode(" ".join(words[1:])))
+        else:
+            return words
+
+
+async def _play(host: str, port: int, moves: int, result: LoadTestResult, rng: random.Random) -> None:
+    """Play up to `moves` random moves against a bot."""
+    reader, writer = await asyncio.open_connection(host, port)
+    mirror = BoardMirror()
+    writer.write(b"NEW red\nMOVES\n")
+    await _reply(reader, mirror)
+    words = await _reply(reader, mirror)
+    try:
+        for _ in range(moves):
+            if words[0] == "OVER":
+                result.finished += 1
+            if words[0] != "MOVES" or len(words) == 1:
+                break
+            source, dest = rng.choice(words[1:]).split("-")
+            start = time.perf_counter()
+            # the reply of the bot has been applied to the mirror once the answer to MOVES arrives
+            writer.write(f"MOVE {source} {dest}\nMOVES\n".encode("ascii"))
+            words = await _reply(reader, mirror)
+            result.latencies.append(time.perf_counter() - start)
+    finally:
+        writer.write(b"QUIT\n")
+        writer.close()
+
+
+async def run(
+    host: str = HOST, port: int = PORT, idle: int = 1000, games: int = 50, moves: int = 20, seed: int | None = None
+) -> LoadTestResult:
+    """Open `idle` idle connections, then play `games` concurrent games of at most `moves` moves each."""
+    result = LoadTestResult(idle, games)
+    rng = random.Random(seed)
+    idle_connections = [await asyncio.open_connection(host, port) for _ in range(idle)]
+    try:
+        await asyncio.gather(*(_play(host, port, moves, result, rng) for _ in range(games)))
+    finally:
+        for _, writer in idle_connections:
+            writer.close()
+    return result
+
+
+if __name__ == "__main__":
+    console.print(asyncio.run(run()))
@@ -4,15 +4,29 @@ import logging
 import random
 import sys
 
-from strategy.board import Board
+from strategy.board import Board, PieceRange
 from strategy.colour import Colour
 from strategy.console import console
+from strategy.repetition import Repetition
 
 log = logging.getLogger(__name__)
 
 
-def turn(board: Board, colour: Colour) -> None:
-    """Perform a turn for a given `Colour`."""
+def destinations(
+    piece_range: PieceRange, colour: Colour, repetition: Repetition | None = None
+) -> list[tuple[int, int]]:
+    """Return the destinations of the piece of `piece_range` that are not forbidden by the two-square rule."""
+    source = piece_range.piece.x, piece_range.piece.y
+    all_movables = []
+    for coordinates in piece_range.movables.values():
+        all_movables.extend(coordinates)
+    if repetition:
+        return [dest for dest in all_movables if repetition.allowed((source, dest), colour)]
+    return all_movables
+
+
+def turn(board: Board, colour: Colour, repetition: Repetition | None = None) -> None:
+    """Perform a turn for a given `Colour`; the game is a draw when `repetition` says so."""
     movable_pieces = []
     if colour == Colour.RED:
         pieces = board.red()
@@ -20,24 +34,28 @@ def turn(board: Board, colour: Colour) -> None:
         pieces = board.blue()
     for piece in pieces:
         range = board.available_range(piece.x, piece.y)
-        if range.can_move:
+        if range.can_move and destinations(range, colour, repetition):
             movable_pieces.append(range)
     console.print(
         f"Movable {colour.name} pieces: {', '.join([f'{piece_range.piece}' for piece_range in movable_pieces])}."
     )
+    if not movable_pieces:  # the rules forbid every move: a loss, like having no movable pieces
+        console.print(f"{colour.opponent.name.capitalize()} wins the game: {colour.name.lower()} cannot move!")
+        sys.exit()
     piece_range = random.choice(movable_pieces)
     console.print(f"Will move {piece_range.piece} ({piece_range}):")
     console.print(f"  Movables: {piece_range.movables}.")
     console.print(f"  Attackables: {piece_range.attackables}.")
-    all_movables = []
-    for coordinates in piece_range.movables.values():
-        all_movables.extend(coordinates)
-    board.move((piece_range.piece.x, piece_range.piece.y), random.choice(all_movables))
+    source = piece_range.piece.x, piece_range.piece.y
+    result = board.move(source, random.choice(destinations(piece_range, colour, repetition)))
     console.print(f"{board}", soft_wrap=True)
     winner = board.winner
     if winner:
         console.print(f"{winner.name.capitalize()} wins the game!")
         sys.exit()
+    if repetition and repetition.update(result):
+        console.print(f"Draw by {repetition.draw}!")
+        sys.exit()
 
 
 def main() -> None:
@@ -48,9 +66,10 @@ def main() -> None:
     console.print("Created random board.")
     console.print(f"{board}", soft_wrap=True)
 
+    repetition = Repetition(board)
     while True:
-        turn(board, Colour.RED)
-        turn(board, Colour.BLUE)
+        turn(board, Colour.RED, repetition)
+        turn(board, Colour.BLUE, repetition)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,124 @@
+"""
+The Strategy mirror images.
+
+The board is symmetric under left-right mirroring (x becomes 9 - x): the columns and the lakes map onto each
+other, and so do the moves.  A position and its mirror image are worth the same, so a cache only needs one of
+them: the canonical form.
+
+    - for symbols (a board as `board_symbols`, or a setup of 4 rows) it is the smaller of both strings;
+    - for positions it is the image with the smaller Zobrist hash; a `CanonicalPosition` keeps the hashes
+      of both images up to date move by move, in O(1) (for the view of a colour, an attack costs a new hash).
+
+Moves stored with a canonical position are in the canonical frame: use `CanonicalPosition.canonical_move`
+on the way in and out (mirroring is its own inverse).
+"""
+from collections import OrderedDict
+from typing import Any
+
+from strategy.board import Board, Move, MoveResult
+from strategy.colour import Colour
+from strategy.geometry import check_classic
+from strategy.pieces import Piece
+from strategy.repetition import position_hash, update_hash
+
+CACHE_SIZE = 100_000
+
+
+def mirror_square(square: tuple[int, int]) -> tuple[int, int]:
+    """Return the mirror image of `square`."""
+    return 9 - square[0], square[1]
+
+
+def mirror_move(move: Move) -> Move:
+    """Return the mirror image of `move`."""
+    return mirror_square(move[0]), mirror_square(move[1])
+
+
+def mirror_symbols(symbols: str) -> str:
+    """Return the mirror image of rows of 10 symbols, like a board (100 symbols) or a setup (40 symbols)."""
+    return "".join(symbols[start : start + 10][::-1] for start in range(0, len(symbols), 10))
+
+
+def canonical_symbols(symbols: str) -> tuple[str, bool]:
+    """Return the canonical form of `symbols`, and whether that is the mirror image."""
+    mirrored = mirror_symbols(symbols)
+    return (mirrored, True) if mirrored < symbols else (symbols, False)
+
+
+def mirror_board(board: Board) -> Board:
+    """Return a new board with the mirror image of `board`, with copies of its pieces."""
+    check_classic(board.geometry, "mirror images")
+    mirrored = Board()
+    for piece in board.red() + board.blue():
+        copy = Piece.__new__(Piece)
+        copy.__dict__.update(piece.__dict__)
+        copy.x, copy.y = mirror_square((piece.x, piece.y))
+        mirrored[copy.x, copy.y] = copy
+    return mirrored
+
+
+class CanonicalPosition:
+    """The hashes of a position and of its mirror image, kept up to date while a game is played."""
+
+    def __init__(self, board: Board, colour: Colour | None = None) -> None:
+        """Start from the position on `board`, or from the position as seen by `colour` (see `position_hash`)."""
+        check_classic(board.geometry, "mirror images")
+        self.board = board
+        self.colour = colour
+        self.hash = position_hash(board, colour=colour)
+        self.mirror_hash = position_hash(board, mirrored=True, colour=colour)
+
+    @property
+    def key(self) -> int:
+        """Return the hash of the canonical image: the same for a position and its mirror image."""
+        return min(self.hash, self.mirror_hash)
+
+    @property
+    def mirrored(self) -> bool:
+        """Return `True` when the canonical image is the mirror image."""
+        return self.mirror_hash < self.hash
+
+    def canonical_move(self, move: Move) -> Move:
+        """Return `move` in the canonical frame, or a canonical move in the frame of the position."""
+        return mirror_move(move) if self.mirrored else move
+
+    def update(self, result: MoveResult) -> None:
+        """Follow the move of `result`, played on the board."""
+        if self.colour is not None and result.is_attack:
+            self.hash = position_hash(self.board, colour=self.colour)
+            self.mirror_hash = position_hash(self.board, mirrored=True, colour=self.colour)
+            return
+        self.hash = update_hash(self.hash, result, colour=self.colour)
+        self.mirror_hash = update_hash(self.mirror_hash, result, mirrored=True, colour=self.colour)
+
+
+class PositionCache:
+    """A least recently used cache by canonical position, so a position and its mirror image share an entry."""
+
+    def __init__(self, maxsize: int = CACHE_SIZE) -> None:
+        """Create a cache of at most `maxsize` entries."""
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[int, Any] = OrderedDict()
+
+    def get(self, position: CanonicalPosition, default: Any = None) -> Any:
+        """Return the value of `position` (or of its mirror image), or `default`."""
+        key = position.key
+        if key not in self._entries:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return self._entries[key]
+
+    def put(self, position: CanonicalPosition, value: Any) -> None:
+        """Store `value` for `position` and its mirror image; moves in `value` should be canonical."""
+        self._entries[position.key] = value
+        self._entries.move_to_end(position.key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        """Return the number of entries."""
+        return len(self._entries)
@@ -18,6 +18,22 @@ SCOUT = "scout"
 SPY = "spy"
 FLAG = "flag"
 
+# One letter per piece name, used by the compact text encodings of the board.
+SYMBOLS = {
+    BOMB: "b",
+    MARSHAL: "m",
+    GENERAL: "g",
+    COLONEL: "c",
+    MAJOR: "j",
+    CAPTAIN: "p",
+    LIEUTENANT: "l",
+    SERGEANT: "t",
+    MINER: "n",
+    SCOUT: "u",
+    SPY: "y",
+    FLAG: "f",
+}
+
 
 @total_ordering
 class Piece(Field):
@@ -26,10 +42,12 @@ class Piece(Field):
     def __init__(
         self, name: str, power: int, colour: Colour | None = None, x: int | None = None, y: int | None = None
     ) -> None:
-        """Create a type by power and colour."""
+        """Create a type by power and colour; it is not `revealed` to the opponent and has not `moved` yet."""
         super().__init__(name, x, y)
         self.power = power
         self.colour = colour
+        self.revealed = False
+        self.moved = False
 
     def __str__(self) -> str:
         """Show the piece."""
@@ -119,3 +137,16 @@ PIECES = [
     Piece(SPY, 1),
     Piece(FLAG, 0),
 ]
+
+# The piece names from the highest to the lowest power, and how many of each a player has.
+RANKS = list(dict.fromkeys(piece.name for piece in PIECES))
+POWERS = {piece.name: piece.power for piece in PIECES}
+COUNTS = {name: sum(piece.name == name for piece in PIECES) for name in RANKS}
+
+# The result of an attack by the first on the second piece name, see `Piece.attack`.
+COMBAT = {
+    (attacker, defender): Piece(attacker, POWERS[attacker]).attack(Piece(defender, POWERS[defender]))
+    for attacker in RANKS
+    if attacker not in (BOMB, FLAG)
+    for defender in RANKS
+}
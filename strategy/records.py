@@ -0,0 +1,112 @@
+"""
+The Strategy game records.
+
+A `GameRecord` holds what is needed to replay a game: the initial board (as the 100 symbols of
+`board_symbols`), the moves, and the winner.  Records are stored in a compact binary format:
+
+    file:    MAGIC (4 bytes), VERSION (1 byte), records...
+    record:  setup (100 bytes), winner (1 byte: 0 draw, 1 red, 2 blue), plies (uint16, little endian),
+             plies x (source, dest) square indices (1 byte each, `y * 10 + x`)
+
+so a record of a game of 500 plies takes about 1 kB.
+"""
+import struct
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import BinaryIO
+
+from strategy.board import Board, Move, MoveResult
+from strategy.colour import Colour
+from strategy.delta import board_from_symbols
+from strategy.exceptions import InvalidRecordError
+from strategy.geometry import check_classic
+from strategy.runner import Game
+
+MAGIC = b"STRG"
+VERSION = 1
+HEADER = struct.Struct("<100sBH")
+
+_WINNERS = {None: 0, Colour.RED: 1, Colour.BLUE: 2}
+_COLOURS = {code: colour for colour, code in _WINNERS.items()}
+
+
+@dataclass
+class GameRecord:
+    """A game: the initial board as symbols, the moves played and the winner (`None` for a draw)."""
+
+    setup: str
+    moves: list[Move] = field(default_factory=list)
+    winner: Colour | None = None
+
+    @property
+    def plies(self) -> int:
+        """Return the number of plies played."""
+        return len(self.moves)
+
+    @classmethod
+    def from_game(cls, game: Game) -> "GameRecord":
+        """Return the record of `game` (which should be over)."""
+        check_classic(game.board.geometry, "game records")
+        return cls(game.setup, list(game.moves), game.result.winner if game.result else None)
+
+    @classmethod
+    def decode(cls, data: bytes) -> "GameRecord":
+        """Return the record encoded in `data`."""
+        setup, winner, plies = HEADER.unpack_from(data)
+        squares = data[HEADER.size : HEADER.size + 2 * plies]
+        if len(squares) != 2 * plies or winner not in _COLOURS:
+            raise InvalidRecordError
+        moves = [((s % 10, s // 10), (d % 10, d // 10)) for s, d in zip(squares[::2], squares[1::2])]
+        return cls(setup.decode("ascii"), moves, _COLOURS[winner])
+
+    def board(self) -> Board:
+        """Return a new `Board` with the initial position."""
+        return board_from_symbols(self.setup)
+
+    def replay(self, board: Board | None = None) -> Iterator[MoveResult]:
+        """Play the moves on `board` (default: a new initial `board()`) and yield their results."""
+        board = board or self.board()
+        for move in self.moves:
+            yield board.move(*move)
+
+    def encode(self) -> bytes:
+        """Return the record in the binary format."""
+        squares = bytes(coordinates[1] * 10 + coordinates[0] for move in self.moves for coordinates in move)
+        return HEADER.pack(self.setup.encode("ascii"), _WINNERS[self.winner], len(self.moves)) + squares
+
+
+class RecordWriter:
+    """Append `GameRecord`s to a binary file."""
+
+    def __init__(self, file: BinaryIO) -> None:
+        """Write the file header to `file`."""
+        self.file = file
+        self.records = 0
+        file.write(MAGIC + bytes([VERSION]))
+
+    def write(self, record: GameRecord) -> None:
+        """Write one record."""
+        self.file.write(record.encode())
+        self.records += 1
+
+
+def write_records(path: str | Path, records: Iterable[GameRecord]) -> int:
+    """Write `records` to a new file at `path` and return how many were written."""
+    with open(path, "wb") as file:
+        writer = RecordWriter(file)
+        for record in records:
+            writer.write(record)
+    return writer.records
+
+
+def read_records(path: str | Path) -> Iterator[GameRecord]:
+    """Yield the records in the file at `path`, one at a time."""
+    with open(path, "rb") as file:
+        if file.read(len(MAGIC) + 1) != MAGIC + bytes([VERSION]):
+            raise InvalidRecordError(f"{path} is not a version {VERSION} record file")
+        while header := file.read(HEADER.size):
+            if len(header) != HEADER.size:
+                raise InvalidRecordError(f"{path} is truncated")
+            plies = HEADER.unpack(header)[2]
+            yield GameRecord.decode(header + file.read(2 * plies))
@@ -0,0 +1,158 @@
+"""
+The Strategy pygame renderer.
+
+`watch` shows a live game between two agents in a window, without slowing the game down: the game runs in
+its own thread and publishes the `MoveUpdate`s of a `DeltaEncoder` (see `strategy.delta`) on a `DeltaFeed`.
+The display takes whatever is on the feed once per frame, at most `fps` frames per second:
+
+    - when the game outpaces the display, all the updates since the last frame are applied to the
+      `BoardMirror` at once, and only the final state is drawn: the intermediate frames are dropped;
+    - only the cells changed by those updates are drawn again, and only their rectangles are sent to the
+      screen (a `Snapshot` redraws everything).
+
+The game never waits for the display: publishing is a put on an unbounded queue.
+"""
+import queue
+import threading
+import time
+from dataclasses import dataclass
+
+import pygame
+
+from strategy.delta import EMPTY_SYMBOL, LAKE_SYMBOL, UNKNOWN, BoardMirror, DeltaEncoder, MoveUpdate, Snapshot
+from strategy.geometry import CLASSIC, Geometry
+from strategy.runner import Game
+
+CELL = 48
+FPS = 30
+
+GRASS = (92, 148, 72)
+WATER = (62, 116, 186)
+RED = (196, 48, 48)
+BLUE = (48, 72, 196)
+GRID = (40, 60, 30)
+TEXT = (250, 250, 250)
+
+_END = None
+
+
+class DeltaFeed:
+    """The updates of a game on their way from the game thread to the display."""
+
+    def __init__(self) -> None:
+        """Create an empty feed."""
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+
+    def publish(self, item: MoveUpdate | Snapshot | None) -> None:
+        """Publish an update or snapshot; `None` marks the end of the game."""
+        self._queue.put(item)
+
+    def drain(self) -> list[MoveUpdate | Snapshot | None]:
+        """Return everything published since the last call, without waiting."""
+        items = []
+        while True:
+            try:
+                items.append(self._queue.get_nowait())
+            except queue.Empty:
+                return items
+
+
+def play(game: Game, feed: DeltaFeed, delay: float = 0.0) -> None:
+    """Play `game` to the end, publishing every move on `feed`; `delay` seconds between the moves."""
+    encoder = DeltaEncoder(game.board)
+    feed.publish(encoder.snapshot())
+    while not game.over:
+        feed.publish(encoder.update(game.step()))
+        if delay:
+            time.sleep(delay)
+    feed.publish(_END)
+
+
+@dataclass
+class RenderStats:
+    """What a renderer did: the frames drawn, the updates applied, the frames dropped and the cells drawn."""
+
+    frames: int = 0
+    updates: int = 0
+    dropped: int = 0
+    cells: int = 0
+
+
+class Renderer:
+    """Draw a `BoardMirror` on a pygame surface, one dirty cell at a time."""
+
+    def __init__(self, surface: pygame.Surface, cell: int = CELL, geometry: Geometry = CLASSIC) -> None:
+        """Create a renderer drawing a board of `geometry` on `surface`, with cells of `cell` pixels."""
+        self.surface = surface
+        self.cell = cell
+        self.mirror = BoardMirror(geometry)
+        self.stats = RenderStats()
+        self.over = False
+        self._font = pygame.font.Font(None, cell * 3 // 4)
+
+    def frame(self, items: list[MoveUpdate | Snapshot | None]) -> list[pygame.Rect]:
+        """Apply `items` (all the updates since the last frame), draw the dirty cells and return their rectangles."""
+        dirty: set[int] = set()
+        updates = 0
+        for item in items:
+            if item is _END:
+                self.over = True
+            elif isinstance(item, Snapshot):
+                self.mirror.resync(item)
+                dirty.update(range(self.mirror.geometry.size))
+            else:
+                self.mirror.apply(item)
+                dirty.update(index for index, _ in item.changes)
+                updates += 1
+        if not dirty:
+            return []
+        self.stats.frames += 1
+        self.stats.updates += updates
+        self.stats.dropped += max(updates - 1, 0)
+        self.stats.cells += len(dirty)
+        return [self._draw(index) for index in sorted(dirty)]
+
+    def _draw(self, index: int) -> pygame.Rect:
+        y, x = divmod(index, self.mirror.geometry.width)
+        rect = pygame.Rect(x * self.cell, y * self.cell, self.cell, self.cell)
+        symbol = self.mirror.cells[index]
+        if symbol == LAKE_SYMBOL:
+            background = WATER
+        elif symbol == EMPTY_SYMBOL:
+            background = GRASS
+        elif symbol == UNKNOWN:
+            background = GRID
+        else:
+            background = RED if symbol.isupper() else BLUE
+        self.surface.fill(background, rect)
+        pygame.draw.rect(self.surface, GRID, rect, 1)
+        if symbol not in (LAKE_SYMBOL, EMPTY_SYMBOL):
+            label = self._font.render(symbol.upper(), True, TEXT)
+            self.surface.blit(label, label.get_rect(center=rect.center))
+        return rect
+
+
+def watch(game: Game, fps: int = FPS, cell: int = CELL, delay: float = 0.0, close: bool = False) -> RenderStats:
+    """
+    Show `game` in a window while it is played in another thread, at most `fps` frames per second.
+
+    The window stays open when the game is over, until it is closed; or right away when `close` is set.
+    """
+    pygame.init()
+    try:
+        geometry = game.board.geometry
+        screen = pygame.display.set_mode((geometry.width * cell, geometry.height * cell))
+        pygame.display.set_caption("Strategy")
+        renderer = Renderer(screen, cell, geometry)
+        feed = DeltaFeed()
+        threading.Thread(target=play, args=(game, feed, delay), name="game", daemon=True).start()
+        clock = pygame.time.Clock()
+        while not (close and renderer.over):
+            if any(event.type == pygame.QUIT for event in pygame.event.get()):
+                break
+            if rects := renderer.frame(feed.drain()):
+                pygame.display.update(rects)
+            clock.tick(fps)
+        return renderer.stats
+    finally:
+        pygame.quit()
@@ -0,0 +1,163 @@
+"""
+The Strategy repetition rules.
+
+Random (and not so random) players can shuffle their pieces back and forth forever.  A `Repetition` tracker
+follows a game move by move and enforces, in O(1) per move:
+
+    - the two-square rule: a piece may not move between the same two squares more than `two_square` times
+      in a row (moves of the opponent in between do not count, moves of another own piece do);
+    - a draw when the same position, with the same colour to move, occurs `repetitions` times;
+    - a draw after `no_capture` plies without a combat.
+
+Positions are compared by their Zobrist hash, which is updated from the `MoveResult` of every move.
+"""
+import random
+from collections import Counter, deque
+
+from strategy.board import Board, Move, MoveResult
+from strategy.colour import Colour
+from strategy.game import UNKNOWN
+from strategy.geometry import CLASSIC, Geometry
+from strategy.pieces import RANKS, Piece
+
+TWO_SQUARE = 3
+REPETITIONS = 3
+NO_CAPTURE = 200
+
+REPETITION = "repetition"
+NO_PROGRESS = "no capture"
+
+
+class _Keys(dict):
+    """The Zobrist keys; the squares of larger boards (see `strategy.geometry`) get theirs when first used."""
+
+    def __missing__(self, key: tuple[int, int, Colour, str]) -> int:
+        x, y, colour, name = key
+        self[key] = random.Random(f"{x},{y},{colour.name},{name}").getrandbits(64)
+        return self[key]
+
+
+# a random 64 bit key for every rank of every colour on every square, the same in every process
+_rng = random.Random(0x5EED)
+ZOBRIST = _Keys(
+    {
+        (x, y, colour, name): _rng.getrandbits(64)
+        for x in range(10)
+        for y in range(10)
+        for colour in Colour
+        for name in RANKS
+    }
+)
+BLUE_TO_MOVE = _rng.getrandbits(64)
+
+
+def _key(
+    square: tuple[int, int],
+    piece: Piece,
+    mirrored: bool = False,
+    colour: Colour | None = None,
+    width: int = CLASSIC.width,
+) -> int:
+    x = width - 1 - square[0] if mirrored else square[0]
+    hidden = colour is not None and piece.colour != colour and not piece.revealed
+    return ZOBRIST[x, square[1], piece.colour, UNKNOWN if hidden else piece.name]
+
+
+def position_hash(board: Board, mirrored: bool = False, colour: Colour | None = None) -> int:
+    """
+    Return the Zobrist hash of the pieces on `board`, or of its left-right mirror image.
+
+    When `colour` is given, it is the position as seen by `colour`: the unrevealed pieces of the opponent
+    are all alike.
+    """
+    h = 0
+    width = board.geometry.width
+    for piece in board.red() + board.blue():
+        h ^= _key((piece.x, piece.y), piece, mirrored, colour, width)
+    return h
+
+
+def update_hash(
+    h: int, result: MoveResult, mirrored: bool = False, colour: Colour | None = None, geometry: Geometry = CLASSIC
+) -> int:
+    """
+    Return the hash of the position after the move of `result`, from the hash `h` of the position before.
+
+    The mirror image is taken across the width of `geometry`, the geometry of the board.
+
+    As seen by `colour`, only a move that is not an attack can be followed: an attack reveals pieces, and
+    `result` does not tell which were revealed before.
+    """
+    if colour is not None and result.is_attack:
+        raise ValueError("the hash of a view cannot follow an attack: compute it again")
+    width = geometry.width
+    h ^= _key(result.source, result.piece, mirrored, colour, width)
+    if not result.is_attack:
+        return h ^ _key(result.dest, result.piece, mirrored, colour, width)
+    if result.outcome is not False:
+        h ^= _key(result.dest, result.defender, mirrored, width=width)
+    if result.outcome is True:
+        h ^= _key(result.dest, result.piece, mirrored, width=width)
+    return h
+
+
+class Repetition:
+    """Track the moves of a game for the two-square rule, repeated positions and plies without progress."""
+
+    def __init__(
+        self,
+        board: Board,
+        two_square: int = TWO_SQUARE,
+        repetitions: int = REPETITIONS,
+        no_capture: int = NO_CAPTURE,
+        turn: Colour = Colour.RED,
+    ) -> None:
+        """Start tracking the game on `board`, with `turn` to move."""
+        self.two_square = two_square
+        self.repetitions = repetitions
+        self.no_capture = no_capture
+        self.turn = turn
+        self.hash = position_hash(board)
+        self.plies_without_capture = 0
+        # the moves in a row of the piece each colour moved last (a ring buffer), and where it is now
+        self.recent: dict[Colour, deque[Move]] = {colour: deque(maxlen=two_square) for colour in Colour}
+        # the positions since the last combat: earlier ones cannot occur again
+        self.positions: Counter[int] = Counter([self.key])
+        self.draw: str | None = None
+
+    @property
+    def key(self) -> int:
+        """Return the hash of the position including the colour to move."""
+        return self.hash ^ BLUE_TO_MOVE if self.turn == Colour.BLUE else self.hash
+
+    def allowed(self, move: Move, colour: Colour) -> bool:
+        """Return `False` when `move` of `colour` would break the two-square rule."""
+        recent = self.recent[colour]
+        if len(recent) < self.two_square or recent[-1][1] != move[0]:
+            return True
+        squares = {move[0], move[1]}
+        return not all({source, dest} == squares for source, dest in recent)
+
+    def update(self, result: MoveResult) -> str | None:
+        """Follow the move of `result`; return (and keep in `draw`) the reason of a draw, if any."""
+        colour = result.piece.colour
+        recent = self.recent[colour]
+        if recent and recent[-1][1] != result.source:  # another piece moved
+            recent.clear()
+        if result.is_attack:
+            recent.clear()
+        else:
+            recent.append((result.source, result.dest))
+        self.hash = update_hash(self.hash, result)
+        self.turn = colour.opponent
+        if result.is_attack:
+            self.plies_without_capture = 0
+            self.positions.clear()
+        else:
+            self.plies_without_capture += 1
+        self.positions[self.key] += 1
+        if self.positions[self.key] >= self.repetitions:
+            self.draw = REPETITION
+        elif self.plies_without_capture >= self.no_capture:
+            self.draw = NO_PROGRESS
+        return self.draw
@@ -0,0 +1,172 @@
+"""
+The Strategy game runner.
+
+A `Game` plays one headless game between two agents: every agent gets its own `BoardView`, is told about
+every move, and is asked for a move when it is its turn.  A game ends when a flag is captured, when a colour
+cannot move anymore (see `Board.winner`), or in a draw: after `max_plies` plies, or by the `Repetition`
+rules (which also forbid moves breaking the two-square rule).  A game keeps its `setup` and its `moves`, so
+it can be recorded (see `strategy.records`), and tells what happens on an `EventStream` (see `strategy.events`).
+
+With `ponder`, an agent that can (like `strategy.search.SearchAgent`) is asked to `ponder` after each of its
+moves, so it thinks while the opponent does; pondering agents are cancelled when the game is over.  Only use
+it when the opponent thinks out of this process: the pondering thread takes its time from an opponent that
+searches in the same interpreter.
+"""
+import random
+from dataclasses import dataclass
+
+from strategy.agents import Agent
+from strategy.board import Board, Move, MoveResult
+from strategy.colour import Colour
+from strategy.delta import board_symbols
+from strategy.events import CombatEvent, EventStream, GameOverEvent, MoveEvent, RevealEvent, SetupEvent
+from strategy.exceptions import NoPieceError, TwoSquareRuleError
+from strategy.pieces import Piece
+from strategy.repetition import Repetition
+from strategy.view import BoardView
+
+MAX_PLIES = 2000
+MAX_PLIES_REACHED = "max plies"
+
+
+@dataclass
+class GameResult:
+    """The result of a game: the winner (`None` for a draw), the number of plies played, and why it was a draw."""
+
+    winner: Colour | None
+    plies: int
+    reason: str | None = None
+
+    def __str__(self) -> str:
+        """Show the winner, or "draw"."""
+        return str(self.winner) if self.winner else "draw"
+
+
+def random_board(rng: random.Random | None = None) -> Board:
+    """Return a `Board` with a random setup for both colours."""
+    board = Board()
+    board.create_random_pieces(Colour.RED, rng)
+    board.create_random_pieces(Colour.BLUE, rng)
+    return board
+
+
+class Game:
+    """A game between two agents, played one ply at a time."""
+
+    def __init__(
+        self,
+        agents: dict[Colour, Agent],
+        board: Board | None = None,
+        max_plies: int = MAX_PLIES,
+        rng: random.Random | None = None,
+        repetition: Repetition | None = None,
+        events: EventStream | None = None,
+        ponder: bool = False,
+    ) -> None:
+        """Start a game on `board`, or on a random setup drawn from `rng`; RED moves first."""
+        self.agents = agents
+        self.events = events
+        self.ponder = ponder
+        self.board = board or random_board(rng)
+        self.max_plies = max_plies
+        self.repetition = repetition or Repetition(self.board)
+        self.turn = Colour.RED
+        self.plies = 0
+        self.result: GameResult | None = None
+        self.setup = board_symbols(self.board)
+        self.moves: list[Move] = []
+        self.views = {colour: BoardView(self.board, colour, self.repetition) for colour in Colour}
+        if self.events is not None and self.events.active:
+            self.events.emit(SetupEvent(self.setup))
+        for colour, agent in self.agents.items():
+            agent.start(self.views[colour])
+        self._check()
+
+    @property
+    def over(self) -> bool:
+        """Return whether the game is over."""
+        return self.result is not None
+
+    @property
+    def view(self) -> BoardView:
+        """Return the view of the colour whose turn it is."""
+        return self.views[self.turn]
+
+    def play(self, move: Move) -> MoveResult:
+        """Play `move` for the colour whose turn it is, tell the agents, and check whether the game is over."""
+        piece = self.board[move[0]]
+        if not isinstance(piece, Piece) or piece.colour != self.turn:
+            raise NoPieceError
+        if not self.repetition.allowed(move, self.turn):
+            raise TwoSquareRuleError
+        publish = self.events is not None and self.events.active
+        if publish:
+            known = piece.revealed, getattr(self.board[move[1]], "revealed", True)
+        result = self.board.move(*move)
+        if publish:
+            self._emit(result, known)
+        self.repetition.update(result)
+        self.moves.append(move)
+        for agent in self.agents.values():
+            agent.observe(result)
+        self.plies += 1
+        self.turn = self.turn.opponent
+        self._check()
+        if self.ponder:
+            self._ponder(result.piece.colour)
+        return result
+
+    def step(self) -> MoveResult:
+        """Let the agent whose turn it is select a move, and play it."""
+        move = self.agents[self.turn].select_move(self.view, self.turn)
+        return self.play(move)
+
+    def run(self) -> GameResult:
+        """Play until the game is over and return its result."""
+        while not self.over:
+            self.step()
+        return self.result
+
+    def _check(self) -> None:
+        if not self.view.moves():
+            self.result = GameResult(self.turn.opponent, self.plies)
+        elif winner := self.board.winner:
+            self.result = GameResult(winner, self.plies)
+        elif self.repetition.draw:
+            self.result = GameResult(None, self.plies, self.repetition.draw)
+        elif self.plies >= self.max_plies:
+            self.result = GameResult(None, self.plies, MAX_PLIES_REACHED)
+        if self.result and self.events is not None and self.events.active:
+            self.events.emit(GameOverEvent(self.result.winner, self.result.plies, self.result.reason))
+
+    def _ponder(self, colour: Colour) -> None:
+        """Let the agent of `colour`, which just moved, think on the time of the opponent; cancel all at the end."""
+        if self.over:
+            for agent in self.agents.values():
+                if hasattr(agent, "ponder"):
+                    agent.cancel()
+        elif hasattr(agent := self.agents[colour], "ponder"):
+            agent.ponder(self.views[colour], colour)
+
+    def _emit(self, result: MoveResult, known: tuple[bool, bool]) -> None:
+        """Emit the events of the move of `result`; `known` tells whether both pieces were revealed before."""
+        self.events.emit(MoveEvent(self.plies, result.piece.colour, result.source, result.dest))
+        if not result.is_attack:
+            return
+        self.events.emit(CombatEvent(self.plies, result.dest, result.piece.name, result.defender.name, result.outcome))
+        pieces = (result.piece, result.source, known[0]), (result.defender, result.dest, known[1])
+        for piece, square, revealed in pieces:
+            if not revealed:
+                self.events.emit(RevealEvent(self.plies, piece.colour, square, piece.name))
+
+
+def play_game(
+    agents: dict[Colour, Agent],
+    board: Board | None = None,
+    max_plies: int = MAX_PLIES,
+    rng: random.Random | None = None,
+    events: EventStream | None = None,
+    ponder: bool = False,
+) -> GameResult:
+    """Play a whole game between `agents` and return its result; what happens goes to `events`."""
+    return Game(agents, board, max_plies, rng, events=events, ponder=ponder).run()
@@ -0,0 +1,354 @@
+"""
+The Strategy expectimax search agent.
+
+A deterministic alpha-beta search over `Board.move`, with chance nodes for attacks on (or by) pieces of the
+opponent that are not revealed yet: the rank of such a piece is taken from the `BeliefTracker`, and the
+possible ranks are grouped by the outcome of the combat (see `COMBAT`), so a chance node has at most three
+children.  Elsewhere an unrevealed piece plays as a placeholder: a bomb when it probably cannot move, its
+most probable movable rank otherwise.
+
+The search deepens iteratively until the time budget is used or `cancel` is called, and then returns the
+best move found so far.  A `cancel` while no search runs stops the next one: it is not lost when it comes
+just before `select_move`.  Attacks are searched first, the best ones according to `COMBAT` at the front.
+
+An agent can `ponder` on the time of the opponent: in a background thread, it predicts the reply to its own
+move with a short search, and searches the position after that reply.  When the real reply is the predicted
+one, the search goes on until the budget (counted from the start of the pondering) is used and `select_move`
+returns its move; otherwise the pondering is cancelled and the agent searches as usual.  Until the reply is
+known, the pondering stops by itself after `PONDERING` budgets, so a game that is abandoned does not keep a
+core busy.  Only replies that are not attacks are predicted: the outcome of an attack on a hidden piece
+cannot be.  The pondering thread shares the interpreter (and its lock) with the rest of the process, so it
+only pays off when the opponent does not think in the same process, like a human player or a remote engine:
+an opponent searching in the same process loses about half of its nodes.
+"""
+import copy
+import logging
+import math
+import threading
+import time
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from strategy.belief import BeliefTracker
+from strategy.board import Board, Move, MoveResult
+from strategy.colour import Colour
+from strategy.evaluation import VALUES
+from strategy.pieces import BOMB, COMBAT, FLAG, POWERS, RANKS, SCOUT, Piece
+from strategy.view import BoardView, Rules
+
+log = logging.getLogger(__name__)
+
+TIME_BUDGET = 1.0
+MAX_DEPTH = 20
+WIN = 1000.0
+PREDICTION = 0.25  # of the budget, to predict the reply of the opponent
+PONDERING = 4.0  # budgets, at most, to ponder before the reply of the opponent is known
+
+IMMOVABLE = [RANKS.index(BOMB), RANKS.index(FLAG)]
+SCOUT_INDEX = RANKS.index(SCOUT)
+RANK_VALUES = np.array([VALUES[name] for name in RANKS], dtype=float)
+
+
+class _Timeout(Exception):
+    """The time is up, or the search was cancelled."""
+
+
+@dataclass
+class SearchInfo:
+    """What the last search did: the depth completed, the nodes searched, and the best move and its value."""
+
+    depth: int = 0
+    nodes: int = 0
+    seconds: float = 0.0
+    move: Move | None = None
+    value: float = 0.0
+
+    @property
+    def nodes_per_second(self) -> float:
+        """Return the number of nodes searched per second."""
+        return self.nodes / self.seconds if self.seconds else 0.0
+
+
+@dataclass
+class _Ponder:
+    """The pondering since `start`, in `thread`: the predicted reply, and whether the opponent played it."""
+
+    start: float
+    thread: threading.Thread | None = field(default=None, repr=False)
+    cancelled: threading.Event = field(default_factory=threading.Event, repr=False)
+    prediction: Move | None = None  # set when the search of the position after it starts
+    hit: bool = False
+
+
+def _evaluate(board: Board, colour: Colour) -> float:
+    """Return the material balance for `colour`; unrevealed pieces count for their expected value."""
+    total = 0.0
+    for piece in board.red() + board.blue():
+        belief = getattr(piece, "belief", None)
+        value = float(belief @ RANK_VALUES) if belief is not None else VALUES[piece.name]
+        total += value if piece.colour == colour else -value
+    return total
+
+
+def _outcomes(attacker: Piece, defender: Piece, distance: int) -> list[tuple[float, Piece, str]]:
+    """Return the probability, the unrevealed piece and its representative rank of every combat outcome."""
+    hidden = attacker if getattr(attacker, "belief", None) is not None else defender
+    belief = hidden.belief.copy()
+    if hidden is attacker:
+        belief[IMMOVABLE] = 0
+        if distance > 1:
+            belief[np.arange(len(RANKS)) != SCOUT_INDEX] = 0
+    total = belief.sum()
+    if total == 0:
+        return [(1.0, hidden, hidden.name)]
+    groups: dict[bool | None, tuple[float, str, float]] = {}
+    for index in np.flatnonzero(belief):
+        name, p = RANKS[index], float(belief[index] / total)
+        outcome = COMBAT[name, defender.name] if hidden is attacker else COMBAT[attacker.name, name]
+        probability, best, best_p = groups.get(outcome, (0.0, name, 0.0))
+        groups[outcome] = probability + p, (name if p > best_p else best), max(p, best_p)
+    return [(probability, hidden, name) for probability, name, _ in groups.values()]
+
+
+def _order(board: Board, moves: list[Move], first: Move | None) -> list[Move]:
+    """Return `moves` with `first`, then the attacks (most promising first), then the other moves."""
+
+    def key(move: Move) -> float:
+        if move == first:
+            return -math.inf
+        attacker, defender = board[move[0]], board[move[1]]
+        if not isinstance(defender, Piece):
+            return 0.0
+        if getattr(defender, "belief", None) is not None or getattr(attacker, "belief", None) is not None:
+            return -1.0
+        outcome = COMBAT[attacker.name, defender.name]
+        if outcome is True:
+            return -2.0 - VALUES[defender.name]
+        return 1.0 if outcome is None else 2.0
+
+    return sorted(moves, key=key)
+
+
+class SearchAgent:
+    """An iterative deepening expectimax agent with a time budget per move."""
+
+    def __init__(self, budget: float = TIME_BUDGET, max_depth: int = MAX_DEPTH) -> None:
+        """Create an agent thinking at most `budget` seconds and `max_depth` plies per move."""
+        self.budget = budget
+        self.max_depth = max_depth
+        self.tracker: BeliefTracker | None = None
+        self.info = SearchInfo()
+        self.ponder_hits = 0
+        self.ponder_misses = 0
+        self._cancelled = threading.Event()
+        self._interrupt = self._cancelled  # the event that stops the running search
+        self._deadline = math.inf
+        self._nodes = 0
+        self._ponder: _Ponder | None = None
+
+    def start(self, view: BoardView) -> None:
+        """Start a new game: the beliefs start from the initial setup of the opponent."""
+        self.tracker = BeliefTracker(view)
+        self._cancelled.clear()
+
+    def observe(self, result: MoveResult) -> None:
+        """Update the beliefs with the public information of `result`, and check the prediction of the pondering."""
+        self.tracker.update(result)
+        ponder = self._ponder
+        if ponder is None or ponder.hit:
+            return
+        if (result.source, result.dest) == ponder.prediction:
+            ponder.hit = True
+            self.ponder_hits += 1
+            self._deadline = ponder.start + self.budget
+        else:
+            self.ponder_misses += 1
+            self._stop_pondering()
+
+    def cancel(self) -> None:
+        """Stop the running search (or the next one) and the pondering; `select_move` returns the best move so far."""
+        self._cancelled.set()
+        ponder = self._ponder
+        if ponder is None:
+            return
+        ponder.cancelled.set()
+        ponder.thread.join()
+        if not ponder.hit:
+            self._ponder = None
+
+    def ponder(self, view: BoardView, colour: Colour) -> None:
+        """Think on the time of the opponent, in the background: predict its reply and search the position after it."""
+        self._stop_pondering()
+        if self.tracker is None:
+            return
+        # copies: the game goes on while the agent thinks
+        board, tracker, rules = self.public_board(view), copy.deepcopy(self.tracker), copy.deepcopy(view.rules)
+        ponder = _Ponder(time.perf_counter())
+        ponder.thread = threading.Thread(
+            target=self._think, args=(ponder, board, tracker, rules, colour), name="ponder", daemon=True
+        )
+        self._ponder = ponder
+        ponder.thread.start()
+
+    def select_move(self, board: BoardView, colour: Colour) -> Move:
+        """Search until the time budget is used, `max_depth` is reached or the search is cancelled."""
+        if self.tracker is None:
+            self.start(board)
+        ponder = self._ponder
+        if ponder is not None and ponder.hit:
+            ponder.thread.join()
+            self._ponder = None
+            self._cancelled.clear()
+            return self.info.move
+        self._stop_pondering()
+        start = time.perf_counter()
+        self._deadline = start + self.budget
+        self._interrupt = self._cancelled
+        moves = board.moves(colour)  # the moves the rules of the game allow
+        try:
+            return self._search(self.public_board(board), moves, colour, start)
+        finally:
+            self._cancelled.clear()  # a cancel stops one search
+
+    def public_board(self, view: BoardView) -> Board:
+        """Return a copy of the board where the unrevealed pieces of the opponent carry their `belief`."""
+        return self._public(view.board.copy(), self.tracker)
+
+    def _think(
+        self, ponder: _Ponder, board: Board, tracker: BeliefTracker, rules: Rules | None, colour: Colour
+    ) -> None:
+        """Predict the reply of the opponent on the public `board` and search the position after it, for `colour`."""
+        self._interrupt = ponder.cancelled
+        prediction = self._predict(board, rules, colour.opponent)
+        if prediction is None:
+            return
+        # the reply is played on the public board: the real one would tell whether the hidden piece can move so
+        tracker.update(board.move(*prediction))
+        root = self._public(board, tracker)
+        moves = [move for move in root.moves(colour) if rules is None or rules.allowed(move, colour)]
+        if not moves:
+            return
+        self._deadline = ponder.start + PONDERING * self.budget  # until the reply is known: see `observe`
+        ponder.prediction = prediction
+        self._search(root, moves, colour, ponder.start)
+
+    def _stop_pondering(self) -> None:
+        ponder, self._ponder = self._ponder, None
+        if ponder is not None:
+            ponder.cancelled.set()
+            ponder.thread.join()
+
+    def _predict(self, board: Board, rules: Rules | None, colour: Colour) -> Move | None:
+        """Return the best move of `colour` that is not an attack, by a two ply search on the public `board`."""
+        moves = [
+            move
+            for move in board.moves(colour)
+            if not isinstance(board[move[1]], Piece) and (rules is None or rules.allowed(move, colour))
+        ]
+        if not moves:
+            return None
+        self._deadline = time.perf_counter() + PREDICTION * self.budget
+        try:
+            move, _ = self._root(board, moves, colour, 2, None)
+        except _Timeout as timeout:
+            move = timeout.args[0] if timeout.args else moves[0]
+        return move
+
+    def _search(self, root: Board, moves: list[Move], colour: Colour, start: float) -> Move:
+        """Deepen the search of `root` until the deadline (which may move while pondering), `max_depth` or a cancel."""
+        self._nodes = 0
+        self.info = SearchInfo(move=moves[0] if moves else None)
+        for depth in range(1, self.max_depth + 1):
+            try:
+                move, value = self._root(root, moves, colour, depth, self.info.move)
+            except _Timeout as timeout:
+                if timeout.args:
+                    self.info.move, self.info.value = timeout.args
+                break
+            self.info.depth, self.info.move, self.info.value = depth, move, value
+            if abs(value) >= WIN:
+                break
+        self.info.nodes = self._nodes
+        self.info.seconds = time.perf_counter() - start
+        log.debug(
+            "Search: depth %d, %d nodes, %.0f nodes/s.", self.info.depth, self.info.nodes, self.info.nodes_per_second
+        )
+        return self.info.move
+
+    def _public(self, board: Board, tracker: BeliefTracker) -> Board:
+        """Give the unrevealed pieces of the opponent on `board` (a copy) their belief of `tracker`."""
+        for square in tracker.alive_squares:
+            row = tracker.rows[square]
+            piece, belief = board[square], tracker.matrix[row].copy()
+            if tracker.known[row]:
+                if getattr(piece, "belief", None) is None:
+                    continue
+                piece.name, piece.belief = RANKS[int(belief.argmax())], None  # a placeholder revealed since
+            elif belief[IMMOVABLE].sum() >= 0.5:
+                piece.name, piece.belief = BOMB, belief
+            else:
+                movable = belief.copy()
+                movable[IMMOVABLE] = 0
+                piece.name, piece.belief = RANKS[int(movable.argmax())], belief
+            piece.power = POWERS[piece.name]
+        board.clear_cache()  # the names changed in place
+        return board
+
+    def _root(
+        self, board: Board, moves: list[Move], colour: Colour, depth: int, first: Move | None
+    ) -> tuple[Move, float]:
+        best, best_value = None, -math.inf
+        for move in _order(board, moves, first):
+            try:
+                value = self._value(board, move, colour, depth, best_value, math.inf)
+            except _Timeout:
+                # `first`, the best move of the previous depth, is searched first: anything better is better
+                raise _Timeout(best, best_value) if best is not None else _Timeout()
+            if value > best_value:
+                best, best_value = move, value
+        return best, best_value
+
+    def _negamax(self, board: Board, colour: Colour, depth: int, alpha: float, beta: float) -> float:
+        """Return the value of `board` for `colour`, to move."""
+        self._nodes += 1
+        if time.perf_counter() > self._deadline or self._interrupt.is_set():
+            raise _Timeout
+        if depth == 0:
+            return _evaluate(board, colour)
+        moves = board.moves(colour)
+        if not moves:
+            return -WIN
+        best = -math.inf
+        for move in _order(board, moves, None):
+            best = max(best, self._value(board, move, colour, depth, alpha, beta))
+            alpha = max(alpha, best)
+            if alpha >= beta:
+                break
+        return best
+
+    def _value(self, board: Board, move: Move, colour: Colour, depth: int, alpha: float, beta: float) -> float:
+        """Return the value for `colour` of playing `move`; a chance node for attacks involving hidden pieces."""
+        attacker, defender = board[move[0]], board[move[1]]
+        hidden = isinstance(defender, Piece) and (
+            getattr(defender, "belief", None) is not None or getattr(attacker, "belief", None) is not None
+        )
+        if not hidden:
+            return self._play(board, move, colour, depth, alpha, beta)
+        value = 0.0
+        distance = abs(move[1][0] - move[0][0]) + abs(move[1][1] - move[0][1])
+        for probability, piece, name in _outcomes(attacker, defender, distance):
+            child = board.copy()
+            revealed = child[piece.x, piece.y]
+            revealed.name, revealed.power, revealed.belief = name, POWERS[name], None
+            value += probability * self._play(child, move, colour, depth, -math.inf, math.inf, copy=False)
+        return value
+
+    def _play(
+        self, board: Board, move: Move, colour: Colour, depth: int, alpha: float, beta: float, copy: bool = True
+    ) -> float:
+        child = board.copy() if copy else board
+        result = child.move(*move)
+        if result.is_attack and result.defender.name == FLAG:
+            return WIN
+        return -self._negamax(child, colour.opponent, depth - 1, -beta, -alpha)
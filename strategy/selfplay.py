@@ -0,0 +1,164 @@
+"""
+The Strategy self-play pipeline.
+
+Headless games between two agents are played (in worker processes when `workers` > 1), and every position
+is stored as the feature planes of the colour to move (see `strategy.features`), with the move played and
+the outcome of the game for that colour (1 win, 0 draw, -1 loss).
+
+The positions are written to shards of `shard_size` positions, three `.npy` files per shard:
+
+    <prefix>-00000-planes.npy     uint8 (n x PLANES x 10 x 10)
+    <prefix>-00000-moves.npy      int16 (n), see `encode_move`
+    <prefix>-00000-outcomes.npy   int8 (n)
+
+All shards hold exactly `shard_size` positions, except for the last one.  Memory stays bounded: at most one
+shard is buffered, and only a few games are in flight.  A shard is written to a temporary file and renamed,
+so a reader never sees half a shard; `load_shards` memory-maps them.
+"""
+import logging
+import os
+import random
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+
+from strategy.agents import Agent, RandomAgent
+from strategy.colour import Colour
+from strategy.features import PLANES, encode, encode_move
+from strategy.runner import MAX_PLIES, Game
+
+log = logging.getLogger(__name__)
+
+SHARD_SIZE = 10_000
+PREFIX = "shard"
+ARRAYS = ("planes", "moves", "outcomes")
+
+
+def play_positions(
+    seed: int, max_plies: int = MAX_PLIES, agent_factory: Callable[[random.Random], Agent] = RandomAgent
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Play one game with a random setup drawn from `seed`; return its planes, moves and outcomes.
+
+    The agents are created by `agent_factory` with a random generator of their own, drawn from `seed` too.
+    """
+    rng = random.Random(seed)
+    agents = {colour: agent_factory(random.Random(rng.getrandbits(32))) for colour in Colour}
+    game = Game(agents, max_plies=max_plies, rng=rng)
+    planes, moves, colours = [], [], []
+    while not game.over:
+        colour = game.turn
+        move = game.agents[colour].select_move(game.view, colour)
+        planes.append(encode(game.board, colour))
+        moves.append(encode_move(move, colour))
+        colours.append(colour)
+        game.play(move)
+    winner = game.result.winner
+    outcomes = [0 if winner is None else (1 if colour == winner else -1) for colour in colours]
+    return (
+        np.array(planes, dtype=np.uint8).reshape(-1, PLANES, 10, 10),
+        np.array(moves, dtype=np.int16),
+        np.array(outcomes, dtype=np.int8),
+    )
+
+
+class ShardWriter:
+    """Write positions to fixed-size `.npy` shards in `directory`, buffering at most one shard."""
+
+    def __init__(self, directory: str | Path, shard_size: int = SHARD_SIZE, prefix: str = PREFIX) -> None:
+        """Create the writer (and `directory`)."""
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.shard_size = shard_size
+        self.prefix = prefix
+        self.shards = 0
+        self.positions = 0
+        self._planes = np.empty((shard_size, PLANES, 10, 10), dtype=np.uint8)
+        self._moves = np.empty(shard_size, dtype=np.int16)
+        self._outcomes = np.empty(shard_size, dtype=np.int8)
+        self._size = 0
+
+    def write(self, planes: np.ndarray, moves: np.ndarray, outcomes: np.ndarray) -> None:
+        """Add positions, writing a shard every time the buffer is full."""
+        start = 0
+        while start < len(moves):
+            count = min(self.shard_size - self._size, len(moves) - start)
+            end = self._size + count
+            self._planes[self._size : end] = planes[start : start + count]
+            self._moves[self._size : end] = moves[start : start + count]
+            self._outcomes[self._size : end] = outcomes[start : start + count]
+            self._size, start = end, start + count
+            if self._size == self.shard_size:
+                self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered positions (if any) as a shard."""
+        if not self._size:
+            return
+        arrays = self._planes[: self._size], self._moves[: self._size], self._outcomes[: self._size]
+        for name, array in zip(ARRAYS, arrays):
+            path = self.directory / f"{self.prefix}-{self.shards:05d}-{name}.npy"
+            temporary = path.with_suffix(".tmp")
+            with open(temporary, "wb") as file:
+                np.save(file, array)
+            os.replace(temporary, path)
+        log.debug("Wrote shard %d with %d positions.", self.shards, self._size)
+        self.shards += 1
+        self.positions += self._size
+        self._size = 0
+
+    def close(self) -> None:
+        """Write the last (partial) shard."""
+        self.flush()
+
+    def __enter__(self) -> "ShardWriter":
+        """Return the writer, to write shards in a `with` block."""
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        """Write the last, partial shard when the `with` block ends."""
+        self.close()
+
+
+def generate(
+    directory: str | Path,
+    games: int,
+    workers: int = 1,
+    shard_size: int = SHARD_SIZE,
+    seed: int | None = None,
+    max_plies: int = MAX_PLIES,
+    agent_factory: Callable[[random.Random], Agent] = RandomAgent,
+) -> int:
+    """
+    Play `games` self-play games in `workers` processes and write their positions to shards in `directory`.
+
+    The games are written in the order they were started, so a `seed` gives the same shards for any number
+    of workers.  Return the number of positions written.
+    """
+    rng = random.Random(seed)
+    seeds = [rng.getrandbits(32) for _ in range(games)]
+    with ShardWriter(directory, shard_size) as writer:
+        if workers == 1:
+            for game_seed in seeds:
+                writer.write(*play_positions(game_seed, max_plies, agent_factory))
+        else:
+            with ProcessPoolExecutor(workers) as executor:
+                pending: deque[Future] = deque()
+                for game_seed in seeds:
+                    pending.append(executor.submit(play_positions, game_seed, max_plies, agent_factory))
+                    if len(pending) >= 2 * workers:
+                        writer.write(*pending.popleft().result())
+                while pending:
+                    writer.write(*pending.popleft().result())
+    return writer.positions
+
+
+def load_shards(directory: str | Path, prefix: str = PREFIX) -> Iterator[tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """Yield the planes, moves and outcomes of every shard in `directory`, memory-mapped read-only."""
+    for path in sorted(Path(directory).glob(f"{prefix}-*-planes.npy")):
+        stem = str(path)[: -len("planes.npy")]
+        yield tuple(np.load(f"{stem}{name}.npy", mmap_mode="r") for name in ARRAYS)
@@ -0,0 +1,299 @@
+"""
+The Strategy server.
+
+An asyncio TCP server hosting many concurrent games in one process.  The protocol is line based: every
+request and every reply is a single line of ASCII words separated by spaces.  Coordinates use the chess
+notation of the `Board`, like "a10" or "j1".
+
+    NEW [red|blue]     start a game against a bot, playing the given colour (default red)
+                       -> GAME <id> <colour>
+    NEW bot            start a bot versus bot game and follow it
+                       -> GAME <id> spectator
+    MOVE <src> <dst>   move one of your pieces
+                       -> DELTA <update>  (once for your move, once for the reply of the bot)
+    MOVES              -> MOVES <src>-<dst> ...  (your possible moves)
+    SNAPSHOT           -> SNAPSHOT <seq> <100 symbols>
+    QUIT               close the connection
+
+After GAME, and every `SNAPSHOT_INTERVAL` moves, the server sends a SNAPSHOT of the board; every move is
+sent as a DELTA (see `strategy.delta`), with the pieces of the opponent hidden from a human player.
+Errors are answered with `ERR <reason>`; the end of a game is announced with `OVER <red|blue|draw>`.
+
+Moves are applied inline in the event loop, since they are cheap; the bots think in an executor, so a slow
+bot never blocks the other connections.  Idle connections only cost a suspended `readline`.  With `ponder`,
+a bot that can (like `strategy.search.SearchAgent`) thinks on the time of a human opponent after each of its
+moves, and is cancelled when the game is over or abandoned by its connection.  Bots never ponder against
+bots: both search in this process, so pondering would only slow the other one down.  Pondering is off by
+default, since the pondering threads share the process with the event loop and the executor.
+"""
+import asyncio
+import itertools
+import logging
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from typing import Callable
+
+from strategy.agents import Agent, RandomAgent
+from strategy.board import Board, Move, MoveResult
+from strategy.colour import Colour
+from strategy.delta import DeltaEncoder
+from strategy.exceptions import InvalidCoordinateError, InvalidDestinationError, NoPieceError, ProtocolError
+from strategy.pieces import Piece
+from strategy.view import BoardView
+
+log = logging.getLogger(__name__)
+
+HOST = "127.0.0.1"
+PORT = 7410
+MAX_PLIES = 2000
+LINE_LIMIT = 1024
+
+
+@dataclass
+class GameSession:
+    """A game on the server: its `Board`, whose turn it is, and the colour played by a human (if any)."""
+
+    id: int
+    board: Board
+    agents: dict[Colour, Agent]
+    human: Colour | None = None
+    turn: Colour = Colour.RED
+    plies: int = 0
+    max_plies: int = MAX_PLIES
+    ponder: bool = False
+    over: bool = False
+    result: str | None = None
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    views: dict[Colour, BoardView] = field(init=False)
+
+    def __post_init__(self) -> None:
+        """Create the views of both players; the bots only get to see their own view."""
+        self.views = {colour: BoardView(self.board, colour) for colour in Colour}
+        for colour, agent in self.agents.items():
+            agent.start(self.views[colour])
+
+    def play(self, move: Move) -> MoveResult:
+        """Play `move` for the colour whose turn it is, tell the bots, and check whether the game is over."""
+        source, _ = move
+        piece = self.board[source]
+        if not isinstance(piece, Piece):
+            raise NoPieceError
+        if piece.colour != self.turn:
+            raise NoPieceError
+        colour = self.turn
+        result = self.board.move(*move)
+        for agent in self.agents.values():
+            agent.observe(result)
+        self.plies += 1
+        self.turn = self.turn.opponent
+        winner = self.board.winner
+        if winner:
+            self.over, self.result = True, str(winner)
+        elif self.plies >= self.max_plies:
+            self.over, self.result = True, "draw"
+        if self.over:
+            self.close()
+        elif self.ponder and self.human == self.turn and hasattr(agent := self.agents.get(colour), "ponder"):
+            agent.ponder(self.views[colour], colour)
+        return result
+
+    def close(self) -> None:
+        """Cancel the pondering of the bots: the game is over, or nobody follows it anymore."""
+        for agent in self.agents.values():
+            if hasattr(agent, "ponder"):
+                agent.cancel()
+
+
+class Server:
+    """Host many `GameSession`s; each connection plays or follows one game at a time."""
+
+    def __init__(
+        self,
+        executor: Executor | None = None,
+        agent_factory: Callable[[], Agent] = RandomAgent,
+        max_plies: int = MAX_PLIES,
+        ponder: bool = False,
+    ) -> None:
+        """
+        Create a server; bots are created by `agent_factory` and think in `executor` (default: asyncio's).
+
+        With `ponder`, the bots that can ponder think on the time of a human opponent, in a thread of their own.
+        """
+        self.executor = executor
+        self.agent_factory = agent_factory
+        self.max_plies = max_plies
+        self.ponder = ponder
+        self.games: dict[int, GameSession] = {}
+        self.connections = 0
+        self._ids = itertools.count(1)
+        self._server: asyncio.AbstractServer | None = None
+
+    async def start(self, host: str = HOST, port: int = PORT) -> int:
+        """Start listening and return the port (useful when `port` is 0)."""
+        self._server = await asyncio.start_server(self._handle, host, port, limit=LINE_LIMIT)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        """Serve until cancelled."""
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        """Stop listening and close the server."""
+        self._server.close()
+        await self._server.wait_closed()
+
+    def new_game(self, human: Colour | None) -> GameSession:
+        """Create a new game with a random setup for both colours."""
+        board = Board()
+        board.create_random_pieces(Colour.RED)
+        board.create_random_pieces(Colour.BLUE)
+        agents = {colour: self.agent_factory() for colour in Colour if colour != human}
+        session = GameSession(next(self._ids), board, agents, human, max_plies=self.max_plies, ponder=self.ponder)
+        self.games[session.id] = session
+        return session
+
+    async def bot_move(self, session: GameSession) -> MoveResult:
+        """Let the bot think in the executor and play its move."""
+        loop = asyncio.get_running_loop()
+        view = session.views[session.turn]
+        agent = session.agents[session.turn]
+        move = await loop.run_in_executor(self.executor, agent.select_move, view, session.turn)
+        return self.play(session, move)
+
+    def play(self, session: GameSession, move: Move) -> MoveResult:
+        """Play `move` in `session`, and forget the game once it is over."""
+        result = session.play(move)
+        if session.over:
+            self.games.pop(session.id, None)
+        return result
+
+    def abandon(self, session: GameSession) -> None:
+        """Forget `session`, which its connection left, and cancel the pondering of its bots."""
+        self.games.pop(session.id, None)
+        session.close()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Handle one connection until it quits or disconnects."""
+        self.connections += 1
+        connection = _Connection(self, reader, writer)
+        try:
+            await connection.run()
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            log.debug("Connection lost or line too long.")
+        finally:
+            self.connections -= 1
+            if connection.session:
+                self.abandon(connection.session)
+            writer.close()
+
+
+class _Connection:
+    """The protocol state of one client connection."""
+
+    def __init__(self, server: Server, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.server = server
+        self.reader = reader
+        self.writer = writer
+        self.session: GameSession | None = None
+        self.encoder: DeltaEncoder | None = None
+
+    async def run(self) -> None:
+        while line := await self.reader.readline():
+            words = line.decode("ascii", errors="replace").split()
+            if not words:
+                continue
+            command, arguments = words[0].upper(), words[1:]
+            if command == "QUIT":
+                break
+            try:
+                await self._dispatch(command, arguments)
+            except (ProtocolError, NoPieceError, InvalidCoordinateError, InvalidDestinationError) as e:
+                self.send("ERR", e.__class__.__name__)
+            await self.writer.drain()
+
+    def send(self, *words: str) -> None:
+        self.writer.write(" ".join(words).encode("ascii") + b"\n")
+
+    async def _dispatch(self, command: str, arguments: list[str]) -> None:
+        if command == "NEW":
+            await self._new(arguments)
+        elif command == "MOVE":
+            await self._move(arguments)
+        elif command == "MOVES":
+            session = self._human_session()
+            board = session.board
+            moves = [f"{board.notation(source)}-{board.notation(dest)}" for source, dest in board.moves(session.human)]
+            self.send("MOVES", *moves)
+        elif command == "SNAPSHOT":
+            if self.session is None:
+                raise ProtocolError("no game")
+            self.send("SNAPSHOT", self.encoder.snapshot().encode())
+        else:
+            raise ProtocolError(f"unknown command {command}")
+
+    async def _new(self, arguments: list[str]) -> None:
+        choice = arguments[0].lower() if arguments else "red"
+        if choice not in ("red", "blue", "bot"):
+            raise ProtocolError(f"unknown side {choice}")
+        if choice == "bot":
+            self._start(self.server.new_game(None), "spectator")
+            while not self.session.over:
+                await self._bot_move()
+                await self.writer.drain()
+        else:
+            human = Colour.RED if choice == "red" else Colour.BLUE
+            self._start(self.server.new_game(human), choice)
+            if human != self.session.turn:
+                await self._bot_move()
+
+    async def _move(self, arguments: list[str]) -> None:
+        session = self._human_session()
+        if len(arguments) != 2:
+            raise ProtocolError("MOVE needs a source and a destination")
+        if session.turn != session.human:
+            raise ProtocolError("not your turn")
+        move = session.board.coordinates(arguments[0]), session.board.coordinates(arguments[1])
+        async with session.lock:
+            self._send_result(self.server.play(session, move))
+        if not session.over:
+            await self._bot_move()
+
+    async def _bot_move(self) -> None:
+        async with self.session.lock:
+            self._send_result(await self.server.bot_move(self.session))
+
+    def _start(self, session: GameSession, side: str) -> None:
+        if self.session is not None:
+            self.server.abandon(self.session)
+        self.session = session
+        self.encoder = DeltaEncoder(session.board, session.human)
+        self.send("GAME", str(session.id), side)
+        self.send("SNAPSHOT", self.encoder.snapshot().encode())
+
+    def _send_result(self, result: MoveResult) -> None:
+        self.send("DELTA", self.encoder.update(result).encode())
+        if self.encoder.snapshot_due:
+            self.send("SNAPSHOT", self.encoder.snapshot().encode())
+        if self.session.over:
+            self.send("OVER", self.session.result)
+
+    def _human_session(self) -> GameSession:
+        if self.session is None or self.session.human is None:
+            raise ProtocolError("no game")
+        if self.session.over:
+            raise ProtocolError("game over")
+        return self.session
+
+
+async def serve(host: str = HOST, port: int = PORT) -> None:
+    """Run a server until cancelled."""
+    server = Server()
+    port = await server.start(host, port)
+    log.info("Serving on %s:%d.", host, port)
+    await server.serve_forever()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(serve())
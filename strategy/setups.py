@@ -0,0 +1,279 @@
+"""
+The Strategy setup evaluator.
+
+A setup is the deployment of one colour: 40 lower case symbols (see `SYMBOLS`), four rows of ten from the
+front row to the back row, as seen from its own side.  `random_setup` draws one like `create_random_pieces`.
+
+A `SetupEvaluator` scores a candidate setup by playing it against a panel of opponent setups and agents:
+game `i` puts the candidate against panel setup `i % len(setups)`, both colours played by panel agent
+`i % len(agents)`, and the candidate alternates between red and blue.  The games are played in batches (in
+`workers` processes when `workers` > 1), and after every batch the evaluation stops when the confidence
+interval of the score (a win is 1, a draw 0.5) is within `precision` of it, or after `max_games`.  All
+games are drawn from the `seed` and a batch never depends on the number of workers, so an evaluation gives
+the same result every time.
+
+A setup and its mirror image are worth the same, so the candidate is played in its canonical form (see
+`canonical_symbols`).  A `SetupCache` keeps the evaluations in a SQLite database, keyed by the canonical
+setup and the fingerprint of the panel: evaluating a setup (or its mirror image) again is a lookup.  The
+fingerprint covers the factories of the agents and their parameters (like a budget), not only their names.
+"""
+import functools
+import hashlib
+import json
+import logging
+import math
+import random
+import sqlite3
+from collections import Counter
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from statistics import NormalDist
+
+from strategy.agents import RandomAgent
+from strategy.board import Board
+from strategy.colour import Colour
+from strategy.delta import EMPTY_SYMBOL, board_from_symbols
+from strategy.exceptions import InvalidSetupError
+from strategy.league import AgentFactory
+from strategy.mirror import canonical_symbols
+from strategy.pieces import COUNTS, SYMBOLS
+from strategy.runner import MAX_PLIES, play_game
+
+log = logging.getLogger(__name__)
+
+SIZE = 40
+CONFIDENCE = 0.95
+PRECISION = 0.05
+MIN_GAMES = 20
+MAX_GAMES = 1000
+BATCH = 20
+
+_COUNTS = Counter({SYMBOLS[name]: count for name, count in COUNTS.items()})
+
+
+def random_setup(rng: random.Random | None = None) -> str:
+    """Return a random setup, drawn like `Board.create_random_pieces`."""
+    return "".join(SYMBOLS[piece.name] for piece in Board().random_pieces_list(rng))
+
+
+def check_setup(setup: str) -> str:
+    """Return `setup` in lower case; raise `InvalidSetupError` when it does not hold exactly the pieces of a colour."""
+    setup = setup.lower()
+    if len(setup) != SIZE or Counter(setup) != _COUNTS:
+        raise InvalidSetupError(f"{setup!r} is not a setup of the {SIZE} pieces of a colour")
+    return setup
+
+
+def setup_board(red: str, blue: str) -> Board:
+    """Return a new `Board` with the setups of `red` (at the bottom) and `blue` (on top), front rows facing."""
+    blue = check_setup(blue)
+    rows = [blue[start : start + 10] for start in range(0, SIZE, 10)]
+    return board_from_symbols("".join(reversed(rows)) + EMPTY_SYMBOL * 20 + check_setup(red).upper())
+
+
+def play_setup(candidate: str, opponent: str, colour: Colour, agent: AgentFactory, seed: int, max_plies: int) -> float:
+    """Play one game of `candidate` as `colour` against `opponent`, both played by `agent`; return its score."""
+    rng = random.Random(seed)
+    board = setup_board(*((candidate, opponent) if colour == Colour.RED else (opponent, candidate)))
+    agents = {side: agent(random.Random(rng.getrandbits(32))) for side in (Colour.RED, Colour.BLUE)}
+    result = play_game(agents, board, max_plies)
+    return 0.5 if result.winner is None else float(result.winner == colour)
+
+
+def _factory_key(factory: AgentFactory) -> str:
+    """Return what tells `factory` apart from another one: its qualified name and its parameters."""
+    if isinstance(factory, functools.partial):
+        return f"{_factory_key(factory.func)}{factory.args!r}{sorted(factory.keywords.items())!r}"
+    if hasattr(factory, "__qualname__"):
+        cells = [cell.cell_contents for cell in getattr(factory, "__closure__", None) or ()]
+        return f"{factory.__module__}.{factory.__qualname__}{getattr(factory, '__defaults__', None)!r}{cells!r}"
+    kind = type(factory)
+    return f"{kind.__module__}.{kind.__qualname__}{sorted(vars(factory).items())!r}"
+
+
+@dataclass
+class Evaluation:
+    """The results of a setup (in its canonical form) against a panel, and the confidence of its score."""
+
+    setup: str
+    wins: int = 0
+    draws: int = 0
+    losses: int = 0
+    confidence: float = CONFIDENCE
+
+    @property
+    def games(self) -> int:
+        """Return the number of games played."""
+        return self.wins + self.draws + self.losses
+
+    @property
+    def score(self) -> float:
+        """Return the mean score, counting 1 for a win and 0.5 for a draw; `nan` without games."""
+        return (self.wins + 0.5 * self.draws) / self.games if self.games else math.nan
+
+    @property
+    def win_rate(self) -> float:
+        """Return the fraction of the games won; `nan` without games."""
+        return self.wins / self.games if self.games else math.nan
+
+    @property
+    def interval(self) -> tuple[float, float]:
+        """Return the (Wilson) confidence interval of the score."""
+        n = self.games
+        if not n:
+            return 0.0, 1.0
+        z = NormalDist().inv_cdf((1 + self.confidence) / 2)
+        p, z2 = self.score, z * z
+        centre = (p + z2 / (2 * n)) / (1 + z2 / n)
+        half = z / (1 + z2 / n) * math.sqrt(p * (1 - p) / n + z2 / (4 * n * n))
+        return max(centre - half, 0.0), min(centre + half, 1.0)
+
+    def add(self, score: float) -> None:
+        """Add the score of one game."""
+        if score == 1:
+            self.wins += 1
+        elif score == 0:
+            self.losses += 1
+        else:
+            self.draws += 1
+
+
+class SetupCache:
+    """The evaluations of setups against panels, in a SQLite database at `path`."""
+
+    def __init__(self, path: str | Path) -> None:
+        """Open (or create) the database."""
+        self._connection = sqlite3.connect(path)
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS evaluations ("
+                "setup TEXT, panel TEXT, wins INTEGER, draws INTEGER, losses INTEGER, confidence REAL, "
+                "PRIMARY KEY (setup, panel))"
+            )
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, setup: str, panel: str) -> Evaluation | None:
+        """Return the evaluation of the canonical `setup` against `panel`, if any."""
+        row = self._connection.execute(
+            "SELECT wins, draws, losses, confidence FROM evaluations WHERE setup = ? AND panel = ?", (setup, panel)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return Evaluation(setup, *row)
+
+    def put(self, evaluation: Evaluation, panel: str) -> None:
+        """Store `evaluation` against `panel`."""
+        with self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO evaluations VALUES (?, ?, ?, ?, ?, ?)",
+                (evaluation.setup, panel, evaluation.wins, evaluation.draws, evaluation.losses, evaluation.confidence),
+            )
+
+    def close(self) -> None:
+        """Close the database."""
+        self._connection.close()
+
+    def __len__(self) -> int:
+        """Return the number of evaluations."""
+        return self._connection.execute("SELECT COUNT(*) FROM evaluations").fetchone()[0]
+
+    def __enter__(self) -> "SetupCache":
+        """Return the cache; the database is closed when the `with` block ends."""
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        """Close the database."""
+        self.close()
+
+
+class SetupEvaluator:
+    """Score setups against a panel of opponent `setups`, played by the panel `agents` (by name)."""
+
+    def __init__(
+        self,
+        setups: list[str],
+        agents: dict[str, AgentFactory] | None = None,
+        seed: int = 0,
+        max_plies: int = MAX_PLIES,
+        precision: float = PRECISION,
+        confidence: float = CONFIDENCE,
+        min_games: int = MIN_GAMES,
+        max_games: int = MAX_GAMES,
+        workers: int = 1,
+        cache: SetupCache | None = None,
+    ) -> None:
+        """Create an evaluator; the factories of `agents` must be picklable when `workers` > 1."""
+        if not setups:
+            raise ValueError("a panel needs at least one setup")
+        self.setups = [check_setup(setup) for setup in setups]
+        self.agents = agents or {"random": RandomAgent}
+        self.seed = seed
+        self.max_plies = max_plies
+        self.precision = precision
+        self.confidence = confidence
+        self.min_games = min_games
+        self.max_games = max_games
+        self.workers = workers
+        self.cache = cache
+
+    @property
+    def panel(self) -> str:
+        """Return the fingerprint of the panel: everything but the candidate that decides the evaluation."""
+        agents = sorted((name, _factory_key(factory)) for name, factory in self.agents.items())
+        settings = [self.setups, agents, self.seed, self.max_plies, self.precision, self.confidence]
+        settings += [self.min_games, self.max_games]
+        return hashlib.sha256(json.dumps(settings).encode()).hexdigest()
+
+    def evaluate(self, setup: str) -> Evaluation:
+        """Return the evaluation of `setup` (or of its mirror image) from the cache, or play it."""
+        canonical, _ = canonical_symbols(check_setup(setup))
+        if self.cache is not None and (cached := self.cache.get(canonical, self.panel)) is not None:
+            return cached
+        evaluation = self._play(canonical)
+        log.debug("Setup %s: %.3f in %d games.", canonical, evaluation.score, evaluation.games)
+        if self.cache is not None:
+            self.cache.put(evaluation, self.panel)
+        return evaluation
+
+    def rank(self, setups: list[str]) -> list[Evaluation]:
+        """Return the evaluations of `setups`, best score first."""
+        return sorted((self.evaluate(setup) for setup in setups), key=lambda evaluation: -evaluation.score)
+
+    def _games(self, canonical: str) -> Iterator[tuple]:
+        """Yield the arguments of `play_setup` for every game, in order."""
+        rng = random.Random(self.seed)
+        names = sorted(self.agents)
+        for i in range(self.max_games):
+            colour = Colour.RED if i % 2 == 0 else Colour.BLUE
+            agent = self.agents[names[i % len(names)]]
+            yield canonical, self.setups[i % len(self.setups)], colour, agent, rng.getrandbits(32), self.max_plies
+
+    def _done(self, evaluation: Evaluation) -> bool:
+        if evaluation.games >= self.max_games:
+            return True
+        low, high = evaluation.interval
+        return evaluation.games >= self.min_games and (high - low) / 2 <= self.precision
+
+    def _play(self, canonical: str) -> Evaluation:
+        evaluation = Evaluation(canonical, confidence=self.confidence)
+        games = self._games(canonical)
+        executor = ProcessPoolExecutor(self.workers) if self.workers > 1 else None
+        try:
+            while not self._done(evaluation):
+                batch = list(islice(games, BATCH))
+                if executor is None:
+                    scores = [play_setup(*arguments) for arguments in batch]
+                else:
+                    scores = executor.map(play_setup, *zip(*batch))
+                for score in scores:
+                    evaluation.add(score)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        return evaluation
@@ -0,0 +1,184 @@
+"""
+The Strategy event sinks.
+
+Sinks take the events of an `EventStream` (see `strategy.events`):
+
+    - a `RingBuffer` keeps the last `capacity` events in memory;
+    - a `JsonlSink` writes every event as a line of JSON;
+    - a `RecordSink` writes every game as a `GameRecord` in the binary format of `strategy.records`.
+
+The file sinks are `BufferedSink`s: `handle` only queues the event, and a background thread writes the
+events in batches of at most `batch_size`, or when the oldest has waited `max_latency` seconds, so a game
+never waits for the disk.  `close` writes what is left.
+"""
+import json
+import logging
+import queue
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import asdict
+from pathlib import Path
+
+from strategy.colour import Colour
+from strategy.events import Event, GameOverEvent, MoveEvent, SetupEvent
+from strategy.records import GameRecord, RecordWriter
+
+log = logging.getLogger(__name__)
+
+CAPACITY = 10_000
+BATCH_SIZE = 1024
+MAX_LATENCY = 0.1
+
+_FLUSH = object()
+_CLOSE = object()
+
+_KINDS = {
+    "SetupEvent": "setup",
+    "MoveEvent": "move",
+    "CombatEvent": "combat",
+    "RevealEvent": "reveal",
+    "GameOverEvent": "game-over",
+}
+
+
+class RingBuffer:
+    """Keep the last `capacity` events in memory."""
+
+    def __init__(self, capacity: int = CAPACITY) -> None:
+        """Create an empty buffer."""
+        self.events: deque[Event] = deque(maxlen=capacity)
+
+    def handle(self, event: Event) -> None:
+        """Keep `event`, dropping the oldest one when the buffer is full."""
+        self.events.append(event)
+
+    def close(self) -> None:
+        """Keep the events: there is nothing to write."""
+        pass
+
+
+class BufferedSink(ABC):
+    """A sink that writes its events in batches on a background thread; subclasses implement `write`."""
+
+    def __init__(self, batch_size: int = BATCH_SIZE, max_latency: float = MAX_LATENCY) -> None:
+        """Start the writer thread."""
+        self.batch_size = batch_size
+        self.max_latency = max_latency
+        self.batches = 0
+        self._queue: queue.Queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name=self.__class__.__name__, daemon=True)
+        self._thread.start()
+
+    def handle(self, event: Event) -> None:
+        """Queue `event` for the writer thread."""
+        self._queue.put(event)
+
+    def flush(self) -> None:
+        """Write the queued events without waiting for `max_latency`."""
+        self._queue.put(_FLUSH)
+
+    def close(self) -> None:
+        """Write the queued events and stop the writer thread."""
+        self._queue.put(_CLOSE)
+        self._thread.join()
+
+    @abstractmethod
+    def write(self, events: list[Event]) -> None:
+        """Write a batch of events."""
+
+    def __enter__(self) -> "BufferedSink":
+        """Return the sink; it is closed when the `with` block ends."""
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        """Write the queued events and stop the writer thread."""
+        self.close()
+
+    def _run(self) -> None:
+        batch, deadline = [], None
+        while True:
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = _FLUSH
+            if item is not _FLUSH and item is not _CLOSE:
+                batch.append(item)
+                deadline = deadline or time.monotonic() + self.max_latency
+            if batch and (item is _FLUSH or item is _CLOSE or len(batch) >= self.batch_size):
+                try:
+                    self.write(batch)
+                except Exception:
+                    log.exception("Could not write %d events.", len(batch))
+                self.batches += 1
+                batch, deadline = [], None
+            if item is _CLOSE:
+                self._closed()
+                return
+
+    def _closed(self) -> None:
+        """Release what the sink holds, on the writer thread."""
+        pass
+
+
+def _json(value: object) -> str:
+    if isinstance(value, Colour):
+        return value.name
+    raise TypeError(f"{value!r} is not JSON serializable")
+
+
+class JsonlSink(BufferedSink):
+    """Append the events to a file of JSON lines, like {"event": "move", "ply": 0, "colour": "RED", ...}."""
+
+    def __init__(self, path: str | Path, batch_size: int = BATCH_SIZE, max_latency: float = MAX_LATENCY) -> None:
+        """Open `path` for appending."""
+        self._file = open(path, "a", encoding="utf-8")  # noqa: SIM115 (closed by `_closed`, on the writer thread)
+        super().__init__(batch_size, max_latency)
+
+    def write(self, events: list[Event]) -> None:
+        """Write the events as lines, and flush the file."""
+        lines = [
+            json.dumps({"event": _KINDS[type(event).__name__], **asdict(event)}, default=_json) + "\n"
+            for event in events
+        ]
+        self._file.writelines(lines)
+        self._file.flush()
+
+    def _closed(self) -> None:
+        self._file.close()
+
+
+class RecordSink(BufferedSink):
+    """Write every game (from its setup to its game over event) as a `GameRecord` to a new record file."""
+
+    def __init__(self, path: str | Path, batch_size: int = BATCH_SIZE, max_latency: float = MAX_LATENCY) -> None:
+        """Create the record file at `path`."""
+        self._file = open(path, "wb")  # noqa: SIM115 (closed by `_closed`, on the writer thread)
+        self._writer = RecordWriter(self._file)
+        self._record: GameRecord | None = None
+        super().__init__(batch_size, max_latency)
+
+    @property
+    def records(self) -> int:
+        """Return the number of records written so far."""
+        return self._writer.records
+
+    def write(self, events: list[Event]) -> None:
+        """Follow the games in the events, and write the ones that are over."""
+        for event in events:
+            if isinstance(event, SetupEvent):
+                self._record = GameRecord(event.setup)
+            elif self._record is None:
+                continue
+            elif isinstance(event, MoveEvent):
+                self._record.moves.append((event.source, event.dest))
+            elif isinstance(event, GameOverEvent):
+                self._record.winner = event.winner
+                self._writer.write(self._record)
+                self._record = None
+        self._file.flush()
+
+    def _closed(self) -> None:
+        self._file.close()
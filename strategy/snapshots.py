@@ -0,0 +1,127 @@
+"""
+The Strategy board snapshots.
+
+Spectator and analysis threads should not read a `Board` while the game thread moves on it: a move changes
+two cells and the coordinates of a piece one after the other, so a reader can see half a move.  Instead,
+they read `BoardSnapshot`s: immutable, versioned copies of the board.
+
+A `SnapshotPublisher` follows the moves on a board (see `Board.listeners`) and publishes a new snapshot
+after each one, by replacing its `current` snapshot in one assignment.  Readers take `current` without a
+lock and keep it as long as they like; the game thread never waits for them.
+
+A snapshot is a tuple of rows of cells.  A move changes two cells at most, so the next snapshot only
+rebuilds the (one or two) rows of those cells and shares all the other rows with the previous one: a move
+costs O(width + height), not a copy of the board.
+"""
+from collections import deque
+from dataclasses import dataclass
+from typing import NamedTuple
+
+from strategy.board import Board, MoveResult
+from strategy.colour import Colour
+from strategy.delta import EMPTY_SYMBOL, LAKE_SYMBOL, UNKNOWN
+from strategy.game import Field
+from strategy.geometry import Geometry
+from strategy.pieces import SYMBOLS, Piece
+
+HISTORY = 100
+
+
+class PieceState(NamedTuple):
+    """A piece as it was when the snapshot was taken."""
+
+    name: str
+    colour: Colour
+    revealed: bool
+    moved: bool
+
+
+Row = tuple[PieceState | None, ...]
+
+
+def _state(cell: Field) -> PieceState | None:
+    if isinstance(cell, Piece):
+        return PieceState(cell.name, cell.colour, cell.revealed, cell.moved)
+    return None
+
+
+@dataclass(frozen=True)
+class BoardSnapshot:
+    """The pieces on a board after `version` moves, row by row from the top (`None` for an empty square or lake)."""
+
+    version: int
+    geometry: Geometry
+    rows: tuple[Row, ...]
+
+    @classmethod
+    def of(cls, board: Board, version: int = 0) -> "BoardSnapshot":
+        """Return a snapshot of the whole `board`."""
+        width, height = board.geometry.width, board.geometry.height
+        rows = tuple(tuple(_state(board[x, y]) for x in range(width)) for y in range(height))
+        return cls(version, board.geometry, rows)
+
+    def after(self, result: MoveResult, board: Board) -> "BoardSnapshot":
+        """Return the next version, after the move of `result` was played on `board`."""
+        rows = list(self.rows)
+        for y in {result.source[1], result.dest[1]}:
+            row = list(rows[y])
+            for x, cell_y in (result.source, result.dest):
+                if cell_y == y:
+                    row[x] = _state(board[x, y])
+            rows[y] = tuple(row)
+        return BoardSnapshot(self.version + 1, self.geometry, tuple(rows))
+
+    def pieces(self, colour: Colour) -> list[tuple[tuple[int, int], PieceState]]:
+        """Return the squares and the pieces of `colour`."""
+        return [
+            ((x, y), cell)
+            for y, row in enumerate(self.rows)
+            for x, cell in enumerate(row)
+            if cell is not None and cell.colour == colour
+        ]
+
+    def symbols(self, colour: Colour | None = None) -> str:
+        """Return the snapshot as symbols like `board_symbols`, as seen by `colour` (or everybody)."""
+        lakes = set(self.geometry.lakes)
+        symbols = []
+        for y, row in enumerate(self.rows):
+            for x, cell in enumerate(row):
+                if cell is None:
+                    symbols.append(LAKE_SYMBOL if (x, y) in lakes else EMPTY_SYMBOL)
+                elif colour is not None and cell.colour != colour and not cell.revealed:
+                    symbols.append(UNKNOWN)
+                else:
+                    symbol = SYMBOLS[cell.name]
+                    symbols.append(symbol.upper() if cell.colour == Colour.RED else symbol)
+        return "".join(symbols)
+
+    def __getitem__(self, square: tuple[int, int]) -> PieceState | None:
+        """Return the piece at `square`, if any."""
+        return self.rows[square[1]][square[0]]
+
+
+class SnapshotPublisher:
+    """Publish a `BoardSnapshot` of `board` after every move; readers take `current`, without locking."""
+
+    def __init__(self, board: Board, history: int = HISTORY) -> None:
+        """Take the first snapshot and follow the moves on `board`; the last `history` snapshots are kept."""
+        self.board = board
+        self.current = BoardSnapshot.of(board)
+        self.history: deque[BoardSnapshot] = deque([self.current], maxlen=history)
+        board.listeners.append(self.update)
+
+    def update(self, result: MoveResult) -> None:
+        """Publish the snapshot after the move of `result`."""
+        snapshot = self.current.after(result, self.board)
+        self.history.append(snapshot)
+        self.current = snapshot  # one assignment: readers see the previous version or this one
+
+    def version(self, version: int) -> BoardSnapshot | None:
+        """Return the snapshot of `version`, if it is still in the history."""
+        history = list(self.history)
+        index = version - history[0].version
+        return history[index] if 0 <= index < len(history) else None
+
+    def close(self) -> None:
+        """Stop following the moves on the board."""
+        self.board.listeners.remove(self.update)
@@ -0,0 +1,296 @@
+"""
+The Strategy statistics.
+
+A `StatsAggregator` consumes `GameRecord`s (or just `GameResult`s) one at a time and keeps only counters,
+so its memory does not grow with the number of games:
+
+    - the results, and the win rate of every value of every setup feature (see `SETUP_FEATURES`);
+    - the game lengths, as `RunningStats`, a fixed-bin `Histogram` and a `QuantileSketch`;
+    - the survival rate of every rank of both colours;
+    - the capture matrix: how many times a rank took another rank, and how many times two ranks traded.
+
+Aggregators (and all their parts) are mergeable, so every worker process can aggregate its own games and
+the partial results are merged at the end.  `tables` returns the summaries, `export` writes them as CSV.
+"""
+import csv
+import math
+from collections import Counter
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+
+from strategy.colour import Colour
+from strategy.pieces import BOMB, COUNTS, FLAG, RANKS, SCOUT, SYMBOLS
+from strategy.records import GameRecord
+from strategy.runner import MAX_PLIES, GameResult
+
+LENGTH_BINS = 50
+RELATIVE_ACCURACY = 0.01
+QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+_RANK_INDEX = {name: index for index, name in enumerate(RANKS)}
+
+
+class RunningStats:
+    """The count, mean, variance, minimum and maximum of a stream of values (Welford)."""
+
+    def __init__(self) -> None:
+        """Start without values."""
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+    @property
+    def variance(self) -> float:
+        """Return the sample variance."""
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    def add(self, value: float) -> None:
+        """Add one value."""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+
+    def merge(self, other: "RunningStats") -> None:
+        """Add the values of `other` (Chan et al.)."""
+        count = self.count + other.count
+        if not count:
+            return
+        delta = other.mean - self.mean
+        self._m2 += other._m2 + delta * delta * self.count * other.count / count
+        self.mean += delta * other.count / count
+        self.count = count
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+
+
+class Histogram:
+    """Counts in `bins` equal bins between `low` and `high`, plus one for underflow and one for overflow."""
+
+    def __init__(self, low: float, high: float, bins: int) -> None:
+        """Create an empty histogram."""
+        self.low = low
+        self.high = high
+        self.bins = bins
+        self.counts = np.zeros(bins + 2, dtype=np.int64)
+
+    @property
+    def edges(self) -> np.ndarray:
+        """Return the `bins` + 1 edges of the bins."""
+        return np.linspace(self.low, self.high, self.bins + 1)
+
+    def add(self, value: float) -> None:
+        """Count one value."""
+        if value < self.low:
+            self.counts[0] += 1
+        elif value >= self.high:
+            self.counts[-1] += 1
+        else:
+            self.counts[1 + int((value - self.low) * self.bins / (self.high - self.low))] += 1
+
+    def merge(self, other: "Histogram") -> None:
+        """Add the counts of `other`, which must have the same bins."""
+        if (self.low, self.high, self.bins) != (other.low, other.high, other.bins):
+            raise ValueError("histograms with different bins cannot be merged")
+        self.counts += other.counts
+
+
+class QuantileSketch:
+    """
+    A mergeable sketch of the quantiles of a stream of positive values (DDSketch).
+
+    Values are counted in logarithmic buckets, so every quantile is returned within `relative_accuracy` of
+    a value of that rank, and the number of buckets only grows with the logarithm of the range.
+    """
+
+    def __init__(self, relative_accuracy: float = RELATIVE_ACCURACY) -> None:
+        """Create an empty sketch."""
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.buckets: Counter[int] = Counter()
+        self.zeros = 0
+        self.count = 0
+
+    def add(self, value: float) -> None:
+        """Count one value; values of zero (or less) are counted as zero."""
+        self.count += 1
+        if value <= 0:
+            self.zeros += 1
+        else:
+            self.buckets[math.ceil(math.log(value) / self._log_gamma)] += 1
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """Add the counts of `other`, which must have the same accuracy."""
+        if self.relative_accuracy != other.relative_accuracy:
+            raise ValueError("sketches with different accuracies cannot be merged")
+        self.buckets.update(other.buckets)
+        self.zeros += other.zeros
+        self.count += other.count
+
+    def quantile(self, q: float) -> float:
+        """Return the quantile `q` (between 0 and 1); `nan` when the sketch is empty."""
+        if not self.count:
+            return math.nan
+        rank = q * (self.count - 1)
+        seen = self.zeros
+        if rank < seen:
+            return 0.0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if rank < seen:
+                return 2 * self._gamma**key / (self._gamma + 1)
+        return 2 * self._gamma ** max(self.buckets) / (self._gamma + 1)
+
+
+def _rows(setup: str, colour: Colour) -> list[str]:
+    """Return the four rows of the setup of `colour` from its front row to its back row, in lower case."""
+    rows = [setup[y * 10 : y * 10 + 10].lower() for y in range(10)]
+    return rows[6:10] if colour == Colour.RED else rows[3::-1]
+
+
+def _flag(rows: list[str]) -> tuple[int, int]:
+    for row, symbols in enumerate(rows):
+        if SYMBOLS[FLAG] in symbols:
+            return symbols.index(SYMBOLS[FLAG]), row
+    return -1, -1
+
+
+def _bombs_around_flag(rows: list[str]) -> int:
+    x, y = _flag(rows)
+    neighbours = [(x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)]
+    return sum(0 <= i < 10 and 0 <= j < 4 and rows[j][i] == SYMBOLS[BOMB] for i, j in neighbours)
+
+
+# The features of a setup, as seen from its own side: row 0 is the front row, row 3 the back row.
+SETUP_FEATURES: dict[str, Callable[[list[str]], int | str]] = {
+    "flag row": lambda rows: _flag(rows)[1],
+    "flag on edge": lambda rows: "yes" if _flag(rows)[0] in (0, 9) else "no",
+    "bombs around flag": _bombs_around_flag,
+    "front row bombs": lambda rows: rows[0].count(SYMBOLS[BOMB]),
+    "front row scouts": lambda rows: rows[0].count(SYMBOLS[SCOUT]),
+}
+
+
+def _matrix(corner: str, matrix: np.ndarray) -> list[list]:
+    return [[corner] + RANKS] + [[name] + row for name, row in zip(RANKS, matrix.tolist())]
+
+
+class StatsAggregator:
+    """Aggregate the statistics of a stream of games in constant memory."""
+
+    def __init__(self, max_plies: int = MAX_PLIES, bins: int = LENGTH_BINS) -> None:
+        """Create an empty aggregator; the length histogram has `bins` bins up to `max_plies`."""
+        ranks = len(RANKS)
+        self.games = 0
+        self.results: Counter[str] = Counter()
+        self.lengths = RunningStats()
+        self.length_histogram = Histogram(0, max_plies, bins)
+        self.length_sketch = QuantileSketch()
+        self.records = 0
+        self.survivors = {colour: np.zeros(ranks, dtype=np.int64) for colour in Colour}
+        self.captures = np.zeros((ranks, ranks), dtype=np.int64)
+        self.trades = np.zeros((ranks, ranks), dtype=np.int64)
+        # (feature, value) -> [setups, wins, draws]
+        self.features: dict[tuple[str, int | str], list[int]] = {}
+
+    def add_result(self, result: GameResult) -> None:
+        """Count the winner and the length of a game."""
+        self.games += 1
+        self.results[str(result)] += 1
+        self.lengths.add(result.plies)
+        self.length_histogram.add(result.plies)
+        self.length_sketch.add(result.plies)
+
+    def add(self, record: GameRecord) -> None:
+        """Count everything of the game of `record`, replaying its moves for the captures and the survivors."""
+        self.add_result(GameResult(record.winner, record.plies))
+        self.records += 1
+        board = record.board()
+        for result in record.replay(board):
+            if not result.is_attack:
+                continue
+            attacker, defender = _RANK_INDEX[result.piece.name], _RANK_INDEX[result.defender.name]
+            if result.outcome is True:
+                self.captures[attacker, defender] += 1
+            elif result.outcome is False:
+                self.captures[defender, attacker] += 1
+            else:
+                self.trades[attacker, defender] += 1
+        for colour, pieces in ((Colour.RED, board.red()), (Colour.BLUE, board.blue())):
+            for piece in pieces:
+                self.survivors[colour][_RANK_INDEX[piece.name]] += 1
+        for colour in Colour:
+            rows = _rows(record.setup, colour)
+            for name, feature in SETUP_FEATURES.items():
+                counts = self.features.setdefault((name, feature(rows)), [0, 0, 0])
+                counts[0] += 1
+                counts[1] += record.winner == colour
+                counts[2] += record.winner is None
+
+    def merge(self, other: "StatsAggregator") -> "StatsAggregator":
+        """Add the counts of `other` (e.g. aggregated by another process) and return this aggregator."""
+        self.games += other.games
+        self.results.update(other.results)
+        self.lengths.merge(other.lengths)
+        self.length_histogram.merge(other.length_histogram)
+        self.length_sketch.merge(other.length_sketch)
+        self.records += other.records
+        for colour in Colour:
+            self.survivors[colour] += other.survivors[colour]
+        self.captures += other.captures
+        self.trades += other.trades
+        for key, counts in other.features.items():
+            totals = self.features.setdefault(key, [0, 0, 0])
+            for i, count in enumerate(counts):
+                totals[i] += count
+        return self
+
+    def survival_rates(self, colour: Colour) -> dict[str, float]:
+        """Return the fraction of the pieces of every rank of `colour` that survived their game."""
+        if not self.records:
+            return {name: math.nan for name in RANKS}
+        return {name: self.survivors[colour][i] / (COUNTS[name] * self.records) for i, name in enumerate(RANKS)}
+
+    def tables(self) -> dict[str, list[list]]:
+        """Return the summary tables, every table as a header row followed by the data rows."""
+        lengths = [["statistic", "plies"]]
+        lengths += [["mean", self.lengths.mean], ["stdev", math.sqrt(self.lengths.variance)]]
+        lengths += [["min", self.lengths.minimum], ["max", self.lengths.maximum]]
+        lengths += [[f"p{round(q * 100)}", self.length_sketch.quantile(q)] for q in QUANTILES]
+        edges = self.length_histogram.edges
+        histogram = [["from", "to", "games"], [-math.inf, edges[0], self.length_histogram.counts[0]]]
+        histogram += [[edges[i], edges[i + 1], self.length_histogram.counts[i + 1]] for i in range(len(edges) - 1)]
+        histogram += [[edges[-1], math.inf, self.length_histogram.counts[-1]]]
+        red, blue = self.survival_rates(Colour.RED), self.survival_rates(Colour.BLUE)
+        survival = [["rank", "red", "blue"]] + [[name, red[name], blue[name]] for name in RANKS]
+        features = [["feature", "value", "setups", "win rate", "draw rate"]]
+        for (name, value), (setups, wins, draws) in sorted(self.features.items(), key=lambda item: str(item[0])):
+            features.append([name, value, setups, wins / setups, draws / setups])
+        return {
+            "results": [["result", "games"]] + [[result, self.results[result]] for result in ("red", "blue", "draw")],
+            "lengths": lengths,
+            "length histogram": histogram,
+            "survival": survival,
+            "captures": _matrix("taker \\ taken", self.captures),
+            "trades": _matrix("attacker \\ defender", self.trades),
+            "setup features": features,
+        }
+
+    def export(self, directory: str | Path) -> list[Path]:
+        """Write every table as a CSV file in `directory`; return the paths."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        paths = []
+        for name, rows in self.tables().items():
+            path = directory / f"{name.replace(' ', '_')}.csv"
+            with open(path, "w", newline="") as file:
+                csv.writer(file).writerows(rows)
+            paths.append(path)
+        return paths
@@ -0,0 +1,281 @@
+"""
+The Strategy endgame tablebases.
+
+A `Tablebase` solves every position of a small endgame with known ranks: one or two movable pieces of each
+colour plus both flags, on fixed squares (flags do not move).  Every piece is on one of the 92 squares that
+are not in `Board.LAKES`, or captured, so a position is indexed as
+
+    index = turn * 93^n + sum(square(piece i) * 93^i)     (turn: 0 red, 1 blue; square 92: captured)
+
+with the red pieces first.  The moves are generated by `Board.moves` and the combats resolved with `COMBAT`,
+so the tables follow the rules of the game (except for the repetition rules).  The positions are solved by
+retrograde analysis: a colour without moves has lost, a colour that can take the flag wins in one, and from
+there the results are propagated backwards through the predecessors, layer by layer, so the distances are
+the number of plies to the end with the best play of both colours.  Positions that are never decided are
+draws.
+
+Generating a table builds a `Board` for every index, about 40 microseconds each, so `generate` only accepts
+endgames of at most `MAX_PIECES` movable pieces in all: 1 against 1, 2 against 1 or 1 against 2, at most
+1.6 million positions (about two minutes).  2 against 2 would already be 150 million positions, hours of work.
+
+A table is saved as a small JSON header followed by a bit stream: every position takes 2 bits for its value
+and as many bits for its distance as the longest distance needs.  `Tablebase.load` memory-maps the file, so
+`probe` reads only the few bytes of one position.  A table answers for the mirror images of its positions too.
+"""
+import json
+import logging
+import struct
+from collections import deque
+from pathlib import Path
+
+import numpy as np
+
+from strategy.board import Board, Move
+from strategy.colour import Colour
+from strategy.exceptions import InvalidRecordError
+from strategy.geometry import check_classic
+from strategy.mirror import mirror_square
+from strategy.pieces import COMBAT, FLAG, POWERS, Piece
+
+log = logging.getLogger(__name__)
+
+MAGIC = b"STTB"
+SQUARES = [(x, y) for y in range(10) for x in range(10) if (x, y) not in Board.LAKES]
+CAPTURED = len(SQUARES)
+BASE = CAPTURED + 1
+MAX_PIECES = 3
+CHUNK = 1 << 16  # positions packed at a time by `save`: a multiple of 8, so every chunk fills whole bytes
+
+DRAW = 0
+WIN = 1
+LOSS = 2
+INVALID = 3
+
+_SQUARE_INDEX = {square: index for index, square in enumerate(SQUARES)}
+_TURNS = (Colour.RED, Colour.BLUE)
+
+
+def _identity(square: tuple[int, int]) -> tuple[int, int]:
+    return square
+
+
+class Tablebase:
+    """The solved positions of `red` against `blue` (the names of their movable pieces), with fixed flags."""
+
+    def __init__(
+        self,
+        red: list[str],
+        blue: list[str],
+        red_flag: tuple[int, int],
+        blue_flag: tuple[int, int],
+        values: np.ndarray | None = None,
+        distances: np.ndarray | None = None,
+    ) -> None:
+        """Create a table; use `generate` to solve it, or `load` to read a solved one."""
+        self.red = list(red)
+        self.blue = list(blue)
+        self.red_flag = tuple(red_flag)
+        self.blue_flag = tuple(blue_flag)
+        self.pieces = len(self.red) + len(self.blue)
+        self.size = 2 * BASE**self.pieces
+        self.values = values
+        self.distances = distances
+        self._bits: np.ndarray | None = None
+        self._width = 0
+
+    def save(self, path: str | Path) -> None:
+        """Write the table, bit-packed: 2 bits for the value and enough bits for the distance per position."""
+        width = 2 + max(int(self.distances.max()), 1).bit_length()
+        shifts = np.arange(width - 1, -1, -1, dtype=np.uint32)
+        header = json.dumps(
+            {"red": self.red, "blue": self.blue, "red_flag": self.red_flag, "blue_flag": self.blue_flag, "width": width}
+        ).encode()
+        with open(path, "wb") as file:
+            file.write(MAGIC + struct.pack("<I", len(header)) + header)
+            for start in range(0, self.size, CHUNK):
+                values = self.values[start : start + CHUNK].astype(np.uint32)
+                entries = (values << (width - 2)) | self.distances[start : start + CHUNK].astype(np.uint32)
+                bits = ((entries[:, None] >> shifts) & 1).astype(np.uint8)
+                file.write(np.packbits(bits.ravel()).tobytes())
+            file.write(bytes(4))  # so `probe` can always read 4 bytes
+
+    @classmethod
+    def generate(
+        cls, red: list[str], blue: list[str], red_flag: tuple[int, int], blue_flag: tuple[int, int]
+    ) -> "Tablebase":
+        """Solve all the positions of the endgame by retrograde analysis; at most `MAX_PIECES` movable pieces."""
+        if not 0 < len(red) + len(blue) <= MAX_PIECES:
+            raise ValueError(f"a table has 1 to {MAX_PIECES} movable pieces, not {len(red) + len(blue)}")
+        table = cls(red, blue, red_flag, blue_flag)
+        successors, pointers, captures, invalid = table._successors()
+        # the predecessors of every position, as the sources of all the moves sorted by destination
+        remaining = np.diff(pointers)
+        sources = np.repeat(np.arange(table.size), remaining)
+        order = np.argsort(successors, kind="stable")
+        predecessors = sources[order]
+        starts = np.searchsorted(successors[order], np.arange(table.size + 1))
+        values = np.full(table.size, DRAW, dtype=np.uint8)
+        distances = np.zeros(table.size, dtype=np.int64)
+        values[invalid] = INVALID
+        queue: deque[int] = deque()
+        for index in np.flatnonzero((remaining == 0) & ~captures & ~invalid):
+            values[index] = LOSS
+            queue.append(index)
+        for index in np.flatnonzero(captures):
+            values[index], distances[index] = WIN, 1
+            queue.append(index)
+        while queue:
+            index = queue.popleft()
+            value, distance = values[index], distances[index]
+            for predecessor in predecessors[starts[index] : starts[index + 1]]:
+                if values[predecessor] != DRAW:
+                    continue
+                if value == LOSS:
+                    values[predecessor], distances[predecessor] = WIN, distance + 1
+                    queue.append(predecessor)
+                else:
+                    remaining[predecessor] -= 1
+                    if remaining[predecessor] == 0:
+                        values[predecessor], distances[predecessor] = LOSS, distance + 1
+                        queue.append(predecessor)
+        table.values, table.distances = values, distances
+        wins, losses = (values == WIN).sum(), (values == LOSS).sum()
+        log.debug("Solved %d positions: %d wins, %d losses.", (~invalid).sum(), wins, losses)
+        return table
+
+    @classmethod
+    def load(cls, path: str | Path) -> "Tablebase":
+        """Memory-map a table written by `save`."""
+        with open(path, "rb") as file:
+            if file.read(len(MAGIC)) != MAGIC:
+                raise InvalidRecordError(f"{path} is not a tablebase")
+            (length,) = struct.unpack("<I", file.read(4))
+            header = json.loads(file.read(length))
+        table = cls(header["red"], header["blue"], header["red_flag"], header["blue_flag"])
+        table._width = header["width"]
+        table._bits = np.memmap(path, dtype=np.uint8, mode="r", offset=len(MAGIC) + 4 + length)
+        return table
+
+    def index(self, board: Board, turn: Colour) -> int | None:
+        """
+        Return the index of the position on `board` with `turn` to move; `None` if it is not in this table.
+
+        A table also holds the mirror images of its positions (see `strategy.mirror`): when the flags on `board`
+        are on the mirror images of the squares of the table, the index of the mirror image is returned.
+        """
+        check_classic(board.geometry, "tablebases")
+        red, blue = board.red(), board.blue()
+        flags = [(piece.x, piece.y) for piece in red + blue if piece.name == FLAG]
+        if flags == [self.red_flag, self.blue_flag]:
+            square = _identity
+        elif flags == [mirror_square(self.red_flag), mirror_square(self.blue_flag)]:
+            square = mirror_square
+        else:
+            return None
+        slots = []
+        for pieces, names in ((red, self.red), (blue, self.blue)):
+            squares: dict[str, list[tuple[int, int]]] = {}
+            for piece in pieces:
+                if piece.name != FLAG:
+                    squares.setdefault(piece.name, []).append(square((piece.x, piece.y)))
+            for name in names:
+                taken = squares.get(name)
+                slots.append(_SQUARE_INDEX[taken.pop()] if taken else CAPTURED)
+            if any(squares.values()):
+                return None
+        return self._index(slots, turn)
+
+    def probe(self, board: Board, turn: Colour) -> tuple[int, int] | None:
+        """Return the value (`WIN`, `LOSS` or `DRAW`) for `turn` and the distance in plies, if in this table."""
+        index = self.index(board, turn)
+        return None if index is None else self.lookup(index)
+
+    def lookup(self, index: int) -> tuple[int, int]:
+        """Return the value and the distance of the position at `index`."""
+        if self._bits is None:
+            return int(self.values[index]), int(self.distances[index])
+        offset = index * self._width
+        start = offset // 8
+        word = int.from_bytes(self._bits[start : start + 4].tobytes(), "big")
+        entry = (word >> (32 - offset % 8 - self._width)) & ((1 << self._width) - 1)
+        return entry >> (self._width - 2), entry & ((1 << (self._width - 2)) - 1)
+
+    def best_move(self, board: Board, turn: Colour) -> Move | None:
+        """Return the best move of `turn`: the fastest win, the slowest loss, or a draw; `None` if not in the table."""
+        if self.probe(board, turn) is None:
+            return None
+        best, best_key = None, None
+        for move in board.moves(turn):
+            child = board.copy()
+            result = child.move(*move)
+            if result.is_attack and result.defender.name == FLAG:
+                return move
+            value, distance = self.probe(child, turn.opponent)
+            key = {LOSS: (0, distance), DRAW: (1, 0), WIN: (2, -distance)}[value]
+            if best_key is None or key < best_key:
+                best, best_key = move, key
+        return best
+
+    def _index(self, slots: list[int], turn: Colour) -> int:
+        index = _TURNS.index(turn)
+        for slot in reversed(slots):
+            index = index * BASE + slot
+        return index
+
+    def _slots(self, index: int) -> tuple[list[int], Colour]:
+        slots = []
+        for _ in range(self.pieces):
+            index, slot = divmod(index, BASE)
+            slots.append(slot)
+        return slots, _TURNS[index]
+
+    def _successors(self) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Return the successors of all positions in compressed rows: `successors[pointers[i]:pointers[i + 1]]`.
+
+        Also return which positions can take the flag of the opponent (those moves are not successors), and
+        which positions are invalid (pieces on the same square, or on a flag).
+        """
+        names = self.red + self.blue
+        colours = [Colour.RED] * len(self.red) + [Colour.BLUE] * len(self.blue)
+        flags = {self.red_flag, self.blue_flag}
+        successors: list[int] = []
+        counts = np.zeros(self.size, dtype=np.int64)
+        captures = np.zeros(self.size, dtype=bool)
+        invalid = np.zeros(self.size, dtype=bool)
+        for index in range(self.size):
+            slots, turn = self._slots(index)
+            occupied = [SQUARES[slot] for slot in slots if slot != CAPTURED]
+            if len(set(occupied)) != len(occupied) or flags & set(occupied):
+                invalid[index] = True
+                continue
+            board = Board()
+            board[self.red_flag] = Piece(FLAG, POWERS[FLAG], Colour.RED, *self.red_flag)
+            board[self.blue_flag] = Piece(FLAG, POWERS[FLAG], Colour.BLUE, *self.blue_flag)
+            at = {}
+            for i, slot in enumerate(slots):
+                if slot != CAPTURED:
+                    x, y = SQUARES[slot]
+                    board[x, y] = Piece(names[i], POWERS[names[i]], colours[i], x, y)
+                    at[x, y] = i
+            for source, dest in board.moves(turn):
+                if dest in flags:
+                    captures[index] = True
+                    continue
+                after = list(slots)
+                mover = at[source]
+                if dest not in at:
+                    after[mover] = _SQUARE_INDEX[dest]
+                else:
+                    defender = at[dest]
+                    outcome = COMBAT[names[mover], names[defender]]
+                    if outcome is True:
+                        after[mover], after[defender] = _SQUARE_INDEX[dest], CAPTURED
+                    elif outcome is False:
+                        after[mover] = CAPTURED
+                    else:
+                        after[mover] = after[defender] = CAPTURED
+                successors.append(self._index(after, turn.opponent))
+                counts[index] += 1
+        pointers = np.concatenate([[0], np.cumsum(counts)])
+        return np.array(successors, dtype=np.int64), pointers, captures, invalid
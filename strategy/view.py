@@ -0,0 +1,134 @@
+"""
+The Strategy board views.
+
+A `BoardView` shows a `Board` as one player sees it: all of its own pieces, and the pieces of the opponent
+as `HiddenPiece`s until a combat revealed them.  A view does not copy anything: every read goes to the
+board, and the `revealed` and `moved` flags are kept up to date by `Board.move` itself.
+"""
+from dataclasses import dataclass
+from typing import Protocol
+
+from strategy.board import Board, Move, PieceRange
+from strategy.colour import Colour
+from strategy.delta import board_symbols
+from strategy.exceptions import NoPieceError
+from strategy.game import UNKNOWN, Empty, Field, Lake
+from strategy.pieces import Piece
+
+
+@dataclass
+class HiddenPiece(Field):
+    """A piece of the opponent of which the rank is not known."""
+
+    colour: Colour | None = None
+    moved: bool = False
+    revealed: bool = False
+
+
+class Rules(Protocol):
+    """Rules that forbid some of the moves of the `Board`, like `strategy.repetition.Repetition`."""
+
+    def allowed(self, move: Move, colour: Colour) -> bool:
+        """Return `False` when `colour` may not play `move`."""
+
+
+class BoardView:
+    """The `Board` as seen by the player of `colour`."""
+
+    def __init__(self, board: Board, colour: Colour, rules: Rules | None = None) -> None:
+        """Create a view on `board` for `colour`; the moves forbidden by `rules` are left out of `moves`."""
+        self.board = board
+        self.colour = colour
+        self.rules = rules
+
+    def __str__(self) -> str:
+        """Show the board as seen by `colour`, as 100 symbols (see `strategy.delta.cell_symbol`)."""
+        return board_symbols(self.board, self.colour)
+
+    @property
+    def opponent(self) -> Colour:
+        """Return the colour of the opponent."""
+        return self.colour.opponent
+
+    @property
+    def winner(self) -> Colour | None:
+        """Return the winning Colour; if no winner could be found, return `None`."""
+        return self.board.winner
+
+    def get(self, key: tuple[int, int] | tuple[str, int] | str, default: Field | None) -> Field | None:
+        """Return the cell at `key` like `Board.get`, hiding the pieces of the opponent."""
+        return self._hide(self.board.get(key, default))
+
+    def own(self) -> list[Piece]:
+        """Return the pieces of `colour`."""
+        return self.board.red() if self.colour == Colour.RED else self.board.blue()
+
+    def others(self) -> list[Piece | HiddenPiece]:
+        """Return the pieces of the opponent, hidden unless they are revealed."""
+        pieces = self.board.blue() if self.colour == Colour.RED else self.board.red()
+        return [self._hide(piece) for piece in pieces]
+
+    def moves(self, colour: Colour | None = None) -> list[Move]:
+        """
+        Return the possible moves of `colour` (the own colour by default) as far as the player can tell.
+
+        The rank of an unrevealed piece of the opponent is not known, so it may move one square in every
+        direction, like any movable piece that is not a scout.
+        """
+        colour = colour or self.colour
+        moves = self.board.moves(colour) if colour == self.colour else self._opponent_moves()
+        if self.rules is None:
+            return moves
+        return [move for move in moves if self.rules.allowed(move, colour)]
+
+    def available_range(self, x: int, y: int) -> PieceRange:
+        """Return the `PieceRange` of one of the own pieces, with the attackable pieces hidden."""
+        piece = self.board[x, y]
+        if not isinstance(piece, Piece) or piece.colour != self.colour:
+            raise NoPieceError
+        piece_range = self.board.available_range(x, y)
+        return PieceRange(
+            piece,
+            self._hide_range(piece_range.north),
+            self._hide_range(piece_range.east),
+            self._hide_range(piece_range.south),
+            self._hide_range(piece_range.west),
+        )
+
+    def notation(self, coordinates: tuple[int, int]) -> str:
+        """Return the chess notation of `coordinates`."""
+        return self.board.notation(coordinates)
+
+    def coordinates(self, key: tuple[int, int] | tuple[str, int] | str) -> tuple[int, int]:
+        """Return the `tuple[int, int]` coordinates of `key`."""
+        return self.board.coordinates(key)
+
+    def __getitem__(self, key: tuple[int, int] | tuple[str, int] | str) -> Piece | HiddenPiece | Lake | Empty:
+        """Get a cell from the board; a hidden piece of the opponent is returned as a `HiddenPiece`."""
+        return self._hide(self.board[key])
+
+    def __len__(self) -> int:
+        """Get the length of the board."""
+        return len(self.board)
+
+    def _opponent_moves(self) -> list[Move]:
+        moves = []
+        for piece in self.board.blue() if self.colour == Colour.RED else self.board.red():
+            source = piece.x, piece.y
+            if piece.revealed:
+                movables = self.board.available_range(*source).movables.values()
+                moves.extend((source, dest) for coordinates in movables for dest in coordinates)
+                continue
+            for ray in self.board.geometry.rays[source]:
+                if ray and not (isinstance(cell := self.board[ray[0]], Piece) and cell.colour == piece.colour):
+                    moves.append((source, ray[0]))
+        return moves
+
+    def _hide(self, cell: Field | None) -> Field | None:
+        if isinstance(cell, Piece) and cell.colour != self.colour and not cell.revealed:
+            return HiddenPiece(UNKNOWN, cell.x, cell.y, cell.colour, cell.moved)
+        return cell
+
+    def _hide_range(self, direction: tuple[int, Piece | None]) -> tuple[int, Piece | HiddenPiece | None]:
+        distance, piece = direction
+        return distance, self._hide(piece)
@@ -0,0 +1,15 @@
+import random
+
+from strategy.agents import RandomAgent
+from strategy.board import Board
+from strategy.colour import Colour
+
+
+def test_random_agent():
+    board = Board()
+    board.create_random_pieces(Colour.RED)
+    board.create_random_pieces(Colour.BLUE)
+    agent = RandomAgent(random.Random(3))
+    move = agent.select_move(board, Colour.RED)
+    assert move in board.moves(Colour.RED)
+    assert RandomAgent(random.Random(3)).select_move(board, Colour.RED) == move
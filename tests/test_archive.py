@@ -0,0 +1,82 @@
+import random
+
+import numpy as np
+import pytest
+
+from strategy.agents import RandomAgent
+from strategy.archive import ArchiveIndex
+from strategy.colour import Colour
+from strategy.pieces import FLAG, RANKS, SCOUT
+from strategy.records import GameRecord
+from strategy.runner import Game
+from strategy.stats import StatsAggregator
+
+
+@pytest.fixture(scope="module")
+def records():
+    records = []
+    for seed in range(12):
+        agents = {colour: RandomAgent(random.Random(seed * 2 + i)) for i, colour in enumerate(Colour)}
+        game = Game(agents, max_plies=300, rng=random.Random(seed))
+        game.run()
+        records.append(GameRecord.from_game(game))
+    return records
+
+
+@pytest.fixture(scope="module")
+def index(records):
+    return ArchiveIndex.build(records)
+
+
+def test_index_columns(index, records):
+    assert len(index) == len(records)
+    assert index.games["plies"].tolist() == [record.plies for record in records]
+    assert len(index.events["game"]) == sum(record.plies for record in records)
+    assert index.query().results() == {
+        "red": sum(record.winner == Colour.RED for record in records),
+        "blue": sum(record.winner == Colour.BLUE for record in records),
+        "draw": sum(record.winner is None for record in records),
+    }
+
+
+def test_capture_index(index, records):
+    aggregator = StatsAggregator()
+    for record in records:
+        aggregator.add(record)
+    assert (index.query().capture_matrix() == aggregator.captures).all()
+    for taker, row in zip(RANKS, aggregator.captures):
+        for taken, count in zip(RANKS, row):
+            games = index.captured(taker, taken)
+            assert (len(games) > 0) == (count > 0)
+            assert (np.diff(games) > 0).all()
+    taker, taken = np.unravel_index(aggregator.captures.argmax(), aggregator.captures.shape)
+    assert index.query().captured(RANKS[taker], RANKS[taken]).count == len(index.captured(RANKS[taker], RANKS[taken]))
+
+
+def test_query(index, records):
+    flags = [
+        game
+        for game, record in enumerate(records)
+        if record.winner and (last := list(record.replay())[-1]).defender and last.defender.name == FLAG
+    ]
+    assert index.query().won_by_flag().games.tolist() == flags
+    assert flags
+    short = index.query().plies(below=100)
+    assert short.games.tolist() == [game for game, record in enumerate(records) if record.plies < 100]
+    long_scouts = index.query().with_event(rank=SCOUT, attack=False, min_distance=3).games.tolist()
+    expected = [
+        game
+        for game, record in enumerate(records)
+        if any(r.piece.name == SCOUT and not r.is_attack and r.distance >= 3 for r in record.replay())
+    ]
+    assert long_scouts == expected
+    assert 0 < len(expected) < len(records)
+    assert index.query().aggregate("plies", np.max) == max(record.plies for record in records)
+
+
+def test_index_save_load(tmp_path, index):
+    index.save(tmp_path)
+    loaded = ArchiveIndex.load(tmp_path)
+    assert isinstance(loaded.events["game"], np.memmap)
+    assert loaded.query().with_event(rank=SCOUT).games.tolist() == index.query().with_event(rank=SCOUT).games.tolist()
+    assert (loaded.query().capture_matrix() == index.query().capture_matrix()).all()
@@ -0,0 +1,81 @@
+import random
+
+import numpy as np
+import pytest
+
+from strategy.agents import RandomAgent
+from strategy.batch import BatchScheduler, HeuristicBatchAgent, ScheduledAgent, run_games
+from strategy.board import Board
+from strategy.colour import Colour
+from strategy.features import decode_move, encode, legal_mask
+from strategy.pieces import FLAG, MARSHAL, SCOUT, Piece
+from strategy.runner import Game
+
+
+@pytest.fixture
+def board():
+    board = Board()
+    board[4, 6] = Piece(MARSHAL, 10, Colour.RED, x=4, y=6)
+    board[9, 9] = Piece(FLAG, 0, Colour.RED, x=9, y=9)
+    board[4, 5] = scout = Piece(SCOUT, 2, Colour.BLUE, x=4, y=5)
+    board[0, 0] = Piece(FLAG, 0, Colour.BLUE, x=0, y=0)
+    scout.revealed = True
+    return board
+
+
+def test_heuristic_batch_agent_attacks(board):
+    planes, mask = encode(board, Colour.RED), legal_mask(board, Colour.RED)
+    moves = HeuristicBatchAgent(seed=1).select_moves(np.stack([planes, planes]), np.stack([mask, mask]))
+    assert [decode_move(move, Colour.RED) for move in moves.tolist()] == [((4, 6), (4, 5))] * 2
+
+
+def test_heuristic_batch_agent_legal_moves():
+    board = Board()
+    board.create_random_pieces(Colour.RED, random.Random(1))
+    board.create_random_pieces(Colour.BLUE, random.Random(2))
+    mask = legal_mask(board, Colour.BLUE)
+    move = HeuristicBatchAgent(seed=1).select_moves(encode(board, Colour.BLUE)[None], mask[None])[0]
+    assert decode_move(int(move), Colour.BLUE) in board.moves(Colour.BLUE)
+
+
+def test_scheduler_batches(board):
+    with BatchScheduler(HeuristicBatchAgent(seed=1), batch_size=3, max_latency=10.0) as scheduler:
+        planes, mask = encode(board, Colour.RED), legal_mask(board, Colour.RED)
+        futures = [scheduler.submit(planes, mask) for _ in range(4)]
+        assert futures[2].result(timeout=5) == futures[0].result(timeout=5)
+        scheduler.flush()
+        assert futures[3].result(timeout=5) == futures[0].result()
+    assert scheduler.stats.decisions == 4
+    assert scheduler.stats.batches == 2
+
+
+def test_scheduler_latency(board):
+    with BatchScheduler(HeuristicBatchAgent(), batch_size=100, max_latency=0.01) as scheduler:
+        future = scheduler.submit(encode(board, Colour.RED), legal_mask(board, Colour.RED))
+        assert decode_move(future.result(timeout=5), Colour.RED) == ((4, 6), (4, 5))
+
+
+def test_scheduler_agent_error(board):
+    class Failing:
+        def select_moves(self, planes, masks):
+            raise ValueError("broken")
+
+    with BatchScheduler(Failing(), batch_size=1) as scheduler:
+        future = scheduler.submit(encode(board, Colour.RED), legal_mask(board, Colour.RED))
+        with pytest.raises(ValueError):
+            future.result(timeout=5)
+
+
+def test_run_games():
+    with BatchScheduler(HeuristicBatchAgent(seed=1), max_latency=10.0) as scheduler:
+        games = [
+            Game(
+                {Colour.RED: ScheduledAgent(scheduler), Colour.BLUE: RandomAgent(random.Random(seed))},
+                max_plies=40,
+                rng=random.Random(seed),
+            )
+            for seed in range(4)
+        ]
+        run_games(games, scheduler)
+    assert all(game.over for game in games)
+    assert scheduler.stats.batch_size > 1
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from strategy.belief import BeliefTracker
+from strategy.board import Board
+from strategy.colour import Colour
+from strategy.exceptions import NoPieceError
+from strategy.pieces import BOMB, COUNTS, FLAG, MARSHAL, RANKS, SCOUT, Piece
+from strategy.view import BoardView
+
+
+@pytest.fixture
+def board():
+    board = Board()
+    board.create_random_pieces(Colour.RED)
+    board.create_random_pieces(Colour.BLUE)
+    return board
+
+
+def _counts(tracker) -> dict[str, float]:
+    return dict(zip(RANKS, tracker.matrix.sum(axis=0).round(6).tolist()))
+
+
+def test_belief_prior(board):
+    tracker = BeliefTracker(BoardView(board, Colour.RED))
+    assert tracker.matrix.shape == (40, len(RANKS))
+    assert _counts(tracker) == COUNTS
+    assert tracker[0, 0][BOMB] == pytest.approx(6 / 40)
+    with pytest.raises(NoPieceError):
+        tracker[5, 5]
+
+
+def test_belief_moved(board):
+    tracker = BeliefTracker(BoardView(board, Colour.RED))
+    x = next(x for x in (0, 1, 4, 5, 8, 9) if board[x, 3].name not in (BOMB, FLAG))
+    tracker.update(board.move((x, 3), (x, 4)))
+    belief = tracker[x, 4]
+    assert belief[BOMB] == belief[FLAG] == 0
+    assert sum(belief.values()) == pytest.approx(1)
+    assert _counts(tracker) == pytest.approx(COUNTS)
+    assert tracker[0 if x else 1, 3][BOMB] > 6 / 40
+
+
+def test_belief_scout_and_combat():
+    board = Board()
+    board[0, 0] = Piece(SCOUT, 2, Colour.BLUE, x=0, y=0)
+    board[1, 0] = Piece(MARSHAL, 10, Colour.BLUE, x=1, y=0)
+    board[1, 1] = Piece(BOMB, 11, Colour.RED, x=1, y=1)
+    board[0, 6] = Piece(MARSHAL, 10, Colour.RED, x=0, y=6)
+    tracker = BeliefTracker(BoardView(board, Colour.RED))
+    tracker.remaining[:] = 0
+    tracker.remaining[RANKS.index(SCOUT)] = tracker.remaining[RANKS.index(MARSHAL)] = 1
+    tracker.normalise()
+
+    tracker.update(board.move((0, 0), (0, 5)))
+    assert tracker[0, 5][SCOUT] == 1
+    assert tracker[1, 0][MARSHAL] == pytest.approx(1)
+    tracker.update(board.move((0, 6), (0, 5)))  # the red marshal takes the scout
+    assert tracker.alive_squares == [(1, 0)]
+    assert tracker.remaining[RANKS.index(SCOUT)] == 0
+    tracker.update(board.move((1, 0), (1, 1)))  # the blue marshal attacks a bomb and loses
+    assert tracker.alive_squares == []
+
+
+def test_belief_sample(board):
+    tracker = BeliefTracker(BoardView(board, Colour.RED))
+    samples = tracker.sample(200, np.random.default_rng(1))
+    assert samples.shape == (200, 40)
+    expected = [COUNTS[name] for name in RANKS]
+    assert all(np.bincount(sample, minlength=len(RANKS)).tolist() == expected for sample in samples)
+
+
+def test_belief_determinize(board):
+    tracker = BeliefTracker(BoardView(board, Colour.RED))
+    tracker.update(board.move(*board.moves(Colour.RED)[0]))
+    sample = tracker.sample(1, np.random.default_rng(2))[0]
+    determinization = tracker.determinize(board, sample)
+    assert determinization.red() == board.red()
+    assert sorted(piece.name for piece in determinization.blue()) == sorted(piece.name for piece in board.blue())
+    assert [piece.name for piece in determinization.blue()] == [RANKS[rank] for rank in sample]
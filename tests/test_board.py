@@ -1,12 +1,15 @@
 """Board tests."""
+import random
+
 import pytest
 from pytest import fixture
 
-from strategy.board import Board, EmptyPieceRange, PieceRange
+from strategy.board import Board, EmptyPieceRange, MoveResult, PieceRange
 from strategy.colour import Colour
 from strategy.exceptions import InvalidCoordinateError, InvalidDestinationError, InvalidDimensionsError, NoPieceError
 from strategy.game import EMPTY, LAKE, Empty, Lake
 from strategy.pieces import BOMB, CAPTAIN, FLAG, MINER, SCOUT, Piece
+from strategy.runner import random_board
 
 
 @fixture
@@ -172,6 +175,21 @@ def test_board_move(board):
     assert board[4, 7] == Empty(EMPTY, x=4, y=7)
 
 
+def test_board_move_result(board):
+    scout = Piece(SCOUT, 2, Colour.RED, x=6, y=7)
+    board[6, 7] = scout
+    result = board.move((6, 7), (6, 9))
+    assert result == MoveResult((6, 7), (6, 9), scout)
+    assert not result.is_attack
+    assert result.distance == 2
+    bomb = Piece(BOMB, 11, Colour.BLUE, x=3, y=9)
+    board[3, 9] = bomb
+    result = board.move((6, 9), (3, 9))
+    assert result.is_attack
+    assert result.defender is bomb
+    assert result.outcome is False
+
+
 def test_board_repr(board):
     assert f"{board!r}".startswith("<Board (")
     assert f"{board!r}".endswith(">")
@@ -254,3 +272,77 @@ def test_board_piece_range_attackables():
     assert piece_range.attackables == {"north": bomb}
     piece_range = PieceRange(miner, (1, bomb), (1, bomb), (1, bomb), (1, bomb))
     assert piece_range.attackables == {"north": bomb, "east": bomb, "south": bomb, "west": bomb}
+
+
+def test_board_moves(board):
+    assert board.moves(Colour.RED) == []
+    board[0, 9] = Piece(CAPTAIN, 6, Colour.RED, x=0, y=9)
+    board[0, 8] = Piece(MINER, 3, Colour.BLUE, x=0, y=8)
+    board[5, 5] = Piece(BOMB, 11, Colour.RED, x=5, y=5)
+    assert sorted(board.moves(Colour.RED)) == [((0, 9), (0, 8)), ((0, 9), (1, 9))]
+    assert len(board.moves(Colour.BLUE)) == 3
+
+
+def test_board_notation(board):
+    assert board.notation((0, 0)) == "a10"
+    assert board.notation((9, 9)) == "j1"
+    assert board.coordinates("f6") == (5, 4)
+    assert board.coordinates(board.notation((3, 7))) == (3, 7)
+    with pytest.raises(InvalidDimensionsError):
+        board.notation((10, 0))
+    with pytest.raises(InvalidCoordinateError):
+        board.coordinates(None)
+
+
+def test_board_copy(board):
+    board.create_random_pieces(Colour.RED)
+    copy = board.copy()
+    assert copy.red() == board.red()
+    assert all(a is not b for a, b in zip(copy.red(), board.red()))
+    source, dest = copy.moves(Colour.RED)[0]
+    copy.move(source, dest)
+    assert board[source] != copy[source]
+    assert not board[source].moved
+
+
+def test_board_listeners(board):
+    results = []
+    board.listeners.append(results.append)
+    board[6, 7] = Piece(SCOUT, 2, Colour.RED, x=6, y=7)
+    result = board.move((6, 7), (5, 7))
+    assert results == [result]
+    assert board.copy().listeners == []
+
+
+def test_board_range_cache(board):
+    board[0, 7] = Piece(SCOUT, 2, Colour.RED, x=0, y=7)
+    assert board.available_range(0, 7) is board.available_range(0, 7)
+    assert (board.cache_hits, board.cache_misses, board.cache_hit_rate) == (1, 1, 0.5)
+    bomb = board[0, 2] = Piece(BOMB, 11, Colour.BLUE, x=0, y=2)  # in line with the scout
+    assert board.available_range(0, 7).north == (5, bomb)
+    board[9, 9] = Piece(MINER, 3, Colour.BLUE, x=9, y=9)  # elsewhere
+    assert board.available_range(0, 7).north == (5, bomb)
+    assert (board.cache_hits, board.cache_misses) == (2, 2)
+
+
+def _directions(piece_range) -> list[tuple[int, int]]:
+    directions = piece_range.north, piece_range.east, piece_range.south, piece_range.west
+    return [(count, id(target)) for count, target in directions]
+
+
+def test_board_range_cache_equals_fresh_ranges():
+    rng = random.Random(3)
+    for _ in range(3):
+        board = random_board(rng)
+        colour = Colour.RED
+        for _ in range(150):
+            for piece in board.red() + board.blue():
+                cached, fresh = board.available_range(piece.x, piece.y), board._available_range(piece.x, piece.y)
+                assert cached.piece is fresh.piece
+                assert _directions(cached) == _directions(fresh)
+            moves = board.moves(colour)
+            if not moves:
+                break
+            board.move(*rng.choice(moves))
+            colour = colour.opponent
+        assert board.cache_hit_rate > 0.5
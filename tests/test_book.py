@@ -0,0 +1,62 @@
+import random
+
+import pytest
+
+from strategy.agents import RandomAgent
+from strategy.book import BookAgent, OpeningBook, build_book
+from strategy.colour import Colour
+from strategy.delta import board_from_symbols, board_symbols
+from strategy.mirror import CanonicalPosition, mirror_move, mirror_symbols
+from strategy.records import GameRecord
+from strategy.runner import Game, random_board
+
+
+@pytest.fixture(scope="module")
+def setup():
+    return board_symbols(random_board(random.Random(1)))
+
+
+def play(setup: str, seed: int, agents=None) -> Game:
+    rng = random.Random(seed)
+    agents = agents or {colour: RandomAgent(random.Random(rng.getrandbits(32))) for colour in Colour}
+    game = Game(agents, board_from_symbols(setup), max_plies=40)
+    game.run()
+    return game
+
+
+@pytest.fixture(scope="module")
+def records(setup):
+    return [GameRecord.from_game(play(setup, seed)) for seed in range(30)]
+
+
+def test_build_book(records, setup):
+    columns = build_book(records, plies=4)
+    assert (columns["key"][1:] >= columns["key"][:-1]).all()
+    book = OpeningBook(columns, min_games=1)
+    position = CanonicalPosition(board_from_symbols(setup), Colour.RED)
+    moves = book.probe(position)
+    assert sum(move.games for move in moves) == len(records)
+    assert {move.move for move in moves} == {record.moves[0] for record in records}
+    best = book.best(position)
+    assert best == max(moves, key=lambda move: (move.score, move.games)).move
+    # the mirror image of the position has the mirror images of the moves
+    image = CanonicalPosition(board_from_symbols(mirror_symbols(setup)), Colour.RED)
+    assert sorted(move.move for move in book.probe(image)) == sorted(mirror_move(move.move) for move in moves)
+    assert book.probe(CanonicalPosition(random_board(random.Random(2)), Colour.RED)) == []
+
+
+def test_book_save_load(tmp_path, records, setup):
+    OpeningBook(build_book(records)).save(tmp_path / "book")
+    book = OpeningBook.load(tmp_path / "book")
+    assert len(book) == len(build_book(records)["key"])
+    position = CanonicalPosition(board_from_symbols(setup), Colour.RED)
+    assert book.probe(position) == OpeningBook(build_book(records)).probe(position)
+
+
+def test_book_agent(records, setup):
+    book = OpeningBook(build_book(records), min_games=2)
+    agents = {colour: BookAgent(book, RandomAgent(random.Random(3))) for colour in Colour}
+    game = play(setup, 4, agents)
+    assert agents[Colour.RED].hits >= 1
+    assert agents[Colour.RED].position is None  # out of the book after a while
+    assert game.moves[0] == book.best(CanonicalPosition(board_from_symbols(setup), Colour.RED))
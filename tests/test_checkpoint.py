@@ -0,0 +1,73 @@
+import json
+
+import pytest
+
+from strategy.agents import RandomAgent
+from strategy.checkpoint import Batch, compact, read_journal
+
+
+class Crash(Exception):
+    """A crash of the batch in the middle of a game."""
+
+
+class CrashingAgent(RandomAgent):
+    """A random agent that crashes the batch after a number of moves of all crashing agents."""
+
+    moves = 0
+    limit = 0
+
+    def select_move(self, board, colour):
+        """Crash at the `limit`th move, play a random move otherwise."""
+        CrashingAgent.moves += 1
+        if CrashingAgent.moves == CrashingAgent.limit:
+            raise Crash
+        return super().select_move(board, colour)
+
+
+def test_batch(tmp_path):
+    results = Batch(tmp_path / "batch.jsonl", 5, seed=1, max_plies=100, parallel=2, interval=10).run()
+    assert len(results) == 5
+    assert all(result.plies <= 100 for result in results)
+    entries = read_journal(tmp_path / "batch.jsonl")
+    assert sorted(entry["game"] for entry in entries if entry["type"] == "result") == list(range(5))
+    # a finished batch resumes to the same results without playing
+    assert Batch(tmp_path / "batch.jsonl", 5, seed=1, max_plies=100, parallel=2).run() == results
+
+
+@pytest.mark.parametrize("limit", [25, 333, 777])
+def test_resume_gives_identical_results(tmp_path, limit):
+    expected = Batch(tmp_path / "expected.jsonl", 6, seed=2, max_plies=200, parallel=3, interval=7).run()
+    CrashingAgent.moves, CrashingAgent.limit = 0, limit
+    path = tmp_path / "crashed.jsonl"
+    batch = Batch(path, 6, CrashingAgent, CrashingAgent, seed=2, max_plies=200, parallel=3, interval=7)
+    with pytest.raises(Crash):
+        batch.run()
+    resumed = Batch(path, 6, CrashingAgent, CrashingAgent, seed=2, max_plies=200, parallel=3, interval=7)
+    assert resumed.run() == expected
+
+
+def test_torn_line_is_ignored(tmp_path):
+    path = tmp_path / "batch.jsonl"
+    results = Batch(path, 3, seed=3, max_plies=50, interval=5).run()
+    entries = read_journal(path)
+    with open(path, "a") as file:
+        file.write('{"type": "start", "ga')
+    assert read_journal(path) == entries
+    assert Batch(path, 3, seed=3, max_plies=50).run() == results
+    # resuming compacted the journal to one result per game
+    assert [entry["type"] for entry in read_journal(path)] == ["result"] * 3
+
+
+def test_compact():
+    entries = [
+        {"type": "start", "game": 0, "seed": 1},
+        {"type": "start", "game": 1, "seed": 2},
+        {"type": "moves", "game": 0, "plies": 1, "moves": [[0, 6, 0, 5]], "rngs": {}, "board": "a"},
+        {"type": "moves", "game": 0, "plies": 2, "moves": [[0, 3, 0, 4]], "rngs": {}, "board": "b"},
+        {"type": "result", "game": 1, "winner": None, "plies": 3, "reason": "max plies"},
+    ]
+    start, moves, result = compact(entries)
+    assert start == entries[0]
+    assert moves["moves"] == [[0, 6, 0, 5], [0, 3, 0, 4]] and moves["board"] == "b"
+    assert result == entries[4]
+    assert json.dumps(compact(entries)) == json.dumps(compact(compact(entries)))
@@ -0,0 +1,57 @@
+import subprocess
+import sys
+
+from typer.testing import CliRunner
+
+from strategy.cli import app, entrant_names, import_times
+
+runner = CliRunner()
+
+
+def test_simulate_and_replay(tmp_path):
+    path = tmp_path / "games.strg"
+    result = runner.invoke(app, ["simulate", "--games", "3", "--max-plies", "50", "--records", str(path)])
+    assert result.exit_code == 0
+    assert result.output.startswith("3 games: red ")
+    result = runner.invoke(app, ["replay", str(path), "--game", "2", "--plies", "10"])
+    assert result.exit_code == 0
+    result = runner.invoke(app, ["replay", str(path), "--game", "3"])
+    assert result.exit_code != 0
+
+
+def test_simulate_with_checkpoint(tmp_path):
+    arguments = ["simulate", "--games", "2", "--max-plies", "30", "--checkpoint", str(tmp_path / "batch.jsonl")]
+    first = runner.invoke(app, arguments)
+    assert first.exit_code == 0
+    assert runner.invoke(app, arguments).output.split(";")[0] == first.output.split(";")[0]
+
+
+def test_unknown_agent_and_target():
+    assert runner.invoke(app, ["simulate", "--red", "nobody"]).exit_code != 0
+    assert runner.invoke(app, ["bench", "nothing"]).exit_code != 0
+
+
+def test_tournament_of_an_agent_against_itself():
+    assert entrant_names(["random", "search", "random", "random"]) == ["random", "search", "random#2", "random#3"]
+    result = runner.invoke(app, ["tournament", "random", "random", "--games", "2", "--max-plies", "20"])
+    assert result.exit_code == 0
+    assert "random#2" in result.output
+    result = runner.invoke(app, ["tournament", "random"])
+    assert result.exit_code != 0
+    assert "at least two agents" in result.output
+
+
+def test_simulate_does_not_import_rich():
+    code = (
+        "import sys; from strategy.cli import app; "
+        "app(['simulate', '--games', '1', '--max-plies', '20'], standalone_mode=False); "
+        "print(sorted(module for module in ('rich', 'numpy', 'pygame') if module in sys.modules))"
+    )
+    process = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert process.stdout.splitlines()[-1] == "[]"
+
+
+def test_import_times():
+    times = import_times(("strategy.colour", "no.such.module"), repeat=1)
+    assert list(times) == ["strategy.colour"]
+    assert 0 < times["strategy.colour"] < 10
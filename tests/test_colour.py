@@ -5,3 +5,8 @@ def test_colour():
     c = Colour.RED
     assert f"{c}" == "red"
     assert f"{c!r}" == "<Colour.RED: 2>"
+
+
+def test_colour_opponent():
+    assert Colour.RED.opponent == Colour.BLUE
+    assert Colour.BLUE.opponent == Colour.RED
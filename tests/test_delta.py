@@ -0,0 +1,105 @@
+import pytest
+
+from strategy.board import Board
+from strategy.colour import Colour
+from strategy.delta import (
+    BoardMirror,
+    DeltaEncoder,
+    MoveUpdate,
+    Snapshot,
+    board_from_symbols,
+    board_symbols,
+    cell_symbol,
+)
+from strategy.exceptions import SequenceGapError
+from strategy.game import EMPTY, LAKE, Empty, Lake
+from strategy.pieces import MARSHAL, SCOUT, SPY, Piece
+
+
+@pytest.fixture
+def board():
+    board = Board()
+    board[0, 9] = Piece(SCOUT, 2, Colour.RED, x=0, y=9)
+    board[0, 0] = Piece(SPY, 1, Colour.BLUE, x=0, y=0)
+    board[5, 5] = Piece(MARSHAL, 10, Colour.BLUE, x=5, y=5)
+    return board
+
+
+def test_cell_symbol():
+    assert cell_symbol(Piece(MARSHAL, 10, Colour.RED)) == "M"
+    assert cell_symbol(Piece(MARSHAL, 10, Colour.BLUE)) == "m"
+    assert cell_symbol(Piece(MARSHAL, 10, Colour.BLUE), Colour.RED) == "?"
+    marshal = Piece(MARSHAL, 10, Colour.BLUE)
+    marshal.revealed = True
+    assert cell_symbol(marshal, Colour.RED) == "m"
+    assert cell_symbol(Lake(LAKE, x=2, y=4)) == "~"
+    assert cell_symbol(Empty(EMPTY, x=0, y=0)) == "."
+
+
+def test_board_symbols(board):
+    symbols = board_symbols(board)
+    assert len(symbols) == 100
+    assert symbols[0] == "y"
+    assert symbols[90] == "U"
+    assert symbols[42] == "~"
+    assert board_symbols(board, Colour.RED)[0] == "?"
+
+
+def test_move_update_encode_decode(board):
+    encoder = DeltaEncoder(board)
+    update = encoder.update(board.move((0, 9), (0, 0)))
+    assert update.combat == ("U", "y")
+    assert update.changes == ((90, "."), (0, "U"))
+    assert update.encode() == "1 90 0 Uy 90.,0U"
+    assert MoveUpdate.decode(update.encode()) == update
+    update = encoder.update(board.move((5, 5), (5, 6)))
+    assert update.encode() == "2 55 65 - 55.,65m"
+    assert MoveUpdate.decode(update.encode()) == update
+
+
+def test_move_update_hides_the_opponent(board):
+    encoder = DeltaEncoder(board, Colour.RED)
+    assert encoder.update(board.move((5, 5), (5, 6))).changes == ((55, "."), (65, "?"))
+    assert encoder.update(board.move((0, 9), (0, 0))).changes == ((90, "."), (0, "U"))
+
+
+def test_snapshot(board):
+    encoder = DeltaEncoder(board, interval=2)
+    snapshot = encoder.snapshot()
+    assert Snapshot.decode(snapshot.encode()) == snapshot
+    encoder.update(board.move((5, 5), (5, 6)))
+    assert not encoder.snapshot_due
+    encoder.update(board.move((0, 9), (0, 8)))
+    assert encoder.snapshot_due
+
+
+def test_board_mirror(board):
+    encoder = DeltaEncoder(board)
+    mirror = BoardMirror()
+    mirror.resync(encoder.snapshot())
+    assert str(mirror) == board_symbols(board)
+    first = encoder.update(board.move((5, 5), (5, 6)))
+    mirror.apply(first)
+    mirror.apply(first)  # a duplicate is ignored
+    assert mirror[5, 6] == "m"
+    assert str(mirror) == board_symbols(board)
+
+    encoder.update(board.move((0, 9), (0, 8)))  # lost
+    third = encoder.update(board.move((5, 6), (5, 7)))
+    with pytest.raises(SequenceGapError):
+        mirror.apply(third)
+    assert not mirror.in_sync
+    with pytest.raises(SequenceGapError):
+        mirror.apply(encoder.update(board.move((0, 8), (0, 0))))
+    mirror.resync(encoder.snapshot())
+    assert mirror.in_sync
+    assert mirror.last_combat is None
+    mirror.apply(encoder.update(board.move((5, 7), (4, 7))))
+    assert str(mirror) == board_symbols(board)
+
+
+def test_board_from_symbols(board):
+    copy = board_from_symbols(board_symbols(board))
+    assert board_symbols(copy) == board_symbols(board)
+    assert copy[5, 5].power == 10
+    assert copy[5, 5].colour == Colour.BLUE
@@ -0,0 +1,84 @@
+import random
+
+import pytest
+
+from strategy.board import Board
+from strategy.colour import Colour
+from strategy.distance import CROWDED, STATIC, UNREACHABLE, DistanceMaps, bfs
+from strategy.game import EMPTY, Empty
+from strategy.pieces import BOMB, FLAG, SCOUT, Piece
+from strategy.runner import random_board
+
+
+def _fresh(maps) -> dict[int, list[int]]:
+    return {root: bfs(root, maps.occupied) for root in list(maps.pieces) + list(maps.targets)}
+
+
+def _board(rng: random.Random, pieces: int) -> Board:
+    """Return a random board with the flag and `pieces` - 1 other pieces per colour."""
+    board = random_board(rng)
+    for own in (board.red(), board.blue()):
+        others = [piece for piece in own if piece.name != FLAG]
+        for piece in rng.sample(others, len(own) - pieces):
+            board[piece.x, piece.y] = Empty(EMPTY, piece.x, piece.y)
+    return board
+
+
+def test_static_distances():
+    assert STATIC[0, 0] == 0
+    assert STATIC[0, 99] == 18
+    # around the left lake, from above it to below it
+    assert STATIC[32, 62] == 5
+    assert STATIC[42, 0] == UNREACHABLE
+
+
+def test_bfs_reaches_but_does_not_pass_pieces():
+    occupied = [False] * 100
+    occupied[1] = True
+    distances = bfs(0, occupied)
+    assert distances[1] == 1
+    assert distances[2] == 4
+
+
+@pytest.mark.parametrize("seed, pieces", [(seed, pieces) for seed in range(3) for pieces in (40, 12, 6)])
+def test_incremental_maps_equal_fresh_maps(seed, pieces):
+    rng = random.Random(seed)
+    board = _board(rng, pieces)
+    maps = DistanceMaps(board, targets=((0, 0), (9, 9)))
+    colour = Colour.RED
+    for _ in range(200):
+        moves = board.moves(colour)
+        if not moves:
+            break
+        board.move(*rng.choice(moves))
+        assert {**maps.pieces, **maps.targets} == _fresh(maps)
+        colour = colour.opponent
+    assert set(maps.pieces) == {
+        piece.y * 10 + piece.x for piece in board.red() + board.blue() if piece.name not in (BOMB, FLAG)
+    }
+
+
+def test_maps_of_one_colour_and_targets():
+    board = Board()
+    board[0, 9] = Piece(SCOUT, 2, Colour.RED, x=0, y=9)
+    board[0, 0] = Piece(SCOUT, 2, Colour.BLUE, x=0, y=0)
+    maps = DistanceMaps(board, Colour.RED, targets=((9, 0),))
+    assert list(maps.pieces) == [90]
+    assert maps.distance((0, 9), (0, 0)) == 9
+    assert maps.map((9, 0))[9, 0] == 18
+    board.move((0, 9), (0, 6))
+    assert maps.distance((0, 6), (0, 0)) == 6
+    assert maps.distance((9, 0), (0, 6)) == 15
+    maps.remove_target((9, 0))
+    assert not maps.targets
+    maps.close()
+    assert board.listeners == []
+
+
+def test_crowded_boards_are_computed_again():
+    rng = random.Random(1)
+    for pieces, crowded in ((40, True), (CROWDED // 4, False)):
+        board = _board(rng, pieces)
+        maps = DistanceMaps(board)
+        board.move(*board.moves(Colour.RED)[0])
+        assert (maps.recomputations, maps.repairs) == ((1, 0) if crowded else (0, 1))
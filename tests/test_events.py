@@ -0,0 +1,90 @@
+import json
+import random
+from unittest.mock import patch
+
+import pytest
+
+from strategy.agents import RandomAgent
+from strategy.colour import Colour
+from strategy.events import CombatEvent, EventStream, GameOverEvent, MoveEvent, RevealEvent, SetupEvent
+from strategy.records import read_records
+from strategy.runner import Game, play_game
+from strategy.sinks import BufferedSink, JsonlSink, RecordSink, RingBuffer
+
+
+def _game(seed, events, max_plies=200) -> Game:
+    rng = random.Random(seed)
+    agents = {colour: RandomAgent(random.Random(rng.getrandbits(32))) for colour in Colour}
+    return Game(agents, max_plies=max_plies, rng=rng, events=events)
+
+
+def test_events_of_a_game():
+    buffer = RingBuffer()
+    game = _game(1, EventStream(buffer))
+    game.run()
+    events = list(buffer.events)
+    assert events[0] == SetupEvent(game.setup)
+    assert events[-1] == GameOverEvent(game.result.winner, game.plies, game.result.reason)
+    moves = [event for event in events if isinstance(event, MoveEvent)]
+    assert [(event.source, event.dest) for event in moves] == game.moves
+    assert [event.ply for event in moves] == list(range(game.plies))
+    combats = [event for event in events if isinstance(event, CombatEvent)]
+    reveals = [event for event in events if isinstance(event, RevealEvent)]
+    assert combats and reveals
+    # a piece is revealed once at most
+    assert len({(event.colour, event.ply, event.square) for event in reveals}) == len(reveals)
+    assert len(reveals) <= 2 * len(combats)
+
+
+def test_ring_buffer_keeps_the_last_events():
+    buffer = RingBuffer(capacity=5)
+    _game(2, EventStream(buffer), max_plies=20).run()
+    assert len(buffer.events) == 5
+    assert isinstance(buffer.events[-1], GameOverEvent)
+
+
+def test_no_events_without_sinks():
+    stream = EventStream()
+    with patch("strategy.runner.MoveEvent", side_effect=AssertionError), patch(
+        "strategy.runner.SetupEvent", side_effect=AssertionError
+    ):
+        _game(3, stream, max_plies=50).run()
+        play_game({colour: RandomAgent(random.Random(4)) for colour in Colour}, max_plies=10, events=stream)
+
+
+def test_jsonl_and_record_sinks(tmp_path):
+    jsonl, records = JsonlSink(tmp_path / "events.jsonl", batch_size=16), RecordSink(tmp_path / "games.strg")
+    stream = EventStream(jsonl, records)
+    games = []
+    for seed in (5, 6):
+        games.append(_game(seed, stream, max_plies=60))
+        games[-1].run()
+    stream.close()
+    assert jsonl.batches > 1
+    lines = [json.loads(line) for line in (tmp_path / "events.jsonl").read_text().splitlines()]
+    assert lines[0] == {"event": "setup", "setup": games[0].setup}
+    assert lines[1]["event"] == "move" and lines[1]["colour"] == "RED"
+    assert sum(line["event"] == "game-over" for line in lines) == 2
+    assert records.records == 2
+    recorded = list(read_records(tmp_path / "games.strg"))
+    assert [record.moves for record in recorded] == [game.moves for game in games]
+    assert [record.winner for record in recorded] == [game.result.winner for game in games]
+
+
+def test_buffered_sink_needs_write():
+    class Silent(BufferedSink):
+        """A sink that forgot to implement `write`."""
+
+    with pytest.raises(TypeError):
+        Silent()
+
+
+def test_subscribe():
+    stream, buffer = EventStream(), RingBuffer()
+    assert not stream.active
+    stream.subscribe(buffer)
+    assert stream.active
+    stream.emit(SetupEvent("." * 100))
+    stream.unsubscribe(buffer)
+    assert not stream.active
+    assert len(buffer.events) == 1
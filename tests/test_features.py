@@ -0,0 +1,39 @@
+import numpy as np
+
+from strategy.board import Board
+from strategy.colour import Colour
+from strategy.features import LAKES, MOVED, OPPONENT, OWN, PLANES, UNKNOWN, decode_move, encode, encode_move
+from strategy.pieces import MARSHAL, RANKS, SCOUT, Piece
+
+
+def test_encode():
+    board = Board()
+    board[0, 9] = Piece(SCOUT, 2, Colour.RED, x=0, y=9)
+    board[5, 0] = marshal = Piece(MARSHAL, 10, Colour.BLUE, x=5, y=0)
+    planes = encode(board, Colour.RED)
+    assert planes.shape == (PLANES, 10, 10)
+    assert planes.dtype == np.uint8
+    assert planes[OWN + RANKS.index(SCOUT), 9, 0] == 1
+    assert planes[UNKNOWN, 0, 5] == 1
+    assert planes[LAKES].sum() == 8
+    assert planes.sum() == 10
+    marshal.revealed = marshal.moved = True
+    planes = encode(board, Colour.RED)
+    assert planes[OPPONENT + RANKS.index(MARSHAL), 0, 5] == 1
+    assert planes[MOVED, 0, 5] == 1
+    assert planes[UNKNOWN].sum() == 0
+
+
+def test_encode_blue_is_flipped():
+    board = Board()
+    board[5, 0] = Piece(MARSHAL, 10, Colour.BLUE, x=5, y=0)
+    planes = encode(board, Colour.BLUE)
+    assert planes[OWN + RANKS.index(MARSHAL), 9, 5] == 1
+
+
+def test_encode_move():
+    move = (3, 6), (3, 5)
+    assert encode_move(move, Colour.RED) == 63 * 100 + 53
+    assert encode_move(move, Colour.BLUE) == 33 * 100 + 43
+    for colour in Colour:
+        assert decode_move(encode_move(move, colour), colour) == move
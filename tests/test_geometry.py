@@ -0,0 +1,135 @@
+import random
+
+import pytest
+
+from strategy.agents import RandomAgent
+from strategy.board import Board
+from strategy.colour import Colour
+from strategy.delta import BoardMirror, DeltaEncoder, MoveUpdate, board_from_symbols, board_symbols
+from strategy.distance import DistanceMaps
+from strategy.exceptions import InvalidGeometryError
+from strategy.features import encode
+from strategy.geometry import CLASSIC, Geometry
+from strategy.mirror import CanonicalPosition, mirror_board
+from strategy.pieces import COUNTS, FLAG, MARSHAL, SCOUT, SPY, Piece
+from strategy.records import GameRecord
+from strategy.repetition import ZOBRIST, position_hash
+from strategy.runner import Game
+from strategy.tablebase import Tablebase
+
+# a 12x12 board with three lakes and 48 pieces per colour
+LARGE = Geometry(
+    12,
+    12,
+    lakes=((2, 5), (2, 6), (5, 5), (6, 6), (9, 5), (9, 6)),
+    pieces=tuple(COUNTS.items()) + ((SCOUT, 4), (SPY, 1), (MARSHAL, 1), (FLAG, 1), (SCOUT, 1)),
+)
+
+
+def test_classic():
+    assert CLASSIC.size == 100
+    assert CLASSIC.columns[-1] == "j"
+    assert len(CLASSIC.squares) == 92
+    assert set(CLASSIC.lakes) == set(Board.LAKES)
+    assert CLASSIC.zone(Colour.RED)[0] == (0, 6)
+    assert len(CLASSIC.piece_set()) == 40
+    north, east, south, west = CLASSIC.rays[2, 3]
+    assert north == ((2, 2), (2, 1), (2, 0))
+    assert south == ()
+    assert len(east) == 7 and west == ((1, 3), (0, 3))
+
+
+def test_invalid_geometries():
+    with pytest.raises(InvalidGeometryError):
+        Geometry(30, 10)
+    with pytest.raises(InvalidGeometryError):
+        Geometry(rows=6)
+    with pytest.raises(InvalidGeometryError):
+        Geometry(lakes=((10, 4),))
+    with pytest.raises(InvalidGeometryError):
+        Geometry(12, 12)
+
+
+def test_large_board():
+    board = Board(LARGE)
+    board.create_random_pieces(Colour.RED, random.Random(1))
+    board.create_random_pieces(Colour.BLUE, random.Random(2))
+    assert len(board) == 144
+    assert len(board.red()) == len(board.blue()) == 48
+    assert board.notation((11, 0)) == "l12"
+    assert board.coordinates("a1") == (0, 11)
+    assert len(board.bottom()) == 48
+    assert board_from_symbols(board_symbols(board), LARGE).red() == board.red()
+    assert "l" in str(board).lower()
+
+
+def test_large_game():
+    rng = random.Random(3)
+    board = Board(LARGE)
+    board.create_random_pieces(Colour.RED, rng)
+    board.create_random_pieces(Colour.BLUE, rng)
+    game = Game({colour: RandomAgent(random.Random(rng.getrandbits(32))) for colour in Colour}, board, 300)
+    result = game.run()
+    assert result.plies <= 300
+    assert all(LARGE.inside(destination) for _, destination in game.moves)
+
+
+def test_scout_stops_at_lakes_and_pieces():
+    board = Board(LARGE)
+    board[2, 9] = Piece(SCOUT, 2, Colour.RED, x=2, y=9)
+    board[4, 9] = Piece(SCOUT, 2, Colour.BLUE, x=4, y=9)
+    piece_range = board.available_range(2, 9)
+    assert piece_range.north == (2, None)  # the lake at (2, 6)
+    assert piece_range.east == (2, board[4, 9])
+    assert piece_range.south == (2, None)
+    assert piece_range.west == (2, None)
+
+
+def test_large_delta_round_trip():
+    rng = random.Random(4)
+    board = Board(LARGE)
+    board.create_random_pieces(Colour.RED, rng)
+    board.create_random_pieces(Colour.BLUE, rng)
+    board[10, 0] = Piece(SCOUT, 2, Colour.RED, x=10, y=0)  # in the far right columns, past the classic width
+    board[11, 0] = Piece(SCOUT, 2, Colour.BLUE, x=11, y=0)
+    encoder = DeltaEncoder(board)
+    mirror = BoardMirror(LARGE)
+    mirror.resync(encoder.snapshot())
+    assert str(mirror) == board_symbols(board)
+    for move in [((10, 0), (11, 0))] + [rng.choice(board.moves(colour)) for colour in (Colour.BLUE, Colour.RED)]:
+        update = MoveUpdate.decode(encoder.update(board.move(*move)).encode(), LARGE)
+        assert (update.source, update.dest) == move
+        mirror.apply(update)
+    assert str(mirror) == board_symbols(board)
+    assert mirror[11, 0] == board_symbols(board)[11]
+    with pytest.raises(InvalidGeometryError):
+        BoardMirror().resync(encoder.snapshot())  # 144 cells do not fit a classic mirror
+
+
+def test_large_mirrored_hash():
+    board = Board(LARGE)
+    board[11, 3] = Piece(SCOUT, 2, Colour.RED, x=11, y=3)
+    image = Board(LARGE)
+    image[0, 3] = Piece(SCOUT, 2, Colour.RED, x=0, y=3)
+    assert position_hash(board, mirrored=True) == position_hash(image)
+    assert all(x >= 0 for x, *_ in ZOBRIST)
+
+
+def test_classic_only_modules():
+    rng = random.Random(5)
+    board = Board(LARGE)
+    board.create_random_pieces(Colour.RED, rng)
+    board.create_random_pieces(Colour.BLUE, rng)
+    game = Game({colour: RandomAgent(random.Random(rng.getrandbits(32))) for colour in Colour}, board, 10)
+    game.run()
+    table = Tablebase([MARSHAL], [SCOUT], (0, 9), (9, 0))
+    for function in (
+        lambda: encode(board, Colour.RED),
+        lambda: DistanceMaps(board),
+        lambda: mirror_board(board),
+        lambda: CanonicalPosition(board),
+        lambda: GameRecord.from_game(game),
+        lambda: table.index(board, Colour.RED),
+    ):
+        with pytest.raises(InvalidGeometryError):
+            function()
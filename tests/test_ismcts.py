@@ -0,0 +1,66 @@
+import random
+
+from strategy.board import Board
+from strategy.colour import Colour
+from strategy.ismcts import ISMCTSAgent, SearchStats, _rollout
+from strategy.pieces import FLAG, MARSHAL, RANKS, SCOUT, Piece
+from strategy.view import BoardView
+
+
+def _random_board() -> Board:
+    board = Board()
+    board.create_random_pieces(Colour.RED)
+    board.create_random_pieces(Colour.BLUE)
+    return board
+
+
+def test_search_stats():
+    assert SearchStats(100, 2.0).playouts_per_second == 50
+    assert SearchStats().playouts_per_second == 0
+
+
+def test_rollout_does_not_change_the_board():
+    board = _random_board()
+    before = [(piece.x, piece.y) for piece in board.red()]
+    value = _rollout(board.copy(), Colour.RED, Colour.RED, 10, random.Random(1))
+    assert 0 <= value <= 1
+    assert [(piece.x, piece.y) for piece in board.red()] == before
+
+
+def test_ismcts_agent():
+    board = _random_board()
+    agent = ISMCTSAgent(budget=0.2, seed=1)
+    view = BoardView(board, Colour.RED)
+    agent.start(view)
+    move = agent.select_move(view, Colour.RED)
+    assert move in board.moves(Colour.RED)
+    assert agent.stats.playouts > 0
+    agent.observe(board.move(*move))
+    agent.observe(board.move(*board.moves(Colour.BLUE)[0]))
+    assert agent.select_move(view, Colour.RED) in board.moves(Colour.RED)
+
+
+def test_ismcts_agent_takes_the_flag():
+    board = Board()
+    board[0, 0] = Piece(FLAG, 0, Colour.BLUE, x=0, y=0)
+    board[9, 0] = Piece(SCOUT, 2, Colour.BLUE, x=9, y=0)
+    board[0, 1] = Piece(MARSHAL, 10, Colour.RED, x=0, y=1)
+    board[9, 9] = Piece(FLAG, 0, Colour.RED, x=9, y=9)
+    agent = ISMCTSAgent(budget=0.2, seed=2)
+    view = BoardView(board, Colour.RED)
+    agent.start(view)
+    agent.tracker.remaining[:] = 0
+    agent.tracker.remaining[[RANKS.index(FLAG), RANKS.index(SCOUT)]] = 1
+    agent.tracker.normalise()
+    assert agent.select_move(view, Colour.RED) == ((0, 1), (0, 0))
+
+
+def test_ismcts_agent_root_parallel():
+    board = _random_board()
+    agent = ISMCTSAgent(budget=0.2, workers=2, seed=3)
+    try:
+        assert agent.select_move(BoardView(board, Colour.BLUE), Colour.BLUE) in board.moves(Colour.BLUE)
+        assert agent.stats.workers == 2
+        assert agent.stats.playouts > 0
+    finally:
+        agent.close()
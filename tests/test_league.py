@@ -0,0 +1,64 @@
+import random
+
+import pytest
+
+from strategy.agents import RandomAgent
+from strategy.league import SPRT, League, Rating
+
+
+def test_rating_update():
+    a, b = Rating(), Rating()
+    assert a.expected(b) == pytest.approx(0.5)
+    winner, loser = a.update(b, 1.0), b.update(a, 0.0)
+    assert winner.rating > 1500 > loser.rating
+    assert winner.deviation < 350
+    assert winner.games == 1
+    assert winner.expected(loser) > 0.5
+
+
+def test_sprt_decides():
+    rng = random.Random(1)
+    strong = SPRT()
+    while strong.decision is None:
+        strong.add(1.0 if rng.random() < 0.7 else 0.0)
+    assert strong.decision == "H1"
+    assert strong.games < 200
+    equal = SPRT(elo0=0, elo1=50)
+    while equal.decision is None:
+        equal.add(rng.choice([0.0, 0.5, 1.0]))
+    assert equal.decision == "H0"
+
+
+def test_sprt_undecided():
+    sprt = SPRT()
+    assert sprt.llr == 0
+    assert sprt.decision is None
+
+
+def league(seed):
+    return League({"one": RandomAgent, "two": RandomAgent, "three": RandomAgent}, seed=seed, max_plies=20)
+
+
+def test_league_is_deterministic():
+    one, two = league(4), league(4)
+    assert one.run(6) == two.run(6)
+    assert sum(one.games.values()) == 6
+    assert sum(rating.games for rating in one.ratings.values()) == 12
+
+
+def test_league_pairs_uncertain_agents():
+    one = league(1)
+    one.ratings["one"] = Rating(1500, 50)
+    assert "one" not in one.next_pairing()
+
+
+def test_league_match():
+    result = league(2).match("one", "two", SPRT(elo0=0, elo1=400), max_games=30)
+    assert result.games <= 30
+    assert result.wins + result.draws + result.losses == result.games
+    assert result.decision in (None, "H0", "H1")
+
+
+def test_league_needs_two_agents():
+    with pytest.raises(ValueError):
+        League({"one": RandomAgent})
@@ -1,4 +1,4 @@
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 import pytest
 
@@ -25,6 +25,18 @@ def test_main_turn_blue(capsys):
         assert "Blue wins the game!" in captured.out
 
 
+def test_main_turn_no_allowed_moves(capsys):
+    board = Board()
+    board.create_random_pieces(Colour.RED)
+    board.create_random_pieces(Colour.BLUE)
+    repetition = Mock(allowed=Mock(return_value=False))
+    with pytest.raises(SystemExit):
+        turn(board, Colour.RED, repetition)
+    captured = capsys.readouterr()
+    assert "Blue wins the game: red cannot move!" in captured.out
+    repetition.update.assert_not_called()
+
+
 @patch("strategy.main.turn", side_effect=SystemExit)
 def test_main_main(turn, capsys):
     with pytest.raises(SystemExit):
@@ -0,0 +1,91 @@
+import random
+
+from strategy.board import Board
+from strategy.colour import Colour
+from strategy.delta import board_symbols
+from strategy.mirror import (
+    CanonicalPosition,
+    PositionCache,
+    canonical_symbols,
+    mirror_board,
+    mirror_move,
+    mirror_square,
+    mirror_symbols,
+)
+from strategy.pieces import MARSHAL, SCOUT, Piece
+from strategy.runner import random_board
+
+
+def test_mirror_square_and_move():
+    assert mirror_square((0, 3)) == (9, 3)
+    assert mirror_move(((2, 6), (2, 5))) == ((7, 6), (7, 5))
+    assert {mirror_square(lake) for lake in Board.LEFT_LAKE} == set(Board.RIGHT_LAKE)
+
+
+def test_mirror_symbols():
+    board = random_board(random.Random(1))
+    symbols = board_symbols(board)
+    assert mirror_symbols(mirror_symbols(symbols)) == symbols
+    assert mirror_symbols(symbols) == board_symbols(mirror_board(board))
+    canonical, mirrored = canonical_symbols(symbols)
+    assert canonical == canonical_symbols(mirror_symbols(symbols))[0]
+    assert canonical == (mirror_symbols(symbols) if mirrored else symbols)
+    setup = symbols[60:]
+    assert canonical_symbols(setup)[0] == canonical_symbols(mirror_symbols(setup))[0]
+
+
+def test_canonical_position_is_incremental():
+    board = random_board(random.Random(2))
+    mirrored = mirror_board(board)
+    position, image = CanonicalPosition(board), CanonicalPosition(mirrored)
+    assert position.key == image.key
+    assert position.mirrored != image.mirrored
+    rng = random.Random(3)
+    colour = Colour.RED
+    for _ in range(30):
+        move = rng.choice(board.moves(colour))
+        position.update(board.move(*move))
+        image.update(mirrored.move(*mirror_move(move)))
+        assert position.key == image.key == CanonicalPosition(board).key
+        assert position.canonical_move(move) == image.canonical_move(mirror_move(move))
+        colour = colour.opponent
+
+
+def test_position_cache():
+    board = Board()
+    board[1, 9] = Piece(MARSHAL, 10, Colour.RED, x=1, y=9)
+    board[3, 0] = Piece(SCOUT, 2, Colour.BLUE, x=3, y=0)
+    position = CanonicalPosition(board)
+    cache = PositionCache(maxsize=1)
+    assert cache.get(position) is None
+    cache.put(position, position.canonical_move(((1, 9), (1, 8))))
+    image = CanonicalPosition(mirror_board(board))
+    assert image.canonical_move(cache.get(image)) == ((8, 9), (8, 8))
+    assert (cache.hits, cache.misses) == (1, 1)
+    cache.put(CanonicalPosition(Board()), None)
+    assert len(cache) == 1
+    assert cache.get(position, "gone") == "gone"
+
+
+def test_canonical_view_position():
+    board = random_board(random.Random(4))
+    position = CanonicalPosition(board, Colour.RED)
+    rng = random.Random(5)
+    colour = Colour.RED
+    for _ in range(200):
+        position.update(board.move(*rng.choice(board.moves(colour))))
+        colour = colour.opponent
+        fresh = CanonicalPosition(board, Colour.RED)
+        assert (position.hash, position.mirror_hash) == (fresh.hash, fresh.mirror_hash)
+
+
+def test_canonical_view_position_hides_ranks():
+    board = random_board(random.Random(6))
+    red, blue = CanonicalPosition(board, Colour.RED), CanonicalPosition(board, Colour.BLUE)
+    full = CanonicalPosition(board)
+    first = next(piece for piece in board.blue() if piece.name == MARSHAL)
+    second = next(piece for piece in board.blue() if piece.name == SCOUT)
+    first.name, second.name = second.name, first.name
+    assert CanonicalPosition(board, Colour.RED).key == red.key
+    assert CanonicalPosition(board, Colour.BLUE).key != blue.key
+    assert CanonicalPosition(board).key != full.key
@@ -0,0 +1,58 @@
+import io
+import random
+
+import pytest
+
+from strategy.agents import RandomAgent
+from strategy.colour import Colour
+from strategy.delta import board_symbols
+from strategy.exceptions import InvalidRecordError
+from strategy.records import GameRecord, RecordWriter, read_records, write_records
+from strategy.runner import Game
+
+
+@pytest.fixture
+def record():
+    game = Game({colour: RandomAgent(random.Random(1)) for colour in Colour}, max_plies=60, rng=random.Random(2))
+    game.run()
+    return GameRecord.from_game(game), board_symbols(game.board)
+
+
+def test_record_replay(record):
+    record, final = record
+    assert record.plies == 60 or record.winner is not None
+    board = record.board()
+    results = list(record.replay(board))
+    assert len(results) == record.plies
+    assert board_symbols(board) == final
+
+
+def test_record_encode_decode(record):
+    record, _ = record
+    data = record.encode()
+    assert len(data) == 103 + 2 * record.plies
+    assert GameRecord.decode(data) == record
+    with pytest.raises(InvalidRecordError):
+        GameRecord.decode(data[:-1])
+
+
+def test_write_read_records(tmp_path, record):
+    record, _ = record
+    path = tmp_path / "games.bin"
+    assert write_records(path, [record, GameRecord(record.setup, [], Colour.BLUE)]) == 2
+    records = list(read_records(path))
+    assert records[0] == record
+    assert records[1].winner == Colour.BLUE
+    assert records[1].plies == 0
+
+
+def test_read_records_invalid(tmp_path, record):
+    path = tmp_path / "games.bin"
+    path.write_bytes(b"nope")
+    with pytest.raises(InvalidRecordError):
+        list(read_records(path))
+    file = io.BytesIO()
+    RecordWriter(file).write(record[0])
+    path.write_bytes(file.getvalue()[:50])
+    with pytest.raises(InvalidRecordError):
+        list(read_records(path))
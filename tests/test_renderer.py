@@ -0,0 +1,61 @@
+import random
+
+import pygame
+import pytest
+
+from strategy.agents import RandomAgent
+from strategy.colour import Colour
+from strategy.delta import DeltaEncoder
+from strategy.game import Empty
+from strategy.renderer import CELL, DeltaFeed, Renderer, play, watch
+from strategy.runner import Game
+
+
+@pytest.fixture
+def display(monkeypatch):
+    monkeypatch.setenv("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    yield
+    pygame.quit()
+
+
+def _game(seed, max_plies=100) -> Game:
+    rng = random.Random(seed)
+    agents = {colour: RandomAgent(random.Random(rng.getrandbits(32))) for colour in Colour}
+    return Game(agents, max_plies=max_plies, rng=rng)
+
+
+def test_feed():
+    feed = DeltaFeed()
+    game = _game(1, max_plies=10)
+    play(game, feed)
+    items = feed.drain()
+    assert len(items) == 1 + game.plies + 1
+    assert items[-1] is None
+    assert feed.drain() == []
+
+
+def test_renderer_draws_dirty_cells_and_drops_frames(display):
+    surface = pygame.Surface((10 * CELL, 10 * CELL))
+    renderer = Renderer(surface)
+    game = _game(2)
+    encoder = DeltaEncoder(game.board)
+    assert len(renderer.frame([encoder.snapshot()])) == 100
+    results = [game.step() for _ in range(5)]
+    rects = renderer.frame([encoder.update(result) for result in results])
+    dirty = {square for result in results for square in (result.source, result.dest)}
+    assert len(rects) == len(dirty) <= 10
+    assert renderer.stats.updates == 5 and renderer.stats.dropped == 4
+    assert renderer.frame([]) == []
+    # the surface shows the final state: an empty source is drawn as grass
+    x, y = results[-1].source
+    if isinstance(game.board[x, y], Empty):
+        assert surface.get_at((x * CELL + CELL // 2, y * CELL + 2))[:3] == (92, 148, 72)
+
+
+def test_watch(display):
+    game = _game(3)
+    stats = watch(game, fps=1000, cell=8, close=True)
+    assert game.over
+    assert stats.updates == game.plies
+    assert 0 < stats.frames <= game.plies + 1
@@ -0,0 +1,94 @@
+import random
+
+import pytest
+
+from strategy.agents import RandomAgent
+from strategy.board import Board
+from strategy.colour import Colour
+from strategy.exceptions import TwoSquareRuleError
+from strategy.pieces import FLAG, MARSHAL, SCOUT, Piece
+from strategy.repetition import NO_PROGRESS, REPETITION, Repetition, position_hash
+from strategy.runner import Game, GameResult
+
+
+def board():
+    board = Board()
+    board[0, 9] = Piece(FLAG, 0, Colour.RED, x=0, y=9)
+    board[4, 8] = Piece(MARSHAL, 10, Colour.RED, x=4, y=8)
+    board[0, 0] = Piece(FLAG, 0, Colour.BLUE, x=0, y=0)
+    board[4, 1] = Piece(MARSHAL, 10, Colour.BLUE, x=4, y=1)
+    board[9, 1] = Piece(SCOUT, 2, Colour.BLUE, x=9, y=1)
+    return board
+
+
+def test_position_hash_is_incremental():
+    b = board()
+    repetition = Repetition(b)
+    for move in [((4, 8), (4, 7)), ((9, 1), (9, 8)), ((4, 7), (5, 7)), ((9, 8), (9, 9))]:
+        repetition.update(b.move(*move))
+        assert repetition.hash == position_hash(b)
+    repetition.update(b.move((4, 1), (4, 2)))
+    b[5, 2] = Piece(SCOUT, 2, Colour.RED, x=5, y=2)
+    repetition.hash = position_hash(b)
+    repetition.update(b.move((5, 2), (4, 2)))  # lost
+    assert repetition.hash == position_hash(b)
+
+
+def test_two_square_rule():
+    b = board()
+    repetition = Repetition(b, two_square=3, repetitions=100)
+    up, down = ((4, 8), (4, 7)), ((4, 7), (4, 8))
+    away, back = ((4, 1), (5, 1)), ((5, 1), (4, 1))
+    for move, reply in [(up, away), (down, back), (up, away)]:
+        assert repetition.allowed(move, Colour.RED)
+        repetition.update(b.move(*move))
+        repetition.update(b.move(*reply))
+    assert not repetition.allowed(down, Colour.RED)
+    assert repetition.allowed(((4, 7), (3, 7)), Colour.RED)
+    assert repetition.allowed(((0, 9), (1, 9)), Colour.RED)
+
+
+def test_two_square_rule_other_piece_resets():
+    b = board()
+    b[8, 8] = Piece(SCOUT, 2, Colour.RED, x=8, y=8)
+    repetition = Repetition(b, two_square=2, repetitions=100)
+    repetition.update(b.move((4, 8), (4, 7)))
+    repetition.update(b.move((8, 8), (8, 7)))
+    repetition.update(b.move((4, 7), (4, 8)))
+    assert repetition.allowed(((4, 8), (4, 7)), Colour.RED)
+
+
+def test_repeated_position_is_a_draw():
+    b = board()
+    repetition = Repetition(b, two_square=100, repetitions=3)
+    moves = [((4, 8), (4, 7)), ((4, 1), (4, 2)), ((4, 7), (4, 8)), ((4, 2), (4, 1))]
+    for move in moves * 2:
+        assert repetition.draw is None
+        repetition.update(b.move(*move))
+    assert repetition.draw == REPETITION
+
+
+def test_no_capture_is_a_draw():
+    b = board()
+    repetition = Repetition(b, no_capture=3)
+    repetition.update(b.move((4, 8), (4, 7)))
+    repetition.update(b.move((4, 1), (4, 2)))
+    assert repetition.update(b.move((4, 7), (5, 7))) == NO_PROGRESS
+
+
+def test_game_two_square_rule():
+    b = board()
+    agents = {colour: RandomAgent(random.Random(1)) for colour in Colour}
+    game = Game(agents, b, repetition=Repetition(b, two_square=1, repetitions=100))
+    game.play(((4, 8), (4, 7)))
+    game.play(((4, 1), (4, 2)))
+    assert ((4, 7), (4, 8)) not in game.view.moves()
+    with pytest.raises(TwoSquareRuleError):
+        game.play(((4, 7), (4, 8)))
+
+
+def test_game_draw_without_progress():
+    b = board()
+    agents = {colour: RandomAgent(random.Random(1)) for colour in Colour}
+    result = Game(agents, b, repetition=Repetition(b, no_capture=1)).run()
+    assert result == GameResult(None, 1, NO_PROGRESS)
@@ -0,0 +1,70 @@
+import random
+
+import pytest
+
+from strategy.agents import RandomAgent
+from strategy.board import Board
+from strategy.colour import Colour
+from strategy.exceptions import NoPieceError
+from strategy.pieces import FLAG, MARSHAL, Piece
+from strategy.runner import Game, play_game, random_board
+
+
+def agents(seed=0):
+    return {colour: RandomAgent(random.Random(seed + index)) for index, colour in enumerate(Colour)}
+
+
+def test_random_board_is_seeded():
+    assert str(random_board(random.Random(1))) == str(random_board(random.Random(1)))
+    assert len(random_board(random.Random(1)).red()) == 40
+
+
+def test_game_step():
+    game = Game(agents(), rng=random.Random(3))
+    assert game.turn == Colour.RED
+    result = game.step()
+    assert result.piece.colour == Colour.RED
+    assert game.turn == Colour.BLUE
+    assert game.plies == 1
+
+
+def test_game_play_wrong_colour():
+    board = Board()
+    board[0, 9] = Piece(MARSHAL, 10, Colour.RED, x=0, y=9)
+    board[9, 9] = Piece(FLAG, 0, Colour.RED, x=9, y=9)
+    board[0, 0] = Piece(MARSHAL, 10, Colour.BLUE, x=0, y=0)
+    board[9, 0] = Piece(FLAG, 0, Colour.BLUE, x=9, y=0)
+    game = Game(agents(), board)
+    with pytest.raises(NoPieceError):
+        game.play(((0, 0), (0, 1)))
+
+
+def test_game_flag_captured():
+    board = Board()
+    board[0, 1] = Piece(MARSHAL, 10, Colour.RED, x=0, y=1)
+    board[9, 9] = Piece(FLAG, 0, Colour.RED, x=9, y=9)
+    board[5, 0] = Piece(MARSHAL, 10, Colour.BLUE, x=5, y=0)
+    board[0, 0] = Piece(FLAG, 0, Colour.BLUE, x=0, y=0)
+    game = Game(agents(), board)
+    game.play(((0, 1), (0, 0)))
+    assert game.over
+    assert game.result.winner == Colour.RED
+    assert str(game.result) == "red"
+
+
+def test_play_game_max_plies():
+    result = play_game(agents(), max_plies=10, rng=random.Random(5))
+    assert result.plies <= 10
+    if result.plies == 10:
+        assert result.winner is None
+        assert str(result) == "draw"
+
+
+def test_play_game_is_deterministic():
+    assert play_game(agents(), max_plies=200, rng=random.Random(7)) == play_game(
+        agents(), max_plies=200, rng=random.Random(7)
+    )
+
+
+def test_play_game_ponder():
+    assert play_game(agents(), max_plies=20, rng=random.Random(5), ponder=True).plies == 20
@@ -0,0 +1,148 @@
+import random
+import threading
+import time
+
+import numpy as np
+
+from strategy.agents import RandomAgent
+from strategy.board import Board, Move
+from strategy.colour import Colour
+from strategy.pieces import BOMB, FLAG, MARSHAL, MINER, RANKS, SCOUT, SERGEANT, Piece
+from strategy.runner import Game
+from strategy.search import SearchAgent, SearchInfo, _order, _outcomes
+from strategy.view import BoardView
+
+
+def _random_board() -> Board:
+    board = Board()
+    board.create_random_pieces(Colour.RED)
+    board.create_random_pieces(Colour.BLUE)
+    return board
+
+
+def test_search_info():
+    assert SearchInfo(nodes=100, seconds=0.5).nodes_per_second == 200
+    assert SearchInfo().nodes_per_second == 0
+
+
+def test_order_attacks_first():
+    board = Board()
+    board[4, 8] = Piece(MARSHAL, 10, Colour.RED, x=4, y=8)
+    board[4, 7] = Piece(SERGEANT, 4, Colour.BLUE, x=4, y=7)
+    board[5, 8] = Piece(BOMB, 11, Colour.BLUE, x=5, y=8)
+    moves = _order(board, board.moves(Colour.RED), None)
+    assert moves[0] == ((4, 8), (4, 7))
+    assert moves[-1] == ((4, 8), (5, 8))
+    assert _order(board, board.moves(Colour.RED), ((4, 8), (3, 8)))[0] == ((4, 8), (3, 8))
+
+
+def test_outcomes():
+    miner = Piece(MINER, 3, Colour.RED)
+    hidden = Piece(SCOUT, 2, Colour.BLUE)
+    hidden.belief = np.zeros(len(RANKS))
+    hidden.belief[[RANKS.index(BOMB), RANKS.index(SCOUT), RANKS.index(MARSHAL)]] = [0.5, 0.25, 0.25]
+    outcomes = sorted(_outcomes(miner, hidden, 1))
+    assert [(p, name) for p, _, name in outcomes] == [(0.25, MARSHAL), (0.75, BOMB)]
+    outcomes = _outcomes(hidden, miner, 3)
+    assert [(p, name) for p, _, name in outcomes] == [(1.0, SCOUT)]
+
+
+def test_search_agent_takes_the_flag():
+    board = Board()
+    board[0, 0] = Piece(FLAG, 0, Colour.BLUE, x=0, y=0)
+    board[0, 0].revealed = True
+    board[9, 0] = Piece(SCOUT, 2, Colour.BLUE, x=9, y=0)
+    board[0, 1] = Piece(MARSHAL, 10, Colour.RED, x=0, y=1)
+    board[9, 9] = Piece(FLAG, 0, Colour.RED, x=9, y=9)
+    agent = SearchAgent(budget=1.0)
+    assert agent.select_move(BoardView(board, Colour.RED), Colour.RED) == ((0, 1), (0, 0))
+    assert agent.info.depth == 1
+    assert agent.info.value == 1000
+
+
+def test_search_agent_respects_the_budget():
+    board = _random_board()
+    agent = SearchAgent(budget=0.3)
+    view = BoardView(board, Colour.RED)
+    agent.start(view)
+    start = time.perf_counter()
+    move = agent.select_move(view, Colour.RED)
+    assert time.perf_counter() - start < 5  # generous, for loaded machines
+    assert move in board.moves(Colour.RED)
+    assert 1 <= agent.info.depth < agent.max_depth  # stopped by the budget
+    assert agent.info.nodes > 0
+    agent.observe(board.move(*move))
+
+
+def test_search_agent_cancel():
+    board = _random_board()
+    agent = SearchAgent(budget=60)
+    view = BoardView(board, Colour.BLUE)
+    agent.start(view)
+    threading.Timer(0.2, agent.cancel).start()
+    start = time.perf_counter()
+    assert agent.select_move(view, Colour.BLUE) in board.moves(Colour.BLUE)
+    assert time.perf_counter() - start < 5
+    agent.cancel()  # before the search: it stops the next one
+    start = time.perf_counter()
+    assert agent.select_move(view, Colour.BLUE) in board.moves(Colour.BLUE)
+    assert time.perf_counter() - start < 5
+    assert not agent._cancelled.is_set()
+
+
+def _endgame(sergeant_moves: int) -> Board:
+    board = Board()
+    board[9, 9] = Piece(FLAG, 0, Colour.RED, x=9, y=9)
+    board[5, 9] = Piece(MARSHAL, 10, Colour.RED, x=5, y=9)
+    board[9, 0] = Piece(FLAG, 0, Colour.BLUE, x=9, y=0)
+    board[0, 0] = Piece(SERGEANT, 4, Colour.BLUE, x=0, y=0)
+    if sergeant_moves == 1:
+        board[1, 0] = Piece(BOMB, 11, Colour.BLUE, x=1, y=0)
+    for piece in board.blue():
+        piece.revealed = True
+    return board
+
+
+def _prediction(agent) -> Move | None:
+    deadline = time.perf_counter() + 5
+    while agent._ponder.prediction is None and time.perf_counter() < deadline:
+        time.sleep(0.01)
+    return agent._ponder.prediction
+
+
+def test_search_agent_ponder_hit():
+    agent = SearchAgent(budget=0.2)
+    game = Game({Colour.RED: agent, Colour.BLUE: RandomAgent(random.Random(1))}, _endgame(1), max_plies=5, ponder=True)
+    game.step()
+    assert _prediction(agent) == ((0, 0), (0, 1))  # the only move of blue
+    game.step()
+    assert agent.ponder_hits == 1
+    start = time.perf_counter()
+    move = agent.select_move(game.view, Colour.RED)
+    assert time.perf_counter() - start < 5  # generous, for loaded machines
+    assert move in game.view.moves()
+    assert not any(thread.name == "ponder" for thread in threading.enumerate())  # the hit took over the search
+    game.run()
+    assert not any(thread.name == "ponder" for thread in threading.enumerate())  # cancelled at the end of the game
+
+
+def test_search_agent_ponder_stops():
+    agent = SearchAgent(budget=0.05)
+    game = Game({Colour.RED: agent, Colour.BLUE: RandomAgent(random.Random(2))}, _random_board(), ponder=True)
+    game.step()
+    thread = agent._ponder.thread
+    thread.join(timeout=5)
+    assert not thread.is_alive()  # after `PONDERING` budgets, although blue never replied
+
+
+def test_search_agent_ponder_miss():
+    agent = SearchAgent(budget=0.2)
+    game = Game({Colour.RED: agent, Colour.BLUE: RandomAgent()}, _endgame(2), ponder=True)
+    game.step()
+    prediction = _prediction(agent)
+    other = next(move for move in game.view.moves() if move != prediction)
+    game.play(other)
+    assert (agent.ponder_hits, agent.ponder_misses) == (0, 1)
+    assert agent._ponder is None
+    assert agent.select_move(game.view, Colour.RED) in game.view.moves()
+    agent.cancel()
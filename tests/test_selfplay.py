@@ -0,0 +1,31 @@
+import numpy as np
+
+from strategy.features import PLANES
+from strategy.selfplay import ShardWriter, generate, load_shards, play_positions
+
+
+def test_play_positions():
+    planes, moves, outcomes = play_positions(1, max_plies=30)
+    assert planes.shape == (len(moves), PLANES, 10, 10)
+    assert len(moves) == len(outcomes) <= 30
+    assert set(outcomes.tolist()) <= {-1, 0, 1}
+
+
+def test_shard_writer(tmp_path):
+    with ShardWriter(tmp_path, shard_size=4) as writer:
+        planes = np.ones((10, PLANES, 10, 10), dtype=np.uint8)
+        writer.write(planes, np.arange(10, dtype=np.int16), np.ones(10, dtype=np.int8))
+    assert writer.shards == 3
+    shards = list(load_shards(tmp_path))
+    assert [len(moves) for _, moves, _ in shards] == [4, 4, 2]
+    assert np.concatenate([moves for _, moves, _ in shards]).tolist() == list(range(10))
+    assert isinstance(shards[0][0], np.memmap)
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_generate_is_deterministic(tmp_path):
+    positions = generate(tmp_path / "one", games=3, shard_size=50, seed=2, max_plies=40)
+    assert positions == generate(tmp_path / "two", games=3, workers=2, shard_size=50, seed=2, max_plies=40)
+    for one, two in zip(load_shards(tmp_path / "one"), load_shards(tmp_path / "two")):
+        for a, b in zip(one, two):
+            assert np.array_equal(a, b)
@@ -0,0 +1,185 @@
+import asyncio
+
+import pytest
+
+from strategy import loadtest
+from strategy.agents import RandomAgent
+from strategy.board import Board
+from strategy.colour import Colour
+from strategy.delta import BoardMirror, MoveUpdate, Snapshot
+from strategy.exceptions import NoPieceError
+from strategy.server import GameSession, Server
+
+
+async def _request(reader, writer, line) -> list[str]:
+    writer.write(f"{line}\n".encode("ascii"))
+    return (await reader.readline()).decode("ascii").split()
+
+
+async def _read(reader) -> list[str]:
+    return (await reader.readline()).decode("ascii").split()
+
+
+class PonderingAgent(RandomAgent):
+    """A random agent that counts the calls to `ponder` and `cancel`."""
+
+    def __init__(self) -> None:
+        """Create an agent that has not pondered yet."""
+        super().__init__()
+        self.pondered = 0
+        self.cancelled = 0
+
+    def ponder(self, view, colour):
+        """Count the call."""
+        self.pondered += 1
+
+    def cancel(self):
+        """Count the call."""
+        self.cancelled += 1
+
+
+def _run(coroutine_function, **kwargs: object) -> object:
+    async def run():
+        server = Server(**kwargs)
+        port = await server.start("127.0.0.1", 0)
+        try:
+            return await coroutine_function(server, port)
+        finally:
+            await server.close()
+
+    return asyncio.run(run())
+
+
+def test_game_session_wrong_colour():
+    board = Board()
+    board.create_random_pieces(Colour.RED)
+    board.create_random_pieces(Colour.BLUE)
+    session = GameSession(1, board, {Colour.BLUE: RandomAgent()}, Colour.RED)
+    blue_move = board.moves(Colour.BLUE)[0]
+    with pytest.raises(NoPieceError):
+        session.play(blue_move)
+
+
+def test_game_session_ponder():
+    board = Board()
+    board.create_random_pieces(Colour.RED)
+    board.create_random_pieces(Colour.BLUE)
+    agent = PonderingAgent()
+    session = GameSession(1, board, {Colour.BLUE: agent}, Colour.RED, max_plies=3, ponder=True)
+    session.play(board.moves(Colour.RED)[0])
+    assert (agent.pondered, agent.cancelled) == (0, 0)  # the move of the human
+    session.play(agent.select_move(session.views[Colour.BLUE], Colour.BLUE))
+    assert (agent.pondered, agent.cancelled) == (1, 0)
+    session.play(board.moves(Colour.RED)[0])
+    assert session.over
+    assert (agent.pondered, agent.cancelled) == (1, 1)
+
+
+def test_game_session_bots_do_not_ponder():
+    board = Board()
+    board.create_random_pieces(Colour.RED)
+    board.create_random_pieces(Colour.BLUE)
+    red, blue = PonderingAgent(), PonderingAgent()
+    session = GameSession(1, board, {Colour.RED: red, Colour.BLUE: blue}, None, max_plies=4, ponder=True)
+    for _ in range(2):
+        session.play(red.select_move(session.views[Colour.RED], Colour.RED))
+        session.play(blue.select_move(session.views[Colour.BLUE], Colour.BLUE))
+    assert session.over
+    assert (red.pondered, blue.pondered) == (0, 0)  # both search in this process
+
+
+def test_server_cancels_pondering_on_disconnect():
+    agents = []
+
+    def factory():
+        agents.append(PonderingAgent())
+        return agents[-1]
+
+    async def play(server, port):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        assert (await _request(reader, writer, "NEW blue"))[::2] == ["GAME", "blue"]
+        assert (await _read(reader))[0] == "SNAPSHOT"
+        assert (await _read(reader))[0] == "DELTA"
+        assert (agents[0].pondered, agents[0].cancelled) == (1, 0)
+        writer.close()
+        while server.connections:
+            await asyncio.sleep(0.01)
+        assert agents[0].cancelled == 1
+        assert not server.games
+
+    _run(play, agent_factory=factory, ponder=True)
+
+
+def test_server_human_game():
+    async def play(server, port):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        assert (await _request(reader, writer, "NEW red"))[::2] == ["GAME", "red"]
+        mirror = BoardMirror()
+        words = (await reader.readline()).decode("ascii").split()
+        assert words[0] == "SNAPSHOT"
+        mirror.resync(Snapshot.decode(" ".join(words[1:])))
+        assert mirror.seq == 0
+        assert "?" in str(mirror)
+        assert len(server.games) == 1
+        moves = (await _request(reader, writer, "MOVES"))[1:]
+        assert moves
+        source, dest = moves[0].split("-")
+        writer.write(f"MOVE {source} {dest}\n".encode("ascii"))
+        for _ in range(2):  # the move and the reply of the bot
+            words = await _read(reader)
+            assert words[0] == "DELTA"
+            mirror.apply(MoveUpdate.decode(" ".join(words[1:])))
+        assert mirror.seq == 2
+        words = await _request(reader, writer, "SNAPSHOT")
+        assert Snapshot.decode(" ".join(words[1:])) == Snapshot(2, str(mirror))
+        assert await _request(reader, writer, "MOVE a1") == ["ERR", "ProtocolError"]
+        assert await _request(reader, writer, "MOVE c6 c7") == ["ERR", "NoPieceError"]
+        assert await _request(reader, writer, "MOVE z1 a6") == ["ERR", "InvalidCoordinateError"]
+        assert await _request(reader, writer, "DANCE") == ["ERR", "ProtocolError"]
+        writer.write(b"QUIT\n")
+        await reader.read()
+        writer.close()
+        await asyncio.sleep(0)
+        assert server.connections == 0
+        assert not server.games
+
+    _run(play)
+
+
+def test_server_human_plays_blue():
+    async def play(server, port):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        assert (await _request(reader, writer, "NEW blue"))[::2] == ["GAME", "blue"]
+        assert (await _read(reader))[0] == "SNAPSHOT"
+        assert (await _read(reader))[0] == "DELTA"
+        writer.close()
+
+    _run(play)
+
+
+def test_server_bot_game():
+    async def play(server, port):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        assert (await _request(reader, writer, "NEW bot"))[::2] == ["GAME", "spectator"]
+        mirror = BoardMirror()
+        while (words := await _read(reader))[0] != "OVER":
+            if words[0] == "SNAPSHOT":
+                mirror.resync(Snapshot.decode(" ".join(words[1:])))
+            else:
+                mirror.apply(MoveUpdate.decode(" ".join(words[1:])))
+        assert 0 < mirror.seq <= 60
+        assert "?" not in str(mirror)
+        assert words[1] in ("red", "blue", "draw")
+        writer.close()
+
+    _run(play, max_plies=60)
+
+
+def test_load_test():
+    async def load(server, port):
+        return await loadtest.run("127.0.0.1", port, idle=50, games=5, moves=3, seed=1)
+
+    result = _run(load)
+    assert 0 < result.moves <= 15
+    assert result.percentile(50) <= result.percentile(99)
+    assert "50 idle connections" in str(result)
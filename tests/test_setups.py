@@ -0,0 +1,80 @@
+import functools
+import random
+
+import pytest
+
+from strategy.agents import RandomAgent
+from strategy.colour import Colour
+from strategy.exceptions import InvalidSetupError
+from strategy.mirror import mirror_symbols
+from strategy.pieces import FLAG, SYMBOLS
+from strategy.search import SearchAgent
+from strategy.setups import Evaluation, SetupCache, SetupEvaluator, check_setup, random_setup, setup_board
+
+
+@pytest.fixture
+def panel():
+    rng = random.Random(1)
+    return [random_setup(rng) for _ in range(3)]
+
+
+def test_setup_board():
+    setup = SYMBOLS[FLAG] + random_setup(random.Random(2)).replace(SYMBOLS[FLAG], "", 1)
+    board = setup_board(setup, setup)
+    assert board[0, 6].name == board[0, 3].name == FLAG  # the front rows face each other
+    assert board[0, 6].colour == Colour.RED
+    assert len(board.red()) == len(board.blue()) == 40
+
+
+def test_check_setup():
+    setup = random_setup(random.Random(3))
+    assert check_setup(setup.upper()) == setup
+    with pytest.raises(InvalidSetupError):
+        check_setup(setup[:-1])
+    with pytest.raises(InvalidSetupError):
+        check_setup(SYMBOLS[FLAG] * 40)
+
+
+def test_evaluation_interval():
+    evaluation = Evaluation("setup")
+    assert evaluation.interval == (0.0, 1.0)
+    for score in [1.0] * 30 + [0.5] * 10 + [0.0] * 10:
+        evaluation.add(score)
+    low, high = evaluation.interval
+    assert (evaluation.games, evaluation.win_rate, evaluation.score) == (50, 0.6, 0.7)
+    assert low < 0.7 < high
+
+
+def test_evaluator_stops_early(panel):
+    evaluator = SetupEvaluator(panel, max_plies=20, precision=0.2, min_games=10, max_games=100)
+    evaluation = evaluator.evaluate(random_setup(random.Random(4)))
+    assert evaluation.games < 100
+    low, high = evaluation.interval
+    assert high - low <= 0.4
+
+
+def test_evaluator_cache(tmp_path, panel):
+    setup = random_setup(random.Random(5))
+    with SetupCache(tmp_path / "setups.sqlite3") as cache:
+        evaluator = SetupEvaluator(panel, max_plies=20, max_games=20, cache=cache)
+        first = evaluator.evaluate(setup)
+        assert evaluator.evaluate(mirror_symbols(setup)) == first
+        assert (cache.hits, cache.misses, len(cache)) == (1, 1, 1)
+        assert SetupEvaluator(panel, max_plies=30, max_games=20, cache=cache).panel != evaluator.panel
+        # the same name for another agent, or for the same agent with another budget
+        panels = {
+            SetupEvaluator(panel, {"random": agent}, max_plies=20, max_games=20).panel
+            for agent in (RandomAgent, functools.partial(SearchAgent, 0.1), functools.partial(SearchAgent, 0.2))
+        }
+        assert len(panels) == 3
+    with SetupCache(tmp_path / "setups.sqlite3") as cache:
+        evaluator = SetupEvaluator(panel, max_plies=20, max_games=20, cache=cache)
+        assert evaluator.evaluate(setup) == first
+        assert cache.hits == 1
+
+
+def test_evaluator_workers(panel):
+    setups = [random_setup(random.Random(seed)) for seed in (6, 7)]
+    evaluations = SetupEvaluator(panel, max_plies=20, max_games=40).rank(setups)
+    assert SetupEvaluator(panel, max_plies=20, max_games=40, workers=2).rank(setups) == evaluations
+    assert evaluations[0].score >= evaluations[1].score
@@ -0,0 +1,60 @@
+import random
+import threading
+import time
+
+from strategy.agents import RandomAgent
+from strategy.colour import Colour
+from strategy.delta import board_symbols
+from strategy.runner import Game, random_board
+from strategy.snapshots import BoardSnapshot, SnapshotPublisher
+
+
+def test_snapshot_of_board():
+    board = random_board(random.Random(1))
+    snapshot = BoardSnapshot.of(board)
+    assert snapshot.version == 0
+    assert snapshot.symbols() == board_symbols(board)
+    assert snapshot.symbols(Colour.RED) == board_symbols(board, Colour.RED)
+    assert len(snapshot.pieces(Colour.BLUE)) == 40
+    assert snapshot[0, 0].colour == Colour.BLUE and snapshot[0, 4] is None
+
+
+def test_snapshots_share_rows():
+    board = random_board(random.Random(2))
+    publisher = SnapshotPublisher(board)
+    first = publisher.current
+    board.move(*board.moves(Colour.RED)[0])
+    second = publisher.current
+    assert second.version == 1 and first.version == 0
+    assert sum(a is b for a, b in zip(first.rows, second.rows)) >= 8
+    assert second.symbols() == board_symbols(board)
+    assert publisher.version(0) is first and publisher.version(5) is None
+    publisher.close()
+    assert board.listeners == []
+
+
+def test_readers_never_see_torn_moves():
+    rng = random.Random(3)
+    game = Game({colour: RandomAgent(random.Random(rng.getrandbits(32))) for colour in Colour}, max_plies=300, rng=rng)
+    publisher = SnapshotPublisher(game.board)
+    expected = [board_symbols(game.board)]
+    game.board.listeners.append(lambda result: expected.append(board_symbols(game.board)))
+    seen = {}
+    done = threading.Event()
+
+    def read():
+        while not done.is_set():
+            snapshot = publisher.current
+            seen[snapshot.version] = snapshot
+            time.sleep(0.0001)
+
+    reader = threading.Thread(target=read)
+    reader.start()
+    try:
+        game.run()
+    finally:
+        done.set()
+        reader.join()
+    assert publisher.current.version == game.plies
+    assert seen
+    assert all(snapshot.symbols() == expected[version] for version, snapshot in seen.items())
@@ -0,0 +1,107 @@
+import math
+import random
+
+import numpy as np
+import pytest
+
+from strategy.agents import RandomAgent
+from strategy.board import Board
+from strategy.colour import Colour
+from strategy.delta import board_symbols
+from strategy.pieces import FLAG, MARSHAL, RANKS, SCOUT, Piece
+from strategy.records import GameRecord
+from strategy.runner import Game, GameResult
+from strategy.stats import Histogram, QuantileSketch, RunningStats, StatsAggregator
+
+
+def records(n, seed=0):
+    for i in range(n):
+        agents = {colour: RandomAgent(random.Random(seed + i)) for colour in Colour}
+        game = Game(agents, max_plies=80, rng=random.Random(seed + i))
+        game.run()
+        yield GameRecord.from_game(game)
+
+
+def test_running_stats_merge():
+    values = [3.0, 1.0, 4.0, 1.0, 5.0, 9.0, 2.0]
+    one, two, everything = RunningStats(), RunningStats(), RunningStats()
+    for value in values[:3]:
+        one.add(value)
+    for value in values[3:]:
+        two.add(value)
+    for value in values:
+        everything.add(value)
+    one.merge(two)
+    assert one.count == 7
+    assert one.mean == pytest.approx(np.mean(values))
+    assert one.variance == pytest.approx(np.var(values, ddof=1))
+    assert (one.minimum, one.maximum) == (1.0, 9.0)
+
+
+def test_histogram():
+    histogram = Histogram(0, 10, 5)
+    for value in (-1, 0, 1.9, 2, 9.99, 10):
+        histogram.add(value)
+    assert histogram.counts.tolist() == [1, 2, 1, 0, 0, 1, 1]
+    with pytest.raises(ValueError):
+        histogram.merge(Histogram(0, 10, 4))
+
+
+def test_quantile_sketch():
+    rng = random.Random(1)
+    values = [rng.randint(1, 2000) for _ in range(5000)]
+    one, two = QuantileSketch(), QuantileSketch()
+    for value in values[:2500]:
+        one.add(value)
+    for value in values[2500:]:
+        two.add(value)
+    one.merge(two)
+    for q in (0.1, 0.5, 0.9):
+        assert one.quantile(q) == pytest.approx(np.quantile(values, q), rel=0.03)
+    assert len(one.buckets) < 500
+    assert math.isnan(QuantileSketch().quantile(0.5))
+
+
+def test_aggregator_captures():
+    board = Board()
+    board[0, 9] = Piece(FLAG, 0, Colour.RED, x=0, y=9)
+    board[4, 6] = Piece(MARSHAL, 10, Colour.RED, x=4, y=6)
+    board[4, 5] = Piece(SCOUT, 2, Colour.BLUE, x=4, y=5)
+    board[0, 0] = Piece(FLAG, 0, Colour.BLUE, x=0, y=0)
+    record = GameRecord(board_symbols(board), [((4, 6), (4, 5))], Colour.RED)
+    aggregator = StatsAggregator()
+    aggregator.add(record)
+    assert aggregator.captures[RANKS.index(MARSHAL), RANKS.index(SCOUT)] == 1
+    assert aggregator.captures.sum() == 1
+    assert aggregator.survivors[Colour.BLUE][RANKS.index(SCOUT)] == 0
+    assert aggregator.survivors[Colour.RED][RANKS.index(MARSHAL)] == 1
+    assert aggregator.results["red"] == 1
+
+
+def test_aggregator_merge_equals_sequential(tmp_path):
+    games = list(records(6))
+    sequential, one, two = StatsAggregator(), StatsAggregator(), StatsAggregator()
+    for record in games:
+        sequential.add(record)
+    for record in games[:3]:
+        one.add(record)
+    for record in games[3:]:
+        two.add(record)
+    one.merge(two)
+    merged, expected = one.tables(), sequential.tables()
+    for (name, value), (expected_name, expected_value) in zip(merged.pop("lengths")[1:], expected.pop("lengths")[1:]):
+        assert (name, value) == (expected_name, pytest.approx(expected_value))
+    assert merged == expected
+    assert sum(counts[0] for (name, _), counts in one.features.items() if name == "flag row") == 12
+    paths = one.export(tmp_path)
+    assert (tmp_path / "captures.csv") in paths
+    assert (tmp_path / "captures.csv").read_text().startswith("taker \\ taken,bomb")
+
+
+def test_aggregator_add_result():
+    aggregator = StatsAggregator()
+    aggregator.add_result(GameResult(None, 2000))
+    assert aggregator.results["draw"] == 1
+    assert aggregator.length_histogram.counts[-1] == 1
+    assert aggregator.records == 0
+    assert math.isnan(aggregator.survival_rates(Colour.RED)[MARSHAL])
@@ -0,0 +1,90 @@
+import pytest
+
+from strategy.board import Board
+from strategy.colour import Colour
+from strategy.exceptions import InvalidRecordError
+from strategy.pieces import FLAG, GENERAL, MARSHAL, SCOUT, Piece
+from strategy.tablebase import CAPTURED, INVALID, LOSS, WIN, Tablebase
+
+RED_FLAG, BLUE_FLAG = (0, 9), (9, 0)
+
+
+@pytest.fixture(scope="module")
+def table():
+    return Tablebase.generate([MARSHAL], [GENERAL], RED_FLAG, BLUE_FLAG)
+
+
+def position(red=None, blue=None):
+    board = Board()
+    board[RED_FLAG] = Piece(FLAG, 0, Colour.RED, *RED_FLAG)
+    board[BLUE_FLAG] = Piece(FLAG, 0, Colour.BLUE, *BLUE_FLAG)
+    if red:
+        board[red] = Piece(MARSHAL, 10, Colour.RED, *red)
+    if blue:
+        board[blue] = Piece(GENERAL, 9, Colour.BLUE, *blue)
+    return board
+
+
+def test_probe(table):
+    assert table.probe(position((8, 0), (5, 5)), Colour.RED) == (WIN, 1)
+    assert table.probe(position(None, (5, 5)), Colour.RED) == (LOSS, 0)
+    assert table.probe(position((5, 6), (5, 5)), Colour.RED)[0] == WIN
+    assert table.probe(position((5, 6), None), Colour.BLUE) == (LOSS, 0)
+
+
+def test_index(table):
+    board = position((5, 6), (5, 5))
+    assert table.index(board, Colour.RED) != table.index(board, Colour.BLUE)
+    assert table.index(position(None, None), Colour.RED) == CAPTURED * 93 + CAPTURED
+    board[0, 0] = Piece(SCOUT, 2, Colour.BLUE, 0, 0)
+    assert table.index(board, Colour.RED) is None
+    assert table.lookup(0)[0] == INVALID  # both pieces on a1
+
+
+def test_best_move(table):
+    assert table.best_move(position((8, 0), (5, 5)), Colour.RED) == ((8, 0), (9, 0))
+    board = position((5, 6), (5, 5))
+    move = table.best_move(board, Colour.RED)
+    value, distance = table.probe(board, Colour.RED)
+    board.move(*move)
+    assert table.probe(board, Colour.BLUE) == (LOSS, distance - 1)
+
+
+def test_distances_are_consistent(table):
+    for red, blue in [((4, 4), (1, 1)), ((0, 0), (9, 9)), ((5, 1), (8, 7))]:
+        board = position(red, blue)
+        value, distance = table.probe(board, Colour.RED)
+        if value == WIN and distance > 1:
+            board.move(*table.best_move(board, Colour.RED))
+            assert table.probe(board, Colour.BLUE) == (LOSS, distance - 1)
+
+
+def test_generate_limits():
+    with pytest.raises(ValueError):
+        Tablebase.generate([MARSHAL, GENERAL], [GENERAL, SCOUT], RED_FLAG, BLUE_FLAG)
+    with pytest.raises(ValueError):
+        Tablebase.generate([], [], RED_FLAG, BLUE_FLAG)
+
+
+def test_save_load(tmp_path, table):
+    path = tmp_path / "marshal-general.tb"
+    table.save(path)
+    loaded = Tablebase.load(path)
+    assert path.stat().st_size < 2 * table.size  # a byte per position: 2 + 6 bits
+    for index in range(0, table.size, 7):
+        assert loaded.lookup(index) == table.lookup(index)
+    assert loaded.probe(position((8, 0), (5, 5)), Colour.RED) == (WIN, 1)
+    path.write_bytes(b"nope")
+    with pytest.raises(InvalidRecordError):
+        Tablebase.load(path)
+
+
+def test_probe_mirror_image(table):
+    board = Board()
+    board[9, 9] = Piece(FLAG, 0, Colour.RED, 9, 9)
+    board[0, 0] = Piece(FLAG, 0, Colour.BLUE, 0, 0)
+    board[1, 0] = Piece(MARSHAL, 10, Colour.RED, 1, 0)
+    board[4, 5] = Piece(GENERAL, 9, Colour.BLUE, 4, 5)
+    assert table.probe(board, Colour.RED) == (WIN, 1)
+    assert table.best_move(board, Colour.RED) == ((1, 0), (0, 0))
+    assert table.probe(board, Colour.BLUE) == table.probe(position((8, 0), (5, 5)), Colour.BLUE)
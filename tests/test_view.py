@@ -0,0 +1,71 @@
+import pytest
+
+from strategy.board import Board
+from strategy.colour import Colour
+from strategy.exceptions import NoPieceError
+from strategy.game import EMPTY, UNKNOWN, Empty
+from strategy.pieces import BOMB, MARSHAL, MINER, SCOUT, Piece
+from strategy.view import BoardView, HiddenPiece
+
+
+@pytest.fixture
+def board():
+    board = Board()
+    board[0, 9] = Piece(SCOUT, 2, Colour.RED, x=0, y=9)
+    board[0, 0] = Piece(MINER, 3, Colour.BLUE, x=0, y=0)
+    board[5, 5] = Piece(MARSHAL, 10, Colour.BLUE, x=5, y=5)
+    return board
+
+
+def test_view_hides_the_opponent(board):
+    red, blue = BoardView(board, Colour.RED), BoardView(board, Colour.BLUE)
+    assert red[0, 9] is board[0, 9]
+    assert red[5, 5] == HiddenPiece(UNKNOWN, 5, 5, Colour.BLUE)
+    assert blue[5, 5] is board[5, 5]
+    assert blue["a1"] == HiddenPiece(UNKNOWN, 0, 9, Colour.RED)
+    assert red[1, 1] == Empty(EMPTY, x=1, y=1)
+    assert red.get((10, 10), None) is None
+    assert red.opponent == Colour.BLUE
+    assert red.own() == [board[0, 9]]
+    assert all(isinstance(piece, HiddenPiece) for piece in red.others())
+    assert str(red)[55] == "?"
+    assert str(blue)[55] == "m"
+    assert len(red) == 100
+
+
+def test_view_follows_the_moves(board):
+    red = BoardView(board, Colour.RED)
+    board.move((5, 5), (5, 6))
+    assert red[5, 6] == HiddenPiece(UNKNOWN, 5, 6, Colour.BLUE, moved=True)
+    board.move((0, 9), (0, 0))  # the scout loses from the miner
+    assert red[0, 0] is board[0, 0]
+    assert board[0, 0].revealed
+    assert red[5, 6].name == UNKNOWN
+
+
+def test_view_available_range(board):
+    red = BoardView(board, Colour.RED)
+    piece_range = red.available_range(0, 9)
+    assert piece_range.north == (9, HiddenPiece(UNKNOWN, 0, 0, Colour.BLUE))
+    assert piece_range.movables == board.available_range(0, 9).movables
+    assert red.moves() == board.moves(Colour.RED)
+    with pytest.raises(NoPieceError):
+        red.available_range(5, 5)
+
+
+def test_view_opponent_moves(board):
+    board[9, 0] = Piece(BOMB, 11, Colour.BLUE, x=9, y=0)
+    red = BoardView(board, Colour.RED)
+    # unrevealed pieces move one square, even the bomb: the player cannot tell them apart
+    assert sorted(red.moves(Colour.BLUE)) == [
+        ((0, 0), (0, 1)),
+        ((0, 0), (1, 0)),
+        ((5, 5), (4, 5)),
+        ((5, 5), (5, 4)),
+        ((5, 5), (5, 6)),
+        ((9, 0), (8, 0)),
+        ((9, 0), (9, 1)),
+    ]
+    assert BoardView(board, Colour.BLUE).moves() == board.moves(Colour.BLUE)
+    board[9, 0].revealed = True  # a revealed bomb does not move
+    assert [source for source, _ in red.moves(Colour.BLUE)] == [(0, 0)] * 2 + [(5, 5)] * 3